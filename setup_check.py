@@ -3,73 +3,91 @@ Quick setup verification script
 Tests that all components are properly installed
 """
 
+import io
 import sys
+import functools
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def check_python_version():
+def check_python_version(out=None):
     """Check Python version"""
     version = sys.version_info
-    print(f"✓ Python {version.major}.{version.minor}.{version.micro}")
+    print(f"✓ Python {version.major}.{version.minor}.{version.micro}", file=out)
     if version.major < 3 or (version.major == 3 and version.minor < 9):
-        print("✗ ERROR: Python 3.9+ required")
+        print("✗ ERROR: Python 3.9+ required", file=out)
         return False
     return True
 
-def check_ffmpeg():
+@functools.lru_cache(maxsize=1)
+def get_ffmpeg_version():
+    """Return the first line of `ffmpeg -version` (None if ffmpeg fails)"""
+    # Only the banner line is needed, so read it and stop the process
+    # instead of buffering the whole build configuration dump
+    proc = subprocess.Popen(
+        ['ffmpeg', '-version'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True
+    )
+    try:
+        first_line = proc.stdout.readline().strip()
+    finally:
+        proc.stdout.close()
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    return first_line if first_line.startswith('ffmpeg') else None
+
+def check_ffmpeg(out=None):
     """Check if FFmpeg is installed"""
     try:
-        result = subprocess.run(
-            ['ffmpeg', '-version'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            # Extract version
-            first_line = result.stdout.split('\n')[0]
-            print(f"✓ {first_line}")
+        first_line = get_ffmpeg_version()
+        if first_line:
+            print(f"✓ {first_line}", file=out)
             return True
         else:
-            print("✗ FFmpeg not working properly")
+            print("✗ FFmpeg not working properly", file=out)
             return False
     except FileNotFoundError:
-        print("✗ FFmpeg not found")
-        print("  Install from: https://ffmpeg.org/download.html")
+        print("✗ FFmpeg not found", file=out)
+        print("  Install from: https://ffmpeg.org/download.html", file=out)
         return False
     except Exception as e:
-        print(f"✗ Error checking FFmpeg: {e}")
+        print(f"✗ Error checking FFmpeg: {e}", file=out)
         return False
 
-def check_env_file():
+def check_env_file(out=None):
     """Check if .env file exists"""
     env_file = Path('.env')
     if env_file.exists():
-        print("✓ .env file exists")
+        print("✓ .env file exists", file=out)
         return True
     else:
-        print("✗ .env file not found")
-        print("  Copy .env.example to .env and add your API keys")
+        print("✗ .env file not found", file=out)
+        print("  Copy .env.example to .env and add your API keys", file=out)
         return False
 
-def check_directories():
+def check_directories(out=None):
     """Check if required directories exist"""
     dirs = ['assets/music', 'output', 'temp', 'logs']
     all_exist = True
     for dir_name in dirs:
         dir_path = Path(dir_name)
         if dir_path.exists():
-            print(f"✓ {dir_name}/ directory exists")
+            print(f"✓ {dir_name}/ directory exists", file=out)
         else:
-            print(f"! {dir_name}/ directory will be created")
+            print(f"! {dir_name}/ directory will be created", file=out)
             dir_path.mkdir(parents=True, exist_ok=True)
     return True
 
-def check_packages():
+def check_packages(out=None):
     """Check if required packages are installed"""
     required = {
         'requests': 'requests',
-        'pysubs2': 'pysubs2',
         'dotenv': 'dotenv',
         'google-auth': 'google.auth',
         'google-api-python-client': 'googleapiclient'
@@ -79,48 +97,84 @@ def check_packages():
     for package_name, import_name in required.items():
         try:
             __import__(import_name)
-            print(f"✓ {package_name} installed")
+            print(f"✓ {package_name} installed", file=out)
         except ImportError:
-            print(f"✗ {package_name} not installed")
+            print(f"✗ {package_name} not installed", file=out)
             all_installed = False
     
     if not all_installed:
-        print("\nInstall missing packages:")
-        print("  pip install -r requirements.txt")
+        print("\nInstall missing packages:", file=out)
+        print("  pip install -r requirements.txt", file=out)
     
     return all_installed
 
-def main():
-    """Run all checks"""
-    print("=" * 60)
-    print("  Viral Shorts Generator - Setup Check")
-    print("=" * 60)
-    print()
+# Single source of truth for the available checks: (cli key, label, function)
+CHECKS = [
+    ('python', "Python Version", check_python_version),
+    ('ffmpeg', "FFmpeg", check_ffmpeg),
+    ('env', "Environment File", check_env_file),
+    ('dirs', "Directories", check_directories),
+    ('packages', "Python Packages", check_packages)
+]
+CHECKS_BY_KEY = {key: (name, func) for key, name, func in CHECKS}
+
+USAGE = f"Usage: python setup_check.py [{'|'.join(CHECKS_BY_KEY)}]"
+
+def run_check(check_func):
+    """Run one check into its own buffer so parallel checks don't interleave"""
+    buffer = io.StringIO()
+    try:
+        result = check_func(out=buffer)
+    except Exception as e:
+        print(f"✗ Unexpected error: {e}", file=buffer)
+        result = False
+    return result, buffer.getvalue()
+
+def main(argv=None):
+    """Run all checks, or only the ones named on the command line"""
+    argv = sys.argv[1:] if argv is None else argv
     
-    checks = [
-        ("Python Version", check_python_version),
-        ("FFmpeg", check_ffmpeg),
-        ("Environment File", check_env_file),
-        ("Directories", check_directories),
-        ("Python Packages", check_packages)
-    ]
+    if argv:
+        selected = [CHECKS_BY_KEY.get(key) for key in argv]
+        if None in selected:
+            print(USAGE)
+            return 2
+        checks = selected
+    else:
+        checks = [(name, func) for _, name, func in CHECKS]
     
+    # Assemble the whole report and write it in one go rather than issuing
+    # a line-buffered write per print (noticeable over SSH/slow terminals)
+    report = io.StringIO()
+    print("=" * 60, file=report)
+    print("  Viral Shorts Generator - Setup Check", file=report)
+    print("=" * 60, file=report)
+    print(file=report)
+    
+    # Checks are independent, so run them concurrently and print the
+    # buffered output in the original order once each one finishes
     results = []
-    for name, check_func in checks:
-        print(f"\nChecking {name}...")
-        result = check_func()
-        results.append(result)
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [executor.submit(run_check, check_func) for _, check_func in checks]
+        for (name, _), future in zip(checks, futures):
+            print(f"\nChecking {name}...", file=report)
+            result, output = future.result()
+            report.write(output)
+            results.append(result)
     
-    print("\n" + "=" * 60)
+    print("\n" + "=" * 60, file=report)
     if all(results):
-        print("✓ All checks passed! You're ready to generate videos.")
-        print("\nNext steps:")
-        print("  1. Add API keys to .env file")
-        print("  2. Download music to assets/music/")
-        print("  3. Run: python src/viral_shorts/main.py")
+        print("✓ All checks passed! You're ready to generate videos.", file=report)
+        print("\nNext steps:", file=report)
+        print("  1. Add API keys to .env file", file=report)
+        print("  2. Download music to assets/music/", file=report)
+        print("  3. Run: python src/viral_shorts/main.py", file=report)
     else:
-        print("✗ Some checks failed. Please fix the issues above.")
-    print("=" * 60)
+        print("✗ Some checks failed. Please fix the issues above.", file=report)
+    print("=" * 60, file=report)
+    
+    sys.stdout.write(report.getvalue())
+    sys.stdout.flush()
     
     return 0 if all(results) else 1
 
@@ -3,29 +3,110 @@ Configuration management for the Viral Shorts Generator
 Loads settings from environment variables and provides defaults
 """
 
+import functools
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
-
 # Base Directories
 BASE_DIR = Path(__file__).parent.parent.parent
-OUTPUT_DIR = Path(os.getenv('OUTPUT_DIR', BASE_DIR / 'output'))
-ASSETS_DIR = Path(os.getenv('ASSETS_DIR', BASE_DIR / 'assets'))
-MUSIC_DIR = Path(os.getenv('MUSIC_DIR', ASSETS_DIR / 'music'))
-TEMP_DIR = Path(os.getenv('TEMP_DIR', BASE_DIR / 'temp'))
 
-# Create directories if they don't exist
-for directory in [OUTPUT_DIR, ASSETS_DIR, MUSIC_DIR, TEMP_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
+
+@dataclass(frozen=True)
+class Settings:
+    """Environment-derived settings, read and type-converted exactly once"""
+    output_dir: Path
+    assets_dir: Path
+    music_dir: Path
+    temp_dir: Path
+    cache_dir: Path
+    api_ninjas_key: str
+    openrouter_api_key: str
+    pexels_api_key: str
+    pixabay_api_key: str
+    colab_notebook_url: str
+    youtube_client_secrets_file: str
+    youtube_oauth_token_file: str
+    youtube_category_id: int
+    youtube_privacy_status: str
+    auto_publish: bool
+    video_width: int
+    video_height: int
+    video_fps: int
+    video_duration_max: int
+    background_music_volume: float
+    voice_volume: float
+    facts_category: str
+    video_language: str
+    openrouter_model: str
+    batch_concurrency: int
+    ffmpeg_memory_limit_mb: int
+    log_level: str
+    log_file: Path
+
+
+@functools.lru_cache(maxsize=1)
+def load_settings() -> Settings:
+    """
+    Load the .env file and build the settings snapshot
+    
+    Cached, so .env parsing and type conversion happen once per process.
+    Call load_settings.cache_clear() before reloading this module to pick
+    up changed environment variables.
+    
+    Returns:
+        Settings instance
+    """
+    load_dotenv()
+    
+    assets_dir = Path(os.getenv('ASSETS_DIR', BASE_DIR / 'assets'))
+    return Settings(
+        output_dir=Path(os.getenv('OUTPUT_DIR', BASE_DIR / 'output')),
+        assets_dir=assets_dir,
+        music_dir=Path(os.getenv('MUSIC_DIR', assets_dir / 'music')),
+        temp_dir=Path(os.getenv('TEMP_DIR', BASE_DIR / 'temp')),
+        cache_dir=Path(os.getenv('CACHE_DIR', BASE_DIR / 'cache')),
+        api_ninjas_key=os.getenv('API_NINJAS_KEY', ''),
+        openrouter_api_key=os.getenv('OPENROUTER_API_KEY', ''),
+        pexels_api_key=os.getenv('PEXELS_API_KEY', ''),
+        pixabay_api_key=os.getenv('PIXABAY_API_KEY', ''),
+        colab_notebook_url=os.getenv('COLAB_NOTEBOOK_URL', ''),
+        youtube_client_secrets_file=os.getenv('YOUTUBE_CLIENT_SECRETS_FILE', str(BASE_DIR / 'client_secrets.json')),
+        youtube_oauth_token_file=os.getenv('YOUTUBE_OAUTH_TOKEN_FILE', str(BASE_DIR / 'oauth_token.json')),
+        youtube_category_id=int(os.getenv('YOUTUBE_CATEGORY_ID', '28')),  # Science & Technology
+        youtube_privacy_status=os.getenv('YOUTUBE_PRIVACY_STATUS', 'public'),
+        auto_publish=os.getenv('AUTO_PUBLISH', 'false').lower() == 'true',
+        video_width=int(os.getenv('VIDEO_WIDTH', '1080')),
+        video_height=int(os.getenv('VIDEO_HEIGHT', '1920')),
+        video_fps=int(os.getenv('VIDEO_FPS', '30')),
+        video_duration_max=int(os.getenv('VIDEO_DURATION_MAX', '60')),
+        background_music_volume=float(os.getenv('BACKGROUND_MUSIC_VOLUME', '0.2')),
+        voice_volume=float(os.getenv('VOICE_VOLUME', '1.0')),
+        facts_category=os.getenv('FACTS_CATEGORY', 'random'),
+        video_language=os.getenv('VIDEO_LANGUAGE', 'en'),
+        # Using a free model - check https://openrouter.ai/models for current free models
+        openrouter_model=os.getenv('OPENROUTER_MODEL', 'mistralai/mistral-7b-instruct:free'),
+        batch_concurrency=int(os.getenv('BATCH_CONCURRENCY', '2')),
+        ffmpeg_memory_limit_mb=int(os.getenv('FFMPEG_MEMORY_LIMIT_MB', '0')),
+        log_level=os.getenv('LOG_LEVEL', 'INFO'),
+        log_file=Path(os.getenv('LOG_FILE', BASE_DIR / 'logs' / 'viral_shorts.log')),
+    )
+
+
+_settings = load_settings()
+
+OUTPUT_DIR = _settings.output_dir
+ASSETS_DIR = _settings.assets_dir
+MUSIC_DIR = _settings.music_dir
+TEMP_DIR = _settings.temp_dir
+CACHE_DIR = _settings.cache_dir  # Kept out of TEMP_DIR, which is cleaned periodically
 
 # API Keys
-API_NINJAS_KEY = os.getenv('API_NINJAS_KEY', '')
-OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY', '')
-PEXELS_API_KEY = os.getenv('PEXELS_API_KEY', '')
-PIXABAY_API_KEY = os.getenv('PIXABAY_API_KEY', '')
+API_NINJAS_KEY = _settings.api_ninjas_key
+OPENROUTER_API_KEY = _settings.openrouter_api_key
+PEXELS_API_KEY = _settings.pexels_api_key
+PIXABAY_API_KEY = _settings.pixabay_api_key
 
 # API Endpoints
 API_NINJAS_FACTS_URL = "https://api.api-ninjas.com/v1/facts"
@@ -34,27 +115,27 @@ PEXELS_API_URL = "https://api.pexels.com/videos/search"
 PIXABAY_API_URL = "https://pixabay.com/api/videos"
 
 # Google Colab Configuration
-COLAB_NOTEBOOK_URL = os.getenv('COLAB_NOTEBOOK_URL', '')
+COLAB_NOTEBOOK_URL = _settings.colab_notebook_url
 
 # YouTube Configuration
-YOUTUBE_CLIENT_SECRETS_FILE = os.getenv('YOUTUBE_CLIENT_SECRETS_FILE', str(BASE_DIR / 'client_secrets.json'))
-YOUTUBE_OAUTH_TOKEN_FILE = os.getenv('YOUTUBE_OAUTH_TOKEN_FILE', str(BASE_DIR / 'oauth_token.json'))
-YOUTUBE_CATEGORY_ID = int(os.getenv('YOUTUBE_CATEGORY_ID', '28'))  # Science & Technology
-YOUTUBE_PRIVACY_STATUS = os.getenv('YOUTUBE_PRIVACY_STATUS', 'public')
-AUTO_PUBLISH = os.getenv('AUTO_PUBLISH', 'false').lower() == 'true'
+YOUTUBE_CLIENT_SECRETS_FILE = _settings.youtube_client_secrets_file
+YOUTUBE_OAUTH_TOKEN_FILE = _settings.youtube_oauth_token_file
+YOUTUBE_CATEGORY_ID = _settings.youtube_category_id  # Science & Technology
+YOUTUBE_PRIVACY_STATUS = _settings.youtube_privacy_status
+AUTO_PUBLISH = _settings.auto_publish
 
 # Video Settings
-VIDEO_WIDTH = int(os.getenv('VIDEO_WIDTH', '1080'))
-VIDEO_HEIGHT = int(os.getenv('VIDEO_HEIGHT', '1920'))
-VIDEO_FPS = int(os.getenv('VIDEO_FPS', '30'))
-VIDEO_DURATION_MAX = int(os.getenv('VIDEO_DURATION_MAX', '60'))
+VIDEO_WIDTH = _settings.video_width
+VIDEO_HEIGHT = _settings.video_height
+VIDEO_FPS = _settings.video_fps
+VIDEO_DURATION_MAX = _settings.video_duration_max
 VIDEO_FORMAT = 'mp4'
 VIDEO_CODEC = 'libx264'
 VIDEO_PRESET = 'medium'
 
 # Audio Settings
-BACKGROUND_MUSIC_VOLUME = float(os.getenv('BACKGROUND_MUSIC_VOLUME', '0.2'))
-VOICE_VOLUME = float(os.getenv('VOICE_VOLUME', '1.0'))
+BACKGROUND_MUSIC_VOLUME = _settings.background_music_volume
+VOICE_VOLUME = _settings.voice_volume
 AUDIO_CODEC = 'aac'
 AUDIO_BITRATE = '192k'
 
@@ -70,26 +151,31 @@ SUBTITLE_POSITION = 2  # Bottom center (2 = bottom)
 SUBTITLE_MARGIN_V = 150  # More margin from bottom in pixels
 
 # Content Settings
-FACTS_CATEGORY = os.getenv('FACTS_CATEGORY', 'random')
-VIDEO_LANGUAGE = os.getenv('VIDEO_LANGUAGE', 'en')
+FACTS_CATEGORY = _settings.facts_category
+VIDEO_LANGUAGE = _settings.video_language
 
 # OpenRouter Model Settings
-# Using a free model - check https://openrouter.ai/models for current free models
-OPENROUTER_MODEL = os.getenv('OPENROUTER_MODEL', 'mistralai/mistral-7b-instruct:free')  # Free tier model
+OPENROUTER_MODEL = _settings.openrouter_model  # Free tier model
 OPENROUTER_MAX_TOKENS = 1000
 OPENROUTER_TEMPERATURE = 0.7
 
+# Batch Settings
+BATCH_CONCURRENCY = _settings.batch_concurrency  # Videos generated at once in a batch
+
 # FFmpeg Settings
 FFMPEG_COMMAND = 'ffmpeg'
 FFMPEG_LOGLEVEL = 'error'
+FFMPEG_MEMORY_LIMIT_MB = _settings.ffmpeg_memory_limit_mb  # Address-space cap per CPU render, 0 for none
 
 # Logging Settings
-LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_LEVEL = _settings.log_level
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-LOG_FILE = BASE_DIR / 'logs' / 'viral_shorts.log'
+LOG_FILE = _settings.log_file
 
-# Create logs directory
-LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+# Create directories if they don't exist (a single stat when they already do)
+for directory in (OUTPUT_DIR, ASSETS_DIR, MUSIC_DIR, TEMP_DIR, CACHE_DIR, LOG_FILE.parent):
+    if not directory.is_dir():
+        directory.mkdir(parents=True, exist_ok=True)
 
 
 def validate_config():
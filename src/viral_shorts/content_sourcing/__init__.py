@@ -1,6 +1,20 @@
 """Content sourcing module for fetching interesting facts"""
 
-from .fetchers import FactFetcher
-from .parsers import FactParser
+import importlib
 
-__all__ = ['FactFetcher', 'FactParser']
+__all__ = ['FactFetcher', 'FactParser', 'FactCache']
+
+# Submodules are imported on first attribute access (PEP 562) so that
+# parsing facts doesn't pull in the HTTP stack
+_LAZY_ATTRS = {
+    'FactFetcher': '.fetchers',
+    'FactParser': '.parsers',
+    'FactCache': '.cache',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,103 @@
+"""
+Fact cache module
+Keeps a local pool of fetched facts so generation doesn't always hit the API
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any
+from ..config import CACHE_DIR
+from ..utils.logger import setup_logger
+from ..utils.serialization import json_loads, json_dumps
+
+logger = setup_logger(__name__)
+
+
+class FactCache:
+    """SQLite-backed pool of facts, each handed out at most once"""
+    
+    def __init__(self, db_path: Optional[Path] = None):
+        """
+        Initialize the FactCache
+        
+        Args:
+            db_path: Path to the SQLite database (defaults to CACHE_DIR/facts.db)
+        """
+        self.db_path = db_path or (CACHE_DIR / 'facts.db')
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS facts ('
+            'hash TEXT PRIMARY KEY, '
+            'fact TEXT NOT NULL, '
+            'ts INTEGER NOT NULL, '
+            'used INTEGER NOT NULL DEFAULT 0)'
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def _hash(fact_data: Dict[str, Any]) -> str:
+        """Hash a fact by its normalized text"""
+        text = ' '.join(fact_data.get('fact', '').lower().split())
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    def insert(self, fact_data: Dict[str, Any], used: bool = False) -> bool:
+        """
+        Add a fact to the cache
+        
+        Args:
+            fact_data: Fact dictionary as returned by the API
+            used: Record the fact as already used (so it is never handed out)
+            
+        Returns:
+            True if the fact was new, False if it was already known
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO facts (hash, fact, ts, used) VALUES (?, ?, ?, ?)',
+                (self._hash(fact_data), json_dumps(fact_data).decode('utf-8'),
+                 int(time.time()), int(used))
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
+    
+    def pop_unused(self) -> Optional[Dict[str, Any]]:
+        """
+        Take the oldest unused fact out of the pool
+        
+        Safe across processes sharing the database: a fact is only returned
+        by the caller whose update actually marked it used.
+        
+        Returns:
+            Fact dictionary or None if the pool is empty
+        """
+        with self._lock:
+            while True:
+                row = self._conn.execute(
+                    'SELECT hash, fact FROM facts WHERE used = 0 ORDER BY ts LIMIT 1'
+                ).fetchone()
+                if row is None:
+                    return None
+                
+                cursor = self._conn.execute(
+                    'UPDATE facts SET used = 1 WHERE hash = ? AND used = 0', (row[0],)
+                )
+                self._conn.commit()
+                if cursor.rowcount:
+                    return json_loads(row[1])
+                # Another process claimed it first; try the next one
+    
+    def unused_count(self) -> int:
+        """Return the number of facts waiting in the pool"""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM facts WHERE used = 0').fetchone()[0]
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
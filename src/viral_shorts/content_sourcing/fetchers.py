@@ -3,10 +3,14 @@ Fact fetcher module
 Retrieves interesting facts from API-Ninjas Facts API
 """
 
+import asyncio
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from ..config import API_NINJAS_KEY, API_NINJAS_FACTS_URL
+from ..http import SESSION
 from ..utils.logger import setup_logger
+from ..utils.serialization import json_loads, JSONDecodeError
+from .cache import FactCache
 
 logger = setup_logger(__name__)
 
@@ -14,18 +18,60 @@ logger = setup_logger(__name__)
 class FactFetcher:
     """Fetches random interesting facts from API-Ninjas"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    __slots__ = ('api_key', 'base_url', 'cache', '_session', '_headers')
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[FactCache] = None,
+        session: Optional[requests.Session] = None
+    ):
         """
         Initialize the FactFetcher
         
         Args:
             api_key: API-Ninjas API key (uses config if not provided)
+            cache: Optional pool of prefetched facts to serve before the API
+            session: HTTP session to use (defaults to the shared pooled session)
         """
         self.api_key = api_key or API_NINJAS_KEY
         self.base_url = API_NINJAS_FACTS_URL
+        self.cache = cache
         
         if not self.api_key:
             raise ValueError("API_NINJAS_KEY is required. Set it in your .env file.")
+        
+        # Pooled keep-alive connections shared with the other API clients;
+        # the auth header is built once and passed per request so the shared
+        # session never holds credentials
+        self._session = session or SESSION
+        self._headers = {'X-Api-Key': self.api_key}
+    
+    def _do_request(self, params: Dict[str, Any]) -> Any:
+        """
+        Perform one API call and decode the JSON body
+        
+        Retries live in the shared session's urllib3 Retry policy, which
+        re-sends the GET with exponential backoff on connection resets, read
+        timeouts and 429/5xx gateway responses; whatever still fails is raised
+        as a RequestException or JSONDecodeError for the caller to log.
+        
+        Args:
+            params: Query parameters for the request
+            
+        Returns:
+            Decoded JSON payload
+        """
+        # Context-managed so the connection is handed back to the pool
+        # as soon as the (tiny) body has been read
+        with self._session.get(
+            self.base_url,
+            headers=self._headers,
+            params=params,
+            timeout=10
+        ) as response:
+            response.raise_for_status()
+            return json_loads(response.content)
     
     def fetch_random_fact(self, limit: int = 1) -> Optional[Dict[str, Any]]:
         """
@@ -37,39 +83,170 @@ class FactFetcher:
         Returns:
             Dictionary containing the fact data or None if failed
         """
+        if self.cache is not None and limit == 1:
+            cached = self.cache.pop_unused()
+            if cached:
+                logger.info("Using cached fact: %s...", cached['fact'][:50])
+                return cached
+        
         try:
-            headers = {
-                'X-Api-Key': self.api_key
-            }
-            
             # Note: limit parameter is premium only, so we don't use it
             params = {}
             
-            logger.info(f"Fetching random fact from API-Ninjas...")
-            response = requests.get(
-                self.base_url,
-                headers=headers,
-                params=params,
-                timeout=10
-            )
-            
-            response.raise_for_status()
-            data = response.json()
+            logger.info("Fetching random fact from API-Ninjas...")
+            data = self._do_request(params)
             
             if data and len(data) > 0:
-                logger.info(f"Successfully fetched fact: {data[0]['fact'][:50]}...")
+                logger.info("Successfully fetched fact: %s...", data[0]['fact'][:50])
+                if self.cache is not None:
+                    # Remember it so a later prefetch never hands it out again
+                    self.cache.insert(data[0], used=True)
                 return data[0] if limit == 1 else data
             else:
                 logger.error("No facts returned from API")
                 return None
                 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching fact from API: {e}")
+            logger.error("Error fetching fact from API: %s", e)
+            return None
+        except JSONDecodeError as e:
+            logger.error("Invalid JSON in API response: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             return None
     
+    def fetch_random_facts(self, n: int) -> List[Dict[str, Any]]:
+        """
+        Fetch several random facts back-to-back on one keep-alive connection
+        
+        Synchronous counterpart to fetch_many_async: the TCP/TLS setup is paid
+        once for the batch rather than once per fact.
+        
+        Args:
+            n: Number of facts to fetch
+            
+        Returns:
+            List of fact dictionaries (failed requests are skipped)
+        """
+        logger.info("Fetching %s random facts from API-Ninjas...", n)
+        facts = []
+        for _ in range(n):
+            try:
+                data = self._do_request({})
+            except (requests.exceptions.RequestException, JSONDecodeError) as e:
+                logger.error("Error fetching fact from API: %s", e)
+                continue
+            if data:
+                facts.append(data[0])
+                if self.cache is not None:
+                    self.cache.insert(data[0], used=True)
+        
+        logger.info("Successfully fetched %s/%s facts", len(facts), n)
+        return facts
+    
+    async def fetch_many_async(self, n: int, concurrency: int = 5) -> List[Dict[str, Any]]:
+        """
+        Fetch several random facts concurrently
+        
+        Requests share one aiohttp session and are bounded by a semaphore so
+        batch runs overlap network round trips without flooding the API.
+        
+        Args:
+            n: Number of facts to fetch
+            concurrency: Maximum number of requests in flight
+            
+        Returns:
+            List of fact dictionaries (failed requests are skipped)
+        """
+        import aiohttp
+        
+        sem = asyncio.Semaphore(concurrency)
+        headers = {'X-Api-Key': self.api_key}
+        timeout = aiohttp.ClientTimeout(total=10)
+        
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=concurrency),
+            timeout=timeout
+        ) as session:
+            async def _one() -> Optional[Dict[str, Any]]:
+                try:
+                    async with sem, session.get(self.base_url, headers=headers) as response:
+                        response.raise_for_status()
+                        data = await response.json()
+                        return data[0] if data else None
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.error("Error fetching fact from API: %s", e)
+                    return None
+            
+            logger.info("Fetching %s random facts from API-Ninjas concurrently...", n)
+            results = await asyncio.gather(*[_one() for _ in range(n)])
+        
+        facts = [fact for fact in results if fact]
+        logger.info("Successfully fetched %s/%s facts", len(facts), n)
+        return facts
+    
+    def prefetch(self, n: int) -> int:
+        """
+        Refill the fact cache with new facts fetched concurrently
+        
+        Must be called outside a running event loop (e.g. between videos).
+        
+        Args:
+            n: Number of facts to request
+            
+        Returns:
+            Number of new facts added to the cache
+        """
+        return asyncio.run(self.prefetch_async(n))
+    
+    async def prefetch_async(self, n: int) -> int:
+        """
+        Refill the fact cache with new facts fetched concurrently
+        
+        Args:
+            n: Number of facts to request
+            
+        Returns:
+            Number of new facts added to the cache
+        """
+        if self.cache is None:
+            logger.warning("No fact cache configured, nothing to prefetch into")
+            return 0
+        
+        facts = await self.fetch_many_async(n)
+        added = sum(1 for fact in facts if self.cache.insert(fact))
+        logger.info("Prefetched %s new facts (%s unused in cache)", added, self.cache.unused_count())
+        return added
+    
+    async def take_many_async(self, n: int) -> List[Dict[str, Any]]:
+        """
+        Get facts for a batch, preferring unused facts from the cache
+        
+        The cache is topped up first when it holds fewer than n, so facts
+        already used by earlier runs are never handed out again.
+        
+        Args:
+            n: Number of facts wanted
+            
+        Returns:
+            List of fact dictionaries (may be shorter than n if fetching failed)
+        """
+        if self.cache is None:
+            return await self.fetch_many_async(n)
+        
+        shortfall = n - self.cache.unused_count()
+        if shortfall > 0:
+            await self.prefetch_async(shortfall)
+        
+        facts = []
+        while len(facts) < n:
+            fact = self.cache.pop_unused()
+            if fact is None:
+                break
+            facts.append(fact)
+        return facts
+    
     def fetch_fact_by_category(self, category: str) -> Optional[Dict[str, Any]]:
         """
         Fetch a fact from a specific category (if supported in future)
@@ -96,5 +273,5 @@ class FactFetcher:
             result = self.fetch_random_fact()
             return result is not None
         except Exception as e:
-            logger.error(f"Connection test failed: {e}")
+            logger.error("Connection test failed: %s", e)
             return False
@@ -3,163 +3,227 @@ Fact parser module
 Processes and validates fact data for video generation
 """
 
+import re
+import functools
 from typing import Dict, Any, Optional
 from ..utils.logger import setup_logger
 
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
 logger = setup_logger(__name__)
 
+# Common words that make poor video search terms (expanded list)
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
+    'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'can', 'that', 'this', 'these',
+    'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'their', 'them',
+    'over', 'years', 'year', 'however', 'because', 'only', 'also', 'when',
+    'made', 'make', 'used', 'than'
+})
 
-class FactParser:
-    """Parses and validates fact data from API responses"""
+# Priority words that are good for video search (proper nouns, specific objects)
+_PRIORITY_INDICATORS = frozenset({
+    'pyramid', 'ocean', 'mountain', 'space', 'animal', 'city',
+    'country', 'planet', 'star', 'galaxy', 'earth', 'sun', 'moon'
+})
+
+if HAS_AHOCORASICK:
+    # One automaton scan per word, independent of the number of indicators
+    _PRIORITY_AUTOMATON = ahocorasick.Automaton()
+    for _indicator in _PRIORITY_INDICATORS:
+        _PRIORITY_AUTOMATON.add_word(_indicator, _indicator)
+    _PRIORITY_AUTOMATON.make_automaton()
     
-    @staticmethod
-    def parse_fact(fact_data: Dict[str, Any]) -> Optional[Dict[str, str]]:
-        """
-        Parse fact data from API response
-        
-        Args:
-            fact_data: Raw fact data from API
-            
-        Returns:
-            Parsed fact dictionary or None if invalid
-        """
-        try:
-            if not fact_data:
-                logger.error("No fact data provided")
-                return None
-            
-            # Extract the fact text
-            fact_text = fact_data.get('fact', '')
-            
-            if not fact_text:
-                logger.error("Fact text is empty")
-                return None
-            
-            # Basic validation
-            if len(fact_text) < 10:
-                logger.warning("Fact is too short (less than 10 characters)")
-                return None
-            
-            if len(fact_text) > 500:
-                logger.warning("Fact is very long, may need trimming")
-            
-            parsed = {
-                'text': fact_text,
-                'length': len(fact_text),
-                'word_count': len(fact_text.split())
-            }
-            
-            logger.info(f"Parsed fact: {parsed['word_count']} words, {parsed['length']} characters")
-            return parsed
-            
-        except Exception as e:
-            logger.error(f"Error parsing fact: {e}")
-            return None
-    
-    @staticmethod
-    def validate_fact_for_video(fact: Dict[str, str], max_words: int = 100) -> bool:
-        """
-        Validate if a fact is suitable for a short video
-        
-        Args:
-            fact: Parsed fact dictionary
-            max_words: Maximum word count for video (default: 100)
-            
-        Returns:
-            True if fact is suitable, False otherwise
-        """
-        try:
-            word_count = fact.get('word_count', 0)
-            
-            if word_count == 0:
-                logger.error("Fact has no words")
-                return False
-            
-            if word_count < 5:
-                logger.warning("Fact is too short (less than 5 words)")
-                return False
-            
-            if word_count > max_words:
-                logger.warning(f"Fact is too long ({word_count} > {max_words} words)")
-                return False
-            
-            logger.info("Fact is suitable for video")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error validating fact: {e}")
-            return False
-    
-    @staticmethod
-    def clean_fact_text(text: str) -> str:
-        """
-        Clean and normalize fact text
-        
-        Args:
-            text: Raw fact text
-            
-        Returns:
-            Cleaned text
-        """
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        # Ensure proper ending punctuation
-        if not text.endswith(('.', '!', '?')):
-            text += '.'
-        
-        return text
+    def _contains_priority(word: str) -> bool:
+        return next(_PRIORITY_AUTOMATON.iter(word), None) is not None
+else:
+    _PRIORITY_RE = re.compile('|'.join(sorted(_PRIORITY_INDICATORS)))
     
-    @staticmethod
-    def extract_keywords(fact_text: str, max_keywords: int = 3) -> list:
-        """
-        Extract keywords from fact text for video search
-        
-        Args:
-            fact_text: Fact text
-            max_keywords: Maximum number of keywords (default: 3)
-            
-        Returns:
-            List of keywords
-        """
-        # Remove common words (expanded list)
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
-            'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-            'could', 'should', 'may', 'might', 'can', 'that', 'this', 'these',
-            'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'their', 'them',
-            'over', 'years', 'year', 'however', 'because', 'only', 'also', 'when',
-            'made', 'make', 'used', 'than'
-        }
-        
-        # Priority words that are good for video search (proper nouns, specific objects)
-        priority_indicators = ['pyramid', 'ocean', 'mountain', 'space', 'animal', 'city',
-                             'country', 'planet', 'star', 'galaxy', 'earth', 'sun', 'moon']
-        
-        # Split into words and filter
-        words = fact_text.lower().split()
-        keywords = []
-        priority_keywords = []
+    def _contains_priority(word: str) -> bool:
+        return _PRIORITY_RE.search(word) is not None
+
+# Punctuation stripped from either end of a word before it becomes a keyword
+_WORD_PUNCTUATION = '.,!?;:()[]{}"\'-'
+
+
+def parse_fact(fact_data: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """
+    Parse fact data from API response
+    
+    Args:
+        fact_data: Raw fact data from API
         
-        for word in words:
-            clean_word = word.strip('.,!?;:()[]{}"\'-')
-            # Skip if too short or is a stop word
-            if len(clean_word) < 4 or clean_word.lower() in stop_words:
-                continue
-            # Check if it's a priority word
-            if any(indicator in clean_word for indicator in priority_indicators):
-                if clean_word not in priority_keywords:
-                    priority_keywords.append(clean_word)
-            elif clean_word not in keywords:
-                keywords.append(clean_word)
+    Returns:
+        Parsed fact dictionary or None if invalid. 'text' is the fact as
+        received; 'clean_text' is the same fact with whitespace collapsed to
+        single spaces, which is what 'length' and 'word_count' describe.
+    """
+    if not fact_data:
+        logger.error("No fact data provided")
+        return None
+    
+    if not isinstance(fact_data, dict):
+        logger.error("Fact data must be a dict, got %s", type(fact_data).__name__)
+        return None
+    
+    # Extract the fact text
+    raw_text = fact_data.get('fact')
+    
+    if not isinstance(raw_text, str):
+        logger.error("Fact text is missing or not a string")
+        return None
+    
+    fact_text = raw_text.strip()
+    
+    if not fact_text:
+        logger.error("Fact text is empty")
+        return None
+    
+    # Word count below assumes single spaces; only re-join when needed
+    if '  ' in fact_text or '\n' in fact_text or '\t' in fact_text:
+        fact_text = ' '.join(fact_text.split())
+    
+    length = len(fact_text)
+    
+    # Basic validation
+    if length < 10:
+        logger.warning("Fact is too short (less than 10 characters)")
+        return None
+    
+    if length > 500:
+        logger.warning("Fact is very long, may need trimming")
+    
+    parsed = {
+        'text': raw_text,
+        'clean_text': fact_text,
+        'length': length,
+        'word_count': fact_text.count(' ') + 1
+    }
+    
+    logger.info("Parsed fact: %s words, %s characters", parsed['word_count'], parsed['length'])
+    return parsed
+
+
+def validate_fact_for_video(fact: Dict[str, str], max_words: int = 100) -> bool:
+    """
+    Validate if a fact is suitable for a short video
+    
+    Args:
+        fact: Parsed fact dictionary
+        max_words: Maximum word count for video (default: 100)
         
-        # Combine priority keywords first, then regular keywords
-        final_keywords = priority_keywords + keywords
+    Returns:
+        True if fact is suitable, False otherwise
+    """
+    if not isinstance(fact, dict):
+        logger.error("Parsed fact must be a dict, got %s", type(fact).__name__)
+        return False
+    
+    word_count = fact.get('word_count', 0)
+    
+    if not isinstance(word_count, int):
+        logger.error("Invalid word count: %r", word_count)
+        return False
+    
+    if word_count == 0:
+        logger.error("Fact has no words")
+        return False
+    
+    if word_count < 5:
+        logger.warning("Fact is too short (less than 5 words)")
+        return False
+    
+    if word_count > max_words:
+        logger.warning("Fact is too long (%s > %s words)", word_count, max_words)
+        return False
+    
+    logger.info("Fact is suitable for video")
+    return True
+
+
+def clean_fact_text(text: str) -> str:
+    """
+    Clean and normalize fact text
+    
+    Args:
+        text: Raw fact text
         
-        # If we have too few keywords, add generic fallback topics
-        if len(final_keywords) < 2:
-            final_keywords.extend(['nature', 'science', 'discovery'])
+    Returns:
+        Cleaned text
+    """
+    # Remove extra whitespace
+    text = ' '.join(text.split())
+    
+    # Ensure proper ending punctuation
+    if not text.endswith(('.', '!', '?')):
+        text += '.'
+    
+    return text
+
+
+def extract_keywords(fact_text: str, max_keywords: int = 3) -> list:
+    """
+    Extract keywords from fact text for video search
+    
+    Results are memoized per (text, max_keywords), since the same fact is
+    usually asked for its keywords more than once while building a video.
+    
+    Args:
+        fact_text: Fact text
+        max_keywords: Maximum number of keywords (default: 3)
         
-        # Return top keywords (limit to max_keywords)
-        return final_keywords[:max_keywords]
+    Returns:
+        List of keywords
+    """
+    # Fresh list each call so callers can't mutate the cached result
+    return list(_extract_keywords_cached(fact_text, max_keywords))
+
+
+@functools.lru_cache(maxsize=128)
+def _extract_keywords_cached(fact_text: str, max_keywords: int) -> tuple:
+    """Cached core of extract_keywords; returns an immutable tuple"""
+    priority_keywords = []
+    keywords = []
+    
+    for word in fact_text.lower().split():
+        word = word.strip(_WORD_PUNCTUATION)
+        # Skip if too short or is a stop word
+        if len(word) < 4 or word in _STOP_WORDS:
+            continue
+        # Exact hits are a set lookup; substring matching catches plurals/compounds
+        if word in _PRIORITY_INDICATORS or _contains_priority(word):
+            priority_keywords.append(word)
+        else:
+            keywords.append(word)
+    
+    # Deduplicate while preserving first-seen order
+    priority_keywords = list(dict.fromkeys(priority_keywords))
+    keywords = list(dict.fromkeys(keywords))
+    
+    # Combine priority keywords first, then regular keywords
+    final_keywords = priority_keywords + keywords
+    
+    # If we have too few keywords, add generic fallback topics
+    if len(final_keywords) < 2:
+        final_keywords.extend(['nature', 'science', 'discovery'])
+    
+    # Return top keywords (limit to max_keywords)
+    return tuple(final_keywords[:max_keywords])
+
+
+class FactParser:
+    """Parses and validates fact data from API responses
+    
+    Kept as a namespace over the module-level functions for existing callers.
+    """
+    
+    parse_fact = staticmethod(parse_fact)
+    validate_fact_for_video = staticmethod(validate_fact_for_video)
+    clean_fact_text = staticmethod(clean_fact_text)
+    extract_keywords = staticmethod(extract_keywords)
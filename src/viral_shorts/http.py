@@ -0,0 +1,41 @@
+"""
+Shared HTTP session
+One pooled requests.Session reused by every module that talks to an API
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session() -> requests.Session:
+    """
+    Create a requests session with a tuned connection pool
+    
+    Transient gateway errors and rate limits are retried by urllib3 with a
+    short backoff (idempotent methods only, so POSTs are never replayed).
+    
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[429, 502, 503, 504]
+        )
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Process-wide session so keep-alive connections to Pexels, Pixabay,
+# OpenRouter and API-Ninjas are reused across fetchers and videos. It carries
+# no credentials: callers pass their auth headers per request. Sharing it
+# between threads is fine for plain GET/POST calls; don't mutate its headers
+# or mounts after import.
+SESSION = create_session()
@@ -4,25 +4,30 @@ Coordinates all modules to create and publish videos
 """
 
 import sys
+import asyncio
+from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
-from .config import validate_config, get_config_summary, OUTPUT_DIR, AUTO_PUBLISH
+from .config import validate_config, get_config_summary, AUTO_PUBLISH, BATCH_CONCURRENCY
+from .http import SESSION
 from .utils.logger import setup_logger
-from .utils.storage import StorageManager
+from .utils.storage import StorageManager, atomic_write_bytes
+from .utils.serialization import json_dumps
+from .models import VideoInfo
 from .content_sourcing.fetchers import FactFetcher
+from .content_sourcing.cache import FactCache
 from .content_sourcing.parsers import FactParser
 from .scripting.script_generator import ScriptGenerator
-from .narration.tts import KyutaiTTS
 from .narration.voice_manager import VoiceManager
-from .video_assembly.assets import AssetManager
-from .video_assembly.editor import VideoEditor
-from .publishing.youtube_publisher import YouTubePublisher
-from .publishing.scheduler import VideoScheduler
 
 logger = setup_logger(__name__)
 
+# Banner line around pipeline log sections, built once
+_BANNER = "=" * 80
+
 
 class ViralShortsGenerator:
     """Main orchestrator for automated viral shorts generation"""
@@ -36,41 +41,121 @@ class ViralShortsGenerator:
             validate_config()
             logger.info("Configuration validated successfully")
         except ValueError as e:
-            logger.error(f"Configuration error: {e}")
+            logger.error("Configuration error: %s", e)
             raise
         
+        # One pooled keep-alive session for every HTTP API the pipeline calls
+        self.http = SESSION
+        
         # Initialize modules
-        self.fact_fetcher = FactFetcher()
+        self.fact_fetcher = FactFetcher(cache=FactCache(), session=self.http)
         self.fact_parser = FactParser()
-        self.script_generator = ScriptGenerator()
-        self.tts = KyutaiTTS()
+        self.script_generator = ScriptGenerator(session=self.http)
         self.voice_manager = VoiceManager()
-        self.asset_manager = AssetManager()
-        self.video_editor = VideoEditor()
-        self.youtube_publisher = YouTubePublisher()
-        self.scheduler = VideoScheduler()
         self.storage = StorageManager()
         
         logger.info("All modules initialized successfully")
     
-    def generate_video(self, publish: bool = False) -> Optional[Dict[str, Any]]:
+    # Heavier modules (TTS, video tooling, Google API client) are imported and
+    # built on first use, so commands like show_config or a single API test
+    # don't pay for everything up front
+    
+    @cached_property
+    def tts(self):
+        """Text-to-speech engine"""
+        from .narration.tts import KyutaiTTS
+        return KyutaiTTS()
+    
+    @cached_property
+    def asset_manager(self):
+        """Stock video and music asset manager"""
+        from .video_assembly.assets import AssetManager
+        from .video_assembly.cache import SearchCache, DownloadCache
+        return AssetManager(
+            search_cache=SearchCache(),
+            session=self.http,
+            download_cache=DownloadCache()
+        )
+    
+    @cached_property
+    def video_editor(self):
+        """FFmpeg-based video editor"""
+        from .video_assembly.editor import VideoEditor
+        return VideoEditor()
+    
+    @cached_property
+    def youtube_publisher(self):
+        """YouTube uploader"""
+        from .publishing.youtube_publisher import YouTubePublisher
+        return YouTubePublisher()
+    
+    @cached_property
+    def scheduler(self):
+        """Upload scheduler"""
+        from .publishing.scheduler import VideoScheduler
+        return VideoScheduler()
+    
+    def generate_video(
+        self,
+        publish: bool = False,
+        fact_data: Optional[Dict[str, Any]] = None,
+        video_id: Optional[str] = None
+    ) -> Optional[VideoInfo]:
+        """
+        Generate a complete video from scratch
+        
+        Synchronous wrapper around generate_video_async; must be called
+        outside a running event loop.
+        
+        Args:
+            publish: Whether to publish to YouTube immediately
+            fact_data: Pre-fetched fact (fetched from the API if not provided)
+            video_id: Video ID (timestamp-based if not provided)
+            
+        Returns:
+            VideoInfo for the generated video or None if failed
+        """
+        return asyncio.run(self.generate_video_async(
+            publish=publish,
+            fact_data=fact_data,
+            video_id=video_id
+        ))
+    
+    async def generate_video_async(
+        self,
+        publish: bool = False,
+        fact_data: Optional[Dict[str, Any]] = None,
+        video_id: Optional[str] = None,
+        upload_queue: Optional[asyncio.Queue] = None
+    ) -> Optional[VideoInfo]:
         """
         Generate a complete video from scratch
         
+        The background video and music only depend on the fact, so their
+        search and download start right after parsing and run behind script
+        generation and narration. Blocking calls run in worker threads to
+        keep the event loop free.
+        
         Args:
             publish: Whether to publish to YouTube immediately
+            fact_data: Pre-fetched fact (fetched from the API if not provided)
+            video_id: Video ID (timestamp-based if not provided)
+            upload_queue: Hand the video to this queue's uploader instead of
+                publishing inline (used by generate_batch)
             
         Returns:
-            Dictionary with video information or None if failed
+            VideoInfo for the generated video or None if failed
         """
+        pending_tasks = []
         try:
-            logger.info("=" * 80)
+            logger.info(_BANNER)
             logger.info("Starting video generation pipeline...")
-            logger.info("=" * 80)
+            logger.info(_BANNER)
             
             # Step 1: Fetch a random fact
             logger.info("\n[1/7] Fetching random fact...")
-            fact_data = self.fact_fetcher.fetch_random_fact()
+            if fact_data is None:
+                fact_data = await asyncio.to_thread(self.fact_fetcher.fetch_random_fact)
             if not fact_data:
                 logger.error("Failed to fetch fact")
                 return None
@@ -83,85 +168,68 @@ class ViralShortsGenerator:
                 return None
             
             fact_text = parsed_fact['text']
-            logger.info(f"Fact: {fact_text}")
+            logger.info("Fact: %s", fact_text)
+            
+            # Create video directory
+            video_id = video_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+            video_dir = self.storage.create_video_directory(video_id)
+            
+            # Background video and music only depend on the fact, so start
+            # them now and let them download behind script generation and TTS
+            keywords = self.fact_parser.extract_keywords(fact_text)
+            logger.info("Search keywords: %s", ', '.join(keywords))
+            background_task = asyncio.create_task(
+                asyncio.to_thread(self._find_and_download_background, keywords, video_dir)
+            )
+            music_task = asyncio.create_task(
+                asyncio.to_thread(self.asset_manager.get_background_music)
+            )
+            pending_tasks.extend([background_task, music_task])
             
             # Step 3: Generate script
             logger.info("\n[3/7] Generating script with AI...")
-            script_data = self.script_generator.generate_script(fact_text)
+            script_data = await asyncio.to_thread(self.script_generator.generate_script, fact_text)
             if not script_data:
                 logger.error("Failed to generate script")
                 return None
             
-            logger.info(f"Title: {script_data['title']}")
-            logger.info(f"Script: {script_data['script'][:100]}...")
+            logger.info("Title: %s", script_data['title'])
+            logger.info("Script: %.100s...", script_data['script'])
             
             # Step 4: Generate narration
             logger.info("\n[4/7] Generating narration (TTS)...")
             full_script = f"{script_data['hook']} {script_data['script']}"
-            
-            # Create video directory
-            video_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-            video_dir = self.storage.create_video_directory(video_id)
-            
-            # Generate speech
             voice_id = self.voice_manager.recommend_voice('fact')
             narration_path = video_dir / 'narration.wav'
             
-            tts_result = self.tts.generate_speech(
-                full_script,
-                narration_path,
-                voice=voice_id
-            )
-            
+            tts_result = await self.tts.generate_speech_async(full_script, narration_path, voice=voice_id)
             if not tts_result:
                 logger.error("Failed to generate narration")
                 return None
             
             word_timestamps = tts_result['word_timestamps']
             audio_duration = tts_result['duration']
-            logger.info(f"Narration generated: {audio_duration:.2f} seconds")
+            logger.info("Narration generated: %.2f seconds", audio_duration)
             
-            # Step 5: Find and download background video
+            # Step 5: Background video (usually already on disk by now)
             logger.info("\n[5/7] Finding background video...")
-            keywords = self.fact_parser.extract_keywords(fact_text)
-            logger.info(f"Search keywords: {', '.join(keywords)}")
-            
-            # Try up to 3 different videos if download fails
-            background_video = None
-            max_video_attempts = 3
-            
-            for attempt in range(max_video_attempts):
-                video_data = self.asset_manager.find_best_video(keywords)
-                if not video_data:
-                    logger.error("Failed to find background video")
-                    return None
-                
-                video_url = self.asset_manager.get_video_url(video_data)
-                if not video_url:
-                    logger.warning("Failed to get video URL, trying another video...")
-                    continue
-                
-                background_video = self.asset_manager.download_video(
-                    video_url,
-                    video_dir,
-                    'background.mp4'
+            try:
+                background_video = await background_task
+            except Exception as e:
+                logger.warning("Background video prefetch failed (%s), retrying...", e)
+                background_video = await asyncio.to_thread(
+                    self._find_and_download_background, keywords, video_dir
                 )
-                
-                if background_video:
-                    logger.info(f"Background video downloaded")
-                    break
-                else:
-                    logger.warning(f"Download failed (attempt {attempt + 1}/{max_video_attempts}), trying another video...")
             
             if not background_video:
-                logger.error("Failed to download video after multiple attempts")
+                logger.error("Failed to download background video")
                 return None
             
             # Step 6: Get background music
             logger.info("\n[6/7] Getting background music...")
-            background_music = self.asset_manager.get_background_music()
+            background_music = await music_task
             if background_music:
-                logger.info(f"Music: {background_music.name}")
+                logger.info("Music: %s", background_music.name)
             else:
                 logger.warning("No background music available")
             
@@ -169,7 +237,8 @@ class ViralShortsGenerator:
             logger.info("\n[7/7] Assembling final video...")
             output_path = video_dir / f"{video_id}.mp4"
             
-            final_video = self.video_editor.create_complete_video(
+            final_video = await asyncio.to_thread(
+                self.video_editor.create_complete_video,
                 background_video=background_video,
                 voice_audio=Path(tts_result['audio_path']),
                 background_music=background_music,
@@ -182,67 +251,212 @@ class ViralShortsGenerator:
                 logger.error("Failed to assemble video")
                 return None
             
-            logger.info(f"Video created successfully: {final_video}")
+            logger.info("Video created successfully: %s", final_video)
             
             # Prepare video information
-            video_info = {
-                'video_id': video_id,
-                'video_path': str(final_video),
-                'title': script_data['title'],
-                'description': script_data['description'],
-                'hashtags': script_data.get('hashtags', []),
-                'fact': fact_text,
-                'duration': audio_duration,
-                'created_at': datetime.now().isoformat()
-            }
+            video_info = VideoInfo(
+                video_id=video_id,
+                video_path=str(final_video),
+                title=script_data['title'],
+                description=script_data['description'],
+                hashtags=script_data.get('hashtags', []),
+                fact=fact_text,
+                duration=audio_duration,
+                created_at=datetime.now().isoformat()
+            )
             
             # Save video metadata
             metadata_file = video_dir / 'metadata.json'
-            import json
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(video_info, f, indent=2)
+            atomic_write_bytes(metadata_file, json_dumps(video_info.to_dict(), indent=True))
             
-            logger.info("=" * 80)
+            logger.info(_BANNER)
             logger.info("Video generation completed successfully!")
-            logger.info("=" * 80)
+            logger.info(_BANNER)
             
             # Publish if requested
-            if publish or AUTO_PUBLISH:
+            if (publish or AUTO_PUBLISH) and upload_queue is not None:
+                await upload_queue.put(video_info)
+            elif publish or AUTO_PUBLISH:
                 logger.info("\nPublishing to YouTube...")
-                youtube_id = self.publish_video(video_info)
+                youtube_id = await asyncio.to_thread(self.publish_video, video_info)
                 if youtube_id:
-                    video_info['youtube_id'] = youtube_id
-                    logger.info(f"Published to YouTube: {youtube_id}")
+                    video_info.youtube_id = youtube_id
+                    logger.info("Published to YouTube: %s", youtube_id)
             
             return video_info
             
         except Exception as e:
-            logger.error(f"Error in video generation pipeline: {e}", exc_info=True)
+            logger.error("Error in video generation pipeline: %s", e, exc_info=True)
+            return None
+        finally:
+            # Stop waiting on prefetches a failed run no longer needs
+            for task in pending_tasks:
+                task.cancel()
+    
+    def _find_and_download_background(self, keywords: List[str], video_dir: Path) -> Optional[Path]:
+        """
+        Find a background video for the keywords and download it
+        
+        Args:
+            keywords: Search keywords
+            video_dir: Directory to save the video in
+            
+        Returns:
+            Path to the downloaded video or None if failed
+        """
+        # Search once and try up to 3 different videos if download fails
+        max_video_attempts = 3
+        candidates = self.asset_manager.find_video_candidates(keywords, n=max_video_attempts)
+        if not candidates:
+            logger.error("Failed to find background video")
             return None
+        
+        for attempt, video_data in enumerate(candidates):
+            video_url = self.asset_manager.get_video_url(video_data)
+            if not video_url:
+                logger.warning("Failed to get video URL, trying another video...")
+                continue
+            
+            logger.info(
+                "Selected %ss video from %s for keyword: %s",
+                video_data['duration'], video_data['source'], video_data['keyword']
+            )
+            background_video = self.asset_manager.download_video_cached(
+                video_url,
+                video_dir,
+                'background.mp4'
+            )
+            
+            if background_video:
+                logger.info("Background video downloaded")
+                return background_video
+            else:
+                logger.warning("Download failed (attempt %d/%d), trying another video...", attempt + 1, len(candidates))
+        
+        logger.error("Failed to download video after multiple attempts")
+        return None
+    
+    def generate_videos(
+        self,
+        count: int,
+        publish: bool = False,
+        concurrency: Optional[int] = None
+    ) -> List[VideoInfo]:
+        """
+        Generate several videos in one batch
+        
+        Synchronous wrapper around generate_batch; must be called outside a
+        running event loop.
+        
+        Args:
+            count: Number of videos to generate
+            publish: Whether to publish each video to YouTube immediately
+            concurrency: Videos in progress at once (BATCH_CONCURRENCY if not provided)
+            
+        Returns:
+            List of VideoInfo for successful videos
+        """
+        return asyncio.run(self.generate_batch(count, publish=publish, concurrency=concurrency))
     
-    def publish_video(self, video_info: Dict[str, Any]) -> Optional[str]:
+    async def generate_batch(
+        self,
+        count: int,
+        publish: bool = False,
+        concurrency: Optional[int] = None
+    ) -> List[VideoInfo]:
+        """
+        Generate several videos concurrently on one event loop
+        
+        Facts are taken up front from the fact cache (topped up with
+        concurrent API requests), then up to `concurrency` pipelines run at
+        once so Edge TTS streams, background downloads and FFmpeg encodes
+        of different videos overlap without starting one encode per video
+        in the batch. Finished videos are published by a single uploader
+        task, so uploads overlap with the remaining generation without
+        competing for upload bandwidth.
+        
+        Args:
+            count: Number of videos to generate
+            publish: Whether to publish each video to YouTube immediately
+            concurrency: Videos in progress at once (BATCH_CONCURRENCY if not provided)
+            
+        Returns:
+            List of VideoInfo for successful videos
+        """
+        facts = await self.fact_fetcher.take_many_async(count)
+        
+        # Pipelines start within the same second, so suffix the timestamp
+        batch_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        logger.info("\nGenerating %d videos concurrently...", len(facts))
+        
+        # The pipelines share this generator's TTS, asset manager and editor
+        slots = asyncio.Semaphore(max(1, concurrency or BATCH_CONCURRENCY))
+        
+        async def run_one(i: int, fact_data: Dict[str, Any]) -> Optional[VideoInfo]:
+            async with slots:
+                return await self.generate_video_async(
+                    publish=publish,
+                    fact_data=fact_data,
+                    video_id=f"{batch_id}_{i + 1:02d}",
+                    upload_queue=upload_queue
+                )
+        
+        # Small bound so finished videos wait on the uploader rather than pile up
+        upload_queue = asyncio.Queue(maxsize=2)
+        uploader = asyncio.create_task(self._uploader_loop(upload_queue))
+        try:
+            results = await asyncio.gather(*[
+                run_one(i, fact_data) for i, fact_data in enumerate(facts)
+            ])
+            await upload_queue.join()
+        finally:
+            uploader.cancel()
+        
+        videos = [video_info for video_info in results if video_info]
+        logger.info("Generated %d/%d videos", len(videos), count)
+        return videos
+    
+    async def _uploader_loop(self, upload_queue: asyncio.Queue):
+        """
+        Publish queued videos one at a time until cancelled
+        
+        Args:
+            upload_queue: Queue of VideoInfo to publish
+        """
+        while True:
+            video_info = await upload_queue.get()
+            try:
+                logger.info("\nPublishing to YouTube: %s", video_info.title)
+                youtube_id = await asyncio.to_thread(self.publish_video, video_info)
+                if youtube_id:
+                    video_info.youtube_id = youtube_id
+                    logger.info("Published to YouTube: %s", youtube_id)
+            finally:
+                upload_queue.task_done()
+    
+    def publish_video(self, video_info: VideoInfo) -> Optional[str]:
         """
         Publish a video to YouTube
         
         Args:
-            video_info: Video information dictionary
+            video_info: Generated video information
             
         Returns:
             YouTube video ID or None if failed
         """
         try:
-            video_path = Path(video_info['video_path'])
+            video_path = Path(video_info.video_path)
             
             # Combine hashtags into description
-            hashtags = video_info.get('hashtags', [])
-            description = video_info['description']
+            hashtags = video_info.hashtags
+            description = video_info.description
             if hashtags:
                 description += '\n\n' + ' '.join(f'#{tag}' for tag in hashtags)
             
             # Upload to YouTube
             youtube_id = self.youtube_publisher.upload_video(
                 video_path=video_path,
-                title=video_info['title'],
+                title=video_info.title,
                 description=description,
                 tags=hashtags
             )
@@ -250,7 +464,7 @@ class ViralShortsGenerator:
             return youtube_id
             
         except Exception as e:
-            logger.error(f"Error publishing video: {e}")
+            logger.error("Error publishing video: %s", e)
             return None
     
     def test_apis(self) -> Dict[str, bool]:
@@ -262,19 +476,26 @@ class ViralShortsGenerator:
         """
         logger.info("Testing API connections...")
         
-        results = {
-            'fact_api': self.fact_fetcher.test_connection(),
-            'script_generator': self.script_generator.test_connection(),
-            'tts': self.tts.test_connection(),
-            'video_apis': self.asset_manager.test_apis(),
-            'youtube': self.youtube_publisher.test_connection()
+        # Lambdas defer the lazy module accessors to the worker threads too
+        tests = {
+            'fact_api': lambda: self.fact_fetcher.test_connection(),
+            'script_generator': lambda: self.script_generator.test_connection(),
+            'tts': lambda: self.tts.test_connection(),
+            'video_apis': lambda: self.asset_manager.test_apis(),
+            'youtube': lambda: self.youtube_publisher.test_connection()
         }
         
+        # Each probe is an independent network round trip, so run them at once
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = {executor.submit(test): name for name, test in tests.items()}
+            completed = {futures[future]: future.result() for future in as_completed(futures)}
+        results = {name: completed[name] for name in tests}
+        
         # Print results
         logger.info("\nAPI Test Results:")
         for api, status in results.items():
             status_str = "✓ PASS" if status else "✗ FAIL"
-            logger.info(f"  {api}: {status_str}")
+            logger.info("  %s: %s", api, status_str)
         
         return results
     
@@ -283,7 +504,7 @@ class ViralShortsGenerator:
         config = get_config_summary()
         logger.info("\nCurrent Configuration:")
         for key, value in config.items():
-            logger.info(f"  {key}: {value}")
+            logger.info("  %s: %s", key, value)
 
 
 def main():
@@ -304,11 +525,11 @@ def main():
         video_info = generator.generate_video(publish=False)
         
         if video_info:
-            logger.info("\n" + "=" * 80)
+            logger.info("\n%s", _BANNER)
             logger.info("SUCCESS!")
-            logger.info(f"Video saved to: {video_info['video_path']}")
-            logger.info(f"Title: {video_info['title']}")
-            logger.info("=" * 80)
+            logger.info("Video saved to: %s", video_info.video_path)
+            logger.info("Title: %s", video_info.title)
+            logger.info(_BANNER)
             return 0
         else:
             logger.error("\nVideo generation failed")
@@ -318,7 +539,7 @@ def main():
         logger.info("\nOperation cancelled by user")
         return 130
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         return 1
 
 
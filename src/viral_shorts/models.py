@@ -0,0 +1,46 @@
+"""
+Pipeline data models
+Typed records passed between the generator, publisher and scheduler
+"""
+
+from dataclasses import dataclass, field, asdict, fields
+from typing import Dict, Any, List, Optional
+
+
+@dataclass
+class VideoInfo:
+    """A generated video and the metadata needed to publish it"""
+    video_id: str
+    video_path: str
+    title: str
+    description: str
+    fact: str
+    duration: float
+    created_at: str
+    hashtags: List[str] = field(default_factory=list)
+    youtube_id: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to a plain dictionary (the metadata.json layout)
+        
+        Returns:
+            Dictionary of all fields
+        """
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'VideoInfo':
+        """
+        Build from a dictionary such as a loaded metadata.json
+        
+        Unknown keys are ignored so older or extended metadata still loads.
+        
+        Args:
+            data: Dictionary with at least the required fields
+            
+        Returns:
+            VideoInfo instance
+        """
+        names = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
@@ -1,6 +1,20 @@
 """Narration module for text-to-speech conversion"""
 
-from .tts import KyutaiTTS
-from .voice_manager import VoiceManager
+import importlib
 
-__all__ = ['KyutaiTTS', 'VoiceManager']
+__all__ = ['KyutaiTTS', 'VoiceManager', 'WordTimestamps']
+
+# Submodules are imported on first attribute access (PEP 562) so that
+# voice lookups don't load the TTS backend
+_LAZY_ATTRS = {
+    'KyutaiTTS': '.tts',
+    'VoiceManager': '.voice_manager',
+    'WordTimestamps': '.timestamps',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
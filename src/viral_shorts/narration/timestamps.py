@@ -0,0 +1,109 @@
+"""
+Word timestamps module
+Compact column-wise storage for word-level narration timings
+"""
+
+from array import array
+from bisect import bisect_right
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
+
+
+class WordTimestamps:
+    """
+    Word timings stored as parallel columns instead of one dict per word
+    
+    Starts and ends live in flat float arrays (8 bytes per value) next to a
+    list of words. Iterating or indexing still yields the familiar
+    {'word', 'start', 'end', 'duration'} dicts for existing callers, and
+    slicing gives another WordTimestamps.
+    """
+    
+    __slots__ = ('words', 'start', 'end')
+    
+    def __init__(self, words: Iterable[str], start: Iterable[float], end: Iterable[float]):
+        """
+        Initialize the WordTimestamps
+        
+        Args:
+            words: Words in spoken order
+            start: Start time of each word in seconds
+            end: End time of each word in seconds
+        """
+        self.words = list(words)
+        self.start = array('d', start)
+        self.end = array('d', end)
+        
+        if not len(self.words) == len(self.start) == len(self.end):
+            raise ValueError("words, start and end must have the same length")
+    
+    @classmethod
+    def from_list_of_dicts(cls, timestamps: Iterable[Dict[str, Any]]) -> 'WordTimestamps':
+        """
+        Build from a list of word timestamp dictionaries
+        
+        Args:
+            timestamps: Dicts with 'word', 'start' and 'end' keys
+            
+        Returns:
+            WordTimestamps instance
+        """
+        if isinstance(timestamps, cls):
+            return timestamps
+        timestamps = list(timestamps)
+        return cls(
+            (item['word'] for item in timestamps),
+            (item['start'] for item in timestamps),
+            (item['end'] for item in timestamps)
+        )
+    
+    def to_list_of_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Convert to a list of word timestamp dictionaries (e.g. for JSON)
+        
+        Returns:
+            List of dicts with 'word', 'start', 'end' and 'duration' keys
+        """
+        return list(self)
+    
+    def index_at(self, seconds: float) -> Optional[int]:
+        """
+        Find the word being spoken at a point in time
+        
+        Args:
+            seconds: Time in seconds
+            
+        Returns:
+            Index of the word or None if no word is shown at that time
+        """
+        i = bisect_right(self.start, seconds) - 1
+        if i >= 0 and seconds < self.end[i]:
+            return i
+        return None
+    
+    def _item(self, i: int) -> Dict[str, Any]:
+        start, end = self.start[i], self.end[i]
+        return {
+            'word': self.words[i],
+            'start': start,
+            'end': end,
+            'duration': round(end - start, 3)
+        }
+    
+    def __len__(self) -> int:
+        return len(self.words)
+    
+    def __getitem__(self, i: Union[int, slice]) -> Union[Dict[str, Any], 'WordTimestamps']:
+        if isinstance(i, slice):
+            # Slices stay column-wise, like slicing a list gives a list
+            return WordTimestamps(self.words[i], self.start[i], self.end[i])
+        if i < 0:
+            i += len(self.words)
+        if not 0 <= i < len(self.words):
+            raise IndexError("word timestamp index out of range")
+        return self._item(i)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self._item(i) for i in range(len(self.words)))
+    
+    def __repr__(self) -> str:
+        return f"WordTimestamps({len(self.words)} words)"
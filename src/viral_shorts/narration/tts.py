@@ -3,15 +3,84 @@ Kyutai TTS integration module
 Handles text-to-speech conversion using Kyutai TTS via Google Colab
 """
 
-import json
+import io
 import time
-from typing import Dict, Any, Optional, List
+import wave
+import atexit
+import logging
+import asyncio
+import threading
+import contextlib
+import subprocess
+from typing import Dict, Any, Optional, List, Union
 from pathlib import Path
-from ..config import COLAB_NOTEBOOK_URL, TEMP_DIR
+from ..config import COLAB_NOTEBOOK_URL, TEMP_DIR, FFMPEG_COMMAND, FFMPEG_LOGLEVEL
 from ..utils.logger import setup_logger
+from ..utils.serialization import json_dumps
+from ..utils.storage import atomic_write_bytes
+from .timestamps import WordTimestamps
 
 logger = setup_logger(__name__)
 
+# Sample rate of generated narration WAVs
+SAMPLE_RATE = 24000
+
+# Edge TTS output format is audio-24khz-48kbitrate-mono-mp3 (CBR)
+EDGE_TTS_BITRATE = 48000
+
+# Maximum Edge TTS streams in flight at once in this process
+EDGE_TTS_CONCURRENCY = 8
+
+_loop_lock = threading.Lock()
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Shared by every event loop and KyutaiTTS instance, since the throttling
+# it avoids is per client, not per loop
+_edge_tts_slots = threading.BoundedSemaphore(EDGE_TTS_CONCURRENCY)
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the process-wide event loop used by synchronous TTS calls
+    
+    The loop runs forever on a daemon thread, so sync callers (including
+    ones already inside another loop's worker thread) submit coroutines to it
+    instead of paying for a fresh asyncio.run loop per utterance.
+    
+    Returns:
+        Running event loop
+    """
+    global _background_loop
+    with _loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever,
+                name='tts-event-loop',
+                daemon=True
+            ).start()
+            atexit.register(loop.call_soon_threadsafe, loop.stop)
+            _background_loop = loop
+        return _background_loop
+
+
+@contextlib.asynccontextmanager
+async def _edge_tts_slot():
+    """Hold one of the process-wide Edge TTS stream slots"""
+    if not _edge_tts_slots.acquire(blocking=False):
+        # Wait on a worker thread so the event loop keeps running
+        acquire = asyncio.ensure_future(asyncio.to_thread(_edge_tts_slots.acquire))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # The thread still takes the slot; hand it straight back
+            acquire.add_done_callback(lambda _: _edge_tts_slots.release())
+            raise
+    try:
+        yield
+    finally:
+        _edge_tts_slots.release()
+
 
 class KyutaiTTS:
     """
@@ -60,17 +129,51 @@ class KyutaiTTS:
                 timestamp = int(time.time())
                 output_path = TEMP_DIR / f"narration_{timestamp}.wav"
             
-            logger.info(f"Generating speech for text: {text[:50]}...")
+            logger.info("Generating speech for text: %.50s...", text)
             
             # For now, always use fallback TTS (gTTS) until Colab is set up
             logger.info("Using gTTS (Google Text-to-Speech) fallback")
             return self._fallback_tts(text, output_path)
             
         except Exception as e:
-            logger.error(f"Error generating speech: {e}")
+            logger.error("Error generating speech: %s", e)
+            return None
+    
+    async def generate_speech_async(
+        self,
+        text: str,
+        output_path: Optional[Path] = None,
+        voice: str = "default",
+        speed: float = 1.0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Generate speech from text without blocking the event loop
+        
+        Lets batch runs stream several Edge TTS requests concurrently on a
+        single loop instead of one asyncio.run per utterance.
+        
+        Args:
+            text: Text to convert to speech
+            output_path: Path to save the audio file
+            voice: Voice ID to use
+            speed: Speech speed multiplier
+            
+        Returns:
+            Dictionary containing audio file path and word timestamps
+        """
+        try:
+            if not output_path:
+                timestamp = int(time.time())
+                output_path = TEMP_DIR / f"narration_{timestamp}.wav"
+            
+            logger.info("Generating speech for text: %.50s...", text)
+            return await self._fallback_tts_async(text, output_path)
+            
+        except Exception as e:
+            logger.error("Error generating speech: %s", e)
             return None
     
-    def _generate_dummy_timestamps(self, text: str, total_duration: float = None) -> List[Dict[str, Any]]:
+    def _generate_dummy_timestamps(self, text: str, total_duration: float = None) -> WordTimestamps:
         """
         Generate accurate word-level timestamps synchronized with audio
         
@@ -79,13 +182,12 @@ class KyutaiTTS:
             total_duration: Total audio duration in seconds (if known)
             
         Returns:
-            List of word timestamp dictionaries
+            Word timestamps (iterates as word timestamp dictionaries)
         """
         words = text.split()
-        timestamps = []
         
         if not words:
-            return timestamps
+            return WordTimestamps([], [], [])
         
         # If we don't have total duration, estimate it
         if total_duration is None:
@@ -96,24 +198,14 @@ class KyutaiTTS:
         # This ensures captions stay in sync with audio
         time_per_word = total_duration / len(words)
         
-        current_time = 0.0
-        
-        for i, word in enumerate(words):
-            # Each word gets equal time - no complex calculations
-            # This keeps captions perfectly synced with speech
-            word_duration = time_per_word * 0.95  # Show word for 95% of its slot
-            
-            timestamps.append({
-                'word': word,
-                'start': round(current_time, 3),
-                'end': round(current_time + word_duration, 3),
-                'duration': round(word_duration, 3)
-            })
-            
-            # Move to next word slot
-            current_time += time_per_word
+        word_duration = time_per_word * 0.95  # Show word for 95% of its slot
+        starts = [i * time_per_word for i in range(len(words))]
         
-        return timestamps
+        return WordTimestamps(
+            words,
+            (round(start, 3) for start in starts),
+            (round(start + word_duration, 3) for start in starts)
+        )
     
     def _fallback_tts(self, text: str, output_path: Path) -> Dict[str, Any]:
         """
@@ -132,52 +224,99 @@ class KyutaiTTS:
             return self._edge_tts(text, output_path)
             
         except Exception as edge_error:
-            logger.warning(f"Edge TTS failed: {edge_error}, falling back to gTTS")
-            try:
-                # Fallback to gTTS
-                logger.info("Using gTTS (Google Text-to-Speech) as backup")
-                
-                from gtts import gTTS
-                from pydub import AudioSegment
-                
-                # Generate speech with gTTS
-                tts = gTTS(text=text, lang='en', slow=False)
-                
-                # Save as temporary MP3
-                temp_mp3 = output_path.parent / f"{output_path.stem}_temp.mp3"
-                tts.save(str(temp_mp3))
-                
-                # Convert MP3 to WAV using pydub
-                audio = AudioSegment.from_mp3(str(temp_mp3))
-                audio.export(str(output_path), format="wav")
-                
-                # Clean up temp file
-                temp_mp3.unlink()
-                
-                # Get duration
-                duration = len(audio) / 1000.0  # pydub returns milliseconds
-                
-                logger.info(f"Generated audio file: {output_path} ({duration:.2f}s)")
-                
-                return {
-                    'audio_path': str(output_path),
-                    'duration': duration,
-                    'word_timestamps': self._generate_dummy_timestamps(text, duration),
-                    'sample_rate': 24000,
-                    'fallback': True
-                }
-                
-            except ImportError:
-                logger.error("gTTS or pydub not installed. Install with: pip install gtts pydub")
-                return None
-            except Exception as e:
-                logger.error(f"Error in fallback TTS: {e}")
+            logger.warning("Edge TTS failed: %s, falling back to gTTS", edge_error)
+            return self._gtts(text, output_path)
+    
+    async def _fallback_tts_async(self, text: str, output_path: Path) -> Dict[str, Any]:
+        """
+        Async variant of _fallback_tts
+        
+        Args:
+            text: Text to convert
+            output_path: Output file path
+            
+        Returns:
+            Dictionary with TTS results
+        """
+        try:
+            logger.info("Using Microsoft Edge TTS (high quality)")
+            return await self._edge_tts_async(text, output_path)
+            
+        except Exception as edge_error:
+            logger.warning("Edge TTS failed: %s, falling back to gTTS", edge_error)
+            return await asyncio.to_thread(self._gtts, text, output_path)
+    
+    def _gtts(self, text: str, output_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Generate speech using gTTS (Google Text-to-Speech) as a backup
+        
+        Args:
+            text: Text to convert
+            output_path: Output file path
+            
+        Returns:
+            Dictionary with TTS results or None if failed
+        """
+        try:
+            logger.info("Using gTTS (Google Text-to-Speech) as backup")
+            
+            from gtts import gTTS
+            
+            # Generate speech with gTTS
+            tts = gTTS(text=text, lang='en', slow=False)
+            
+            # Keep the MP3 in memory instead of a temporary file
+            mp3_buffer = io.BytesIO()
+            tts.write_to_fp(mp3_buffer)
+            
+            # Pipe the MP3 through one ffmpeg pass straight to 24 kHz mono WAV
+            result = subprocess.run(
+                [
+                    FFMPEG_COMMAND,
+                    '-f', 'mp3',
+                    '-i', 'pipe:0',
+                    '-ar', str(SAMPLE_RATE),
+                    '-ac', '1',
+                    '-loglevel', FFMPEG_LOGLEVEL,
+                    '-y',
+                    str(output_path)
+                ],
+                input=mp3_buffer.getvalue(),
+                capture_output=True,
+                timeout=60
+            )
+            
+            if result.returncode != 0:
+                logger.error("MP3 to WAV conversion failed: %s", result.stderr.decode(errors='replace'))
                 return None
+            
+            # Duration from the WAV header, no need to decode the samples again
+            with wave.open(str(output_path), 'rb') as wav_file:
+                duration = wav_file.getnframes() / wav_file.getframerate()
+            
+            logger.info("Generated audio file: %s (%.2fs)", output_path, duration)
+            
+            return {
+                'audio_path': str(output_path),
+                'duration': duration,
+                'word_timestamps': self._generate_dummy_timestamps(text, duration),
+                'sample_rate': SAMPLE_RATE,
+                'fallback': True
+            }
+            
+        except ImportError:
+            logger.error("gTTS not installed. Install with: pip install gtts")
+            return None
+        except Exception as e:
+            logger.error("Error in fallback TTS: %s", e)
+            return None
     
     def _edge_tts(self, text: str, output_path: Path) -> Dict[str, Any]:
         """
         Generate speech using Microsoft Edge TTS
         
+        Runs on the shared background event loop rather than a new loop per call.
+        
         Args:
             text: Text to convert
             output_path: Output file path
@@ -185,39 +324,58 @@ class KyutaiTTS:
         Returns:
             Dictionary with TTS results
         """
-        import asyncio
-        import edge_tts
-        from pydub import AudioSegment
+        future = asyncio.run_coroutine_threadsafe(
+            self._edge_tts_async(text, output_path),
+            _get_background_loop()
+        )
+        return future.result()
+    
+    async def _edge_tts_async(self, text: str, output_path: Path) -> Dict[str, Any]:
+        """
+        Generate speech using Microsoft Edge TTS on the running event loop
         
-        async def _generate():
-            # Use an engaging, energetic voice for viral content
-            # en-US-ChristopherNeural - Young, energetic male voice (best for viral content)
-            # en-US-GuyNeural - Professional male voice
-            # en-US-JennyNeural - Friendly female voice
-            voice = "en-US-ChristopherNeural"  # More engaging and energetic
+        Args:
+            text: Text to convert
+            output_path: Output file path
             
-            # Increase rate slightly for more dynamic delivery
-            communicate = edge_tts.Communicate(
-                text, 
-                voice,
-                rate="+10%"  # Slightly faster for viral shorts
-            )
-            await communicate.save(str(output_path))
+        Returns:
+            Dictionary with TTS results
+        """
+        import edge_tts
+        
+        # Use an engaging, energetic voice for viral content
+        # en-US-ChristopherNeural - Young, energetic male voice (best for viral content)
+        # en-US-GuyNeural - Professional male voice
+        # en-US-JennyNeural - Friendly female voice
+        voice = "en-US-ChristopherNeural"  # More engaging and energetic
         
-        # Run async function
-        asyncio.run(_generate())
+        # Increase rate slightly for more dynamic delivery
+        communicate = edge_tts.Communicate(
+            text, 
+            voice,
+            rate="+10%"  # Slightly faster for viral shorts
+        )
+        # Bound concurrent streams so batch runs don't get throttled
+        audio_bytes = 0
+        async with _edge_tts_slot():
+            with open(output_path, 'wb') as audio_file:
+                async for message in communicate.stream():
+                    if message['type'] == 'audio':
+                        audio_file.write(message['data'])
+                        audio_bytes += len(message['data'])
         
-        # Get duration
-        audio = AudioSegment.from_file(str(output_path))
-        duration = len(audio) / 1000.0
+        # Edge TTS always sends constant-bitrate MP3, so the duration follows
+        # from the byte count without decoding the file again
+        duration = audio_bytes * 8 / EDGE_TTS_BITRATE
         
-        logger.info(f"Generated audio file with Edge TTS: {output_path} ({duration:.2f}s)")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Generated audio file with Edge TTS: %s (%.2fs)", output_path, duration)
         
         return {
             'audio_path': str(output_path),
             'duration': duration,
             'word_timestamps': self._generate_dummy_timestamps(text, duration),
-            'sample_rate': 24000,
+            'sample_rate': SAMPLE_RATE,
             'fallback': True
         }
     
@@ -238,27 +396,28 @@ class KyutaiTTS:
             logger.info("Colab URL is set, but connection test not implemented")
             return True
         except Exception as e:
-            logger.error(f"Connection test failed: {e}")
+            logger.error("Connection test failed: %s", e)
             return False
     
-    def save_timestamps(self, timestamps: List[Dict[str, Any]], output_path: Path) -> bool:
+    def save_timestamps(self, timestamps: Union[WordTimestamps, List[Dict[str, Any]]], output_path: Path) -> bool:
         """
         Save word timestamps to a JSON file
         
         Args:
-            timestamps: List of word timestamp dictionaries
+            timestamps: Word timestamps or a list of word timestamp dictionaries
             output_path: Path to save the JSON file
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(timestamps, f, indent=2)
+            if isinstance(timestamps, WordTimestamps):
+                timestamps = timestamps.to_list_of_dicts()
+            atomic_write_bytes(Path(output_path), json_dumps(timestamps, indent=True))
             
-            logger.info(f"Saved timestamps to {output_path}")
+            logger.info("Saved timestamps to %s", output_path)
             return True
             
         except Exception as e:
-            logger.error(f"Error saving timestamps: {e}")
+            logger.error("Error saving timestamps: %s", e)
             return False
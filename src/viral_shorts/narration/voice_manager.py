@@ -3,7 +3,8 @@ Voice manager module
 Manages voice selection and TTS settings
 """
 
-from typing import Dict, Any, List, Optional
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Mapping
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -44,6 +45,23 @@ class VoiceManager:
         }
     }
     
+    # Voice recommended for each content type
+    _CONTENT_TO_VOICE = {
+        'fact': 'authoritative',
+        'story': 'energetic',
+        'tutorial': 'calm',
+        'entertainment': 'energetic',
+        'education': 'professional'
+    }
+    
+    # TTS settings per voice style, built once and shared read-only
+    _DEFAULT_SETTINGS = MappingProxyType({'speed': 1.0, 'pitch': 1.0, 'volume': 1.0})
+    _SETTINGS_BY_STYLE = {
+        'enthusiastic': MappingProxyType({'speed': 1.1, 'pitch': 1.05, 'volume': 1.0}),
+        'soothing': MappingProxyType({'speed': 0.95, 'pitch': 1.0, 'volume': 1.0}),
+        'confident': MappingProxyType({'speed': 1.0, 'pitch': 0.95, 'volume': 1.0})
+    }
+    
     def __init__(self):
         """Initialize the VoiceManager"""
         self.current_voice = 'default'
@@ -59,7 +77,7 @@ class VoiceManager:
             Voice profile dictionary or None if not found
         """
         if voice_id not in self.VOICES:
-            logger.warning(f"Voice '{voice_id}' not found, using default")
+            logger.warning("Voice '%s' not found, using default", voice_id)
             voice_id = 'default'
         
         return self.VOICES.get(voice_id)
@@ -85,10 +103,10 @@ class VoiceManager:
         """
         if voice_id in self.VOICES:
             self.current_voice = voice_id
-            logger.info(f"Set voice to: {voice_id}")
+            logger.info("Set voice to: %s", voice_id)
             return True
         else:
-            logger.error(f"Voice '{voice_id}' not found")
+            logger.error("Voice '%s' not found", voice_id)
             return False
     
     def get_current_voice(self) -> Dict[str, Any]:
@@ -110,19 +128,11 @@ class VoiceManager:
         Returns:
             Recommended voice ID
         """
-        recommendations = {
-            'fact': 'authoritative',
-            'story': 'energetic',
-            'tutorial': 'calm',
-            'entertainment': 'energetic',
-            'education': 'professional'
-        }
-        
-        voice_id = recommendations.get(content_type.lower(), 'default')
-        logger.info(f"Recommended voice for '{content_type}': {voice_id}")
+        voice_id = self._CONTENT_TO_VOICE.get(content_type.lower(), 'default')
+        logger.info("Recommended voice for '%s': %s", content_type, voice_id)
         return voice_id
     
-    def get_voice_settings(self, voice_id: Optional[str] = None) -> Dict[str, Any]:
+    def get_voice_settings(self, voice_id: Optional[str] = None) -> Mapping[str, Any]:
         """
         Get recommended TTS settings for a voice
         
@@ -130,30 +140,16 @@ class VoiceManager:
             voice_id: Voice identifier (uses current voice if not provided)
             
         Returns:
-            Dictionary of TTS settings
+            Read-only mapping of TTS settings (copy with dict() to modify)
         """
         if not voice_id:
             voice_id = self.current_voice
         
         voice = self.get_voice(voice_id)
         
-        # Base settings
-        settings = {
-            'speed': 1.0,
-            'pitch': 1.0,
-            'volume': 1.0
-        }
-        
-        # Adjust based on voice style
-        if voice and voice.get('style') == 'enthusiastic':
-            settings['speed'] = 1.1
-            settings['pitch'] = 1.05
-        elif voice and voice.get('style') == 'soothing':
-            settings['speed'] = 0.95
-        elif voice and voice.get('style') == 'confident':
-            settings['pitch'] = 0.95
-        
-        return settings
+        if not voice:
+            return self._DEFAULT_SETTINGS
+        return self._SETTINGS_BY_STYLE.get(voice.get('style'), self._DEFAULT_SETTINGS)
     
     def validate_voice_config(self, config: Dict[str, Any]) -> bool:
         """
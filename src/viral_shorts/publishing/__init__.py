@@ -1,6 +1,19 @@
 """Publishing module for uploading videos to YouTube"""
 
-from .youtube_publisher import YouTubePublisher
-from .scheduler import VideoScheduler
+import importlib
 
 __all__ = ['YouTubePublisher', 'VideoScheduler']
+
+# Submodules are imported on first attribute access (PEP 562) so that
+# importing the scheduler doesn't pull in the Google API client
+_LAZY_ATTRS = {
+    'YouTubePublisher': '.youtube_publisher',
+    'VideoScheduler': '.scheduler',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
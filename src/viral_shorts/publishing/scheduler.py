@@ -3,52 +3,357 @@ Video scheduler module
 Handles scheduling and queuing of video uploads
 """
 
-import json
+import os
+import sys
 import time
+import heapq
+import bisect
+from collections import Counter
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from ..utils.logger import setup_logger
-from ..utils.storage import StorageManager
+from ..utils.storage import StorageManager, atomic_write_bytes
+from ..utils.serialization import json_loads, json_dumps, JSONDecodeError
+from ..models import VideoInfo
 
 logger = setup_logger(__name__)
 
+# Journal size at which mutations are folded back into the snapshot file
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+# Canonical status strings; loaded entries are pointed at these objects
+_STATUSES = {status: status for status in ('pending', 'uploaded', 'failed')}
+
 
 class VideoScheduler:
-    """Manages video upload scheduling and queue"""
+    """
+    Manages video upload scheduling and queue
+    
+    On disk the queue is a snapshot file (upload_queue.json) plus a journal
+    of the changes made since (upload_queue.jsonl). The snapshot alone is
+    not authoritative: it is only rewritten on compaction, clear_completed,
+    bulk saves and close(), so read the queue through this class.
+    """
     
-    def __init__(self, queue_file: Optional[Path] = None):
+    def __init__(self, queue_file: Optional[Path] = None, pretty: bool = False):
         """
         Initialize the VideoScheduler
         
         Args:
             queue_file: Path to queue file (auto-created if not provided)
+            pretty: Indent the queue file for reading by hand (about twice the bytes)
         """
         self.storage = StorageManager()
         self.queue_file = queue_file or (self.storage.output_dir / 'upload_queue.json')
+        self.pretty = pretty
+        # Append-only log of mutations since the last snapshot
+        self.journal_file = self.queue_file.with_suffix('.jsonl')
+        self._journal = None
+        # Nesting depth of bulk() blocks and whether a snapshot was deferred
+        self._bulk_depth = 0
+        self._save_deferred = False
+        # Whether the snapshot file is behind self.queue
+        self._dirty = False
         self.queue = self._load_queue()
+        self._build_indexes()
+    
+    @staticmethod
+    def _scheduled_ts(video: Dict[str, Any]) -> float:
+        """
+        Get a queue entry's scheduled time as epoch seconds
+        
+        Uses the scheduled_ts stored at insert time and only parses
+        scheduled_time for entries queued before it existed.
+        
+        Args:
+            video: Queue entry
+            
+        Returns:
+            Scheduled time as a POSIX timestamp
+        """
+        scheduled_ts = video.get('scheduled_ts')
+        if scheduled_ts is not None:
+            return scheduled_ts
+        
+        scheduled = video.get('scheduled_time')
+        if isinstance(scheduled, str):
+            scheduled = datetime.fromisoformat(scheduled)
+        return scheduled.timestamp()
+    
+    @staticmethod
+    def _uploaded_ts(video: Dict[str, Any]) -> Optional[float]:
+        """
+        Get an uploaded entry's upload time as epoch seconds
+        
+        Args:
+            video: Queue entry with status 'uploaded'
+            
+        Returns:
+            Upload time as a POSIX timestamp, or None if it was never recorded
+        """
+        uploaded_ts = video.get('uploaded_ts')
+        if uploaded_ts is not None:
+            return uploaded_ts
+        
+        uploaded_at = video.get('uploaded_at')
+        if uploaded_at is None:
+            return None
+        return datetime.fromisoformat(str(uploaded_at)).timestamp()
+    
+    def _build_indexes(self):
+        """Rebuild the id lookup, status counts and pending-by-time heap from self.queue"""
+        self._by_id: Dict[str, Dict[str, Any]] = {video['id']: video for video in self.queue}
+        # (scheduled timestamp, id) of pending entries; entries that stop
+        # being pending are dropped lazily when they reach the top
+        self._pending_heap = [
+            (self._scheduled_ts(video), video['id'])
+            for video in self.queue
+            if video['status'] == 'pending'
+        ]
+        heapq.heapify(self._pending_heap)
+        # Kept current by every mutation so get_queue_stats doesn't scan
+        self._status_counts = Counter(video.get('status', 'pending') for video in self.queue)
+        # (upload timestamp, id) of uploaded entries, oldest first, so
+        # clear_completed can bisect to its cutoff
+        self._uploaded_sorted = sorted(
+            (uploaded_ts, video['id'])
+            for video in self.queue
+            if video['status'] == 'uploaded'
+            and (uploaded_ts := self._uploaded_ts(video)) is not None
+        )
+    
+    def _set_status(self, video: Dict[str, Any], status: str):
+        """
+        Move an entry to a new status, keeping the status counts current
+        
+        Args:
+            video: Queue entry
+            status: New status
+        """
+        self._status_counts[video.get('status', 'pending')] -= 1
+        self._status_counts[status] += 1
+        video['status'] = status
     
     def _load_queue(self) -> List[Dict[str, Any]]:
-        """Load upload queue from file"""
+        """Load upload queue from the snapshot file and replay the journal"""
+        queue = []
         try:
             if self.queue_file.exists():
-                with open(self.queue_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
+                with open(self.queue_file, 'rb') as f:
+                    queue = json_loads(f.read())
         except Exception as e:
-            logger.error(f"Error loading queue: {e}")
+            logger.error("Error loading queue: %s", e)
             return []
+        
+        try:
+            if self.journal_file.exists():
+                self._replay_journal(queue)
+                self._dirty = True
+        except Exception as e:
+            logger.error("Error replaying queue journal: %s", e)
+        
+        self._intern_entries(queue)
+        return queue
+    
+    @staticmethod
+    def _intern_entries(queue: List[Dict[str, Any]]):
+        """
+        Share one string object per distinct status and tag across entries
+        
+        JSON decoding creates a fresh string for every value, so a long upload
+        history holds thousands of copies of 'uploaded' and the same few tags.
+        
+        Args:
+            queue: Loaded queue entries (modified in place)
+        """
+        for video in queue:
+            status = video.get('status')
+            if status in _STATUSES:
+                video['status'] = _STATUSES[status]
+            tags = video.get('tags')
+            if tags:
+                video['tags'] = [sys.intern(tag) if isinstance(tag, str) else tag for tag in tags]
+    
+    def _replay_journal(self, queue: List[Dict[str, Any]]):
+        """
+        Apply journaled mutations to a loaded snapshot
+        
+        Args:
+            queue: Queue loaded from the snapshot file (modified in place)
+        """
+        by_id = {video['id']: video for video in queue}
+        
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json_loads(line)
+                except JSONDecodeError:
+                    # A crash mid-append leaves at most one torn last line
+                    logger.warning("Skipping incomplete queue journal entry")
+                    continue
+                
+                if entry['op'] == 'add':
+                    video = entry['video']
+                    queue.append(video)
+                    by_id[video['id']] = video
+                elif entry['op'] == 'update' and entry['id'] in by_id:
+                    by_id[entry['id']].update(entry['fields'])
     
     def _save_queue(self) -> bool:
-        """Save upload queue to file"""
+        """Write the whole queue as a new snapshot and reset the journal"""
+        if self._bulk_depth:
+            self._save_deferred = True
+            return True
+        
+        self._save_deferred = False
+        if not self._dirty:
+            return True
+        
         try:
-            with open(self.queue_file, 'w', encoding='utf-8') as f:
-                json.dump(self.queue, f, indent=2, default=str)
+            # One write to a temp file renamed over the snapshot, so a crash
+            # can't leave a truncated queue behind
+            atomic_write_bytes(self.queue_file, json_dumps(self.queue, indent=self.pretty))
+            
+            # Everything journaled so far is now in the snapshot
+            if self._journal:
+                self._journal.close()
+                self._journal = None
+            if self.journal_file.exists():
+                self.journal_file.unlink()
+            self._dirty = False
             return True
         except Exception as e:
-            logger.error(f"Error saving queue: {e}")
+            logger.error("Error saving queue: %s", e)
+            return False
+    
+    def _append_journal(self, entry: Dict[str, Any]) -> bool:
+        """
+        Record one mutation as a single appended line
+        
+        Compacts into the snapshot once the journal grows past
+        JOURNAL_COMPACT_BYTES. Inside bulk() the line stays in the write
+        buffer until the block ends.
+        
+        Args:
+            entry: Journal entry ({'op': 'add', 'video': ...} or
+                {'op': 'update', 'id': ..., 'fields': ...})
+            
+        Returns:
+            True if recorded successfully, False otherwise
+        """
+        # Even if the append fails, the next snapshot must include the change
+        self._dirty = True
+        try:
+            if self._journal is None:
+                self._journal = open(self.journal_file, 'ab', buffering=1 << 16)
+            
+            self._journal.write(json_dumps(entry) + b'\n')
+            if self._bulk_depth:
+                return True
+            return self._flush_journal()
+        except Exception as e:
+            logger.error("Error writing queue journal: %s", e)
             return False
     
+    def _flush_journal(self) -> bool:
+        """
+        Push buffered journal lines to disk, compacting if the journal is large
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        self._journal.flush()
+        if self._journal.tell() > JOURNAL_COMPACT_BYTES:
+            return self._compact()
+        return True
+    
+    @contextmanager
+    def bulk(self):
+        """
+        Group queue mutations into a single write
+        
+        Journal lines and snapshot rewrites requested inside the block are
+        deferred and written once when the outermost block exits. Journal
+        appends made inside the block report success before anything is on
+        disk, so check for the OSError raised on exit.
+        
+        Raises:
+            OSError: If the deferred write failed when the outermost block exited
+        """
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            saved = bool(self._bulk_depth) or self._write_deferred()
+        if not saved:
+            raise OSError(f"Could not write upload queue {self.queue_file}")
+    
+    def _write_deferred(self) -> bool:
+        """
+        Write what bulk() held back
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            if self._save_deferred:
+                return self._save_queue()
+            if self._journal:
+                return self._flush_journal()
+            return True
+        except Exception as e:
+            logger.error("Error saving queue: %s", e)
+            return False
+    
+    def _journal_size(self) -> int:
+        """Bytes in the journal, counting lines still in the write buffer"""
+        if self._journal:
+            return self._journal.tell()
+        try:
+            return self.journal_file.stat().st_size
+        except OSError:
+            return 0
+    
+    def _discard_entries(self, videos: List[Dict[str, Any]], journal_size: int):
+        """
+        Take back entries added by a failed batch, in memory and on disk
+        
+        Args:
+            videos: Entries the batch added
+            journal_size: Journal size before the batch started
+        """
+        for video in videos:
+            self._remove_entry(video)
+        
+        # Cut off whatever part of the batch reached the journal, so a
+        # replay doesn't bring the entries back
+        if self._journal:
+            try:
+                self._journal.close()
+            except OSError:
+                pass
+            self._journal = None
+        try:
+            if self.journal_file.is_file():
+                os.truncate(self.journal_file, journal_size)
+        except OSError as e:
+            logger.error("Error rolling back queue journal: %s", e)
+    
+    def _compact(self) -> bool:
+        """Fold the journal into the snapshot file"""
+        logger.debug("Compacting upload queue journal")
+        return self._save_queue()
+    
+    def close(self):
+        """Fold the journal into a fresh snapshot and close the journal file"""
+        self._save_queue()
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+    
     def add_to_queue(
         self,
         video_path: Path,
@@ -71,27 +376,78 @@ class VideoScheduler:
             True if added successfully, False otherwise
         """
         try:
-            video_info = {
-                'id': str(int(time.time() * 1000)),
-                'video_path': str(video_path),
-                'title': title,
-                'description': description,
-                'tags': tags,
-                'scheduled_time': scheduled_time or datetime.now(),
-                'status': 'pending',
-                'added_at': datetime.now()
-            }
-            
-            self.queue.append(video_info)
-            self._save_queue()
-            
-            logger.info(f"Added video to queue: {title}")
+            video_info = self._add_entry(str(video_path), title, description, tags, scheduled_time, datetime.now())
+            if not self._append_journal({'op': 'add', 'video': video_info}):
+                # Not on disk, so don't keep it in memory either
+                self._remove_entry(video_info)
+                return False
+            logger.info("Added video to queue: %s", title)
             return True
             
         except Exception as e:
-            logger.error(f"Error adding to queue: {e}")
+            logger.error("Error adding to queue: %s", e)
             return False
     
+    def _add_entry(
+        self,
+        video_path: str,
+        title: str,
+        description: str,
+        tags: List[str],
+        scheduled_time: Optional[datetime],
+        now: datetime
+    ) -> Dict[str, Any]:
+        """
+        Insert a queue entry (the caller journals it)
+        
+        Args:
+            video_path: Path to video file, already as the string stored in the queue
+            title: Video title
+            description: Video description
+            tags: List of tags
+            scheduled_time: When to upload (now if not provided)
+            now: Current time, read once by the caller for the whole operation
+            
+        Returns:
+            The new queue entry
+        """
+        # Millisecond ids can collide when a batch is added at once
+        video_id = int(now.timestamp() * 1000)
+        while str(video_id) in self._by_id:
+            video_id += 1
+        
+        scheduled_time = scheduled_time or now
+        video_info = {
+            'id': str(video_id),
+            'video_path': video_path,
+            'title': title,
+            'description': description,
+            'tags': tags,
+            'scheduled_time': scheduled_time,
+            'scheduled_ts': scheduled_time.timestamp(),
+            'status': 'pending',
+            'added_at': now
+        }
+        
+        self.queue.append(video_info)
+        self._by_id[video_info['id']] = video_info
+        self._status_counts['pending'] += 1
+        heapq.heappush(self._pending_heap, (video_info['scheduled_ts'], video_info['id']))
+        return video_info
+    
+    def _remove_entry(self, video: Dict[str, Any]):
+        """
+        Take back an entry added by _add_entry
+        
+        Its heap entry is left behind and discarded lazily.
+        
+        Args:
+            video: Queue entry
+        """
+        self.queue.remove(video)
+        del self._by_id[video['id']]
+        self._status_counts[video['status']] -= 1
+    
     def get_pending_uploads(self) -> List[Dict[str, Any]]:
         """
         Get videos that are ready to be uploaded
@@ -99,19 +455,22 @@ class VideoScheduler:
         Returns:
             List of video info dictionaries
         """
-        now = datetime.now()
-        pending = []
+        now_ts = time.time()
+        heap = self._pending_heap
+        ready = []
         
-        for video in self.queue:
-            if video['status'] == 'pending':
-                scheduled = video.get('scheduled_time')
-                if isinstance(scheduled, str):
-                    scheduled = datetime.fromisoformat(scheduled)
-                
-                if scheduled <= now:
-                    pending.append(video)
+        # Only entries due by now are touched; stale ones are discarded
+        while heap and heap[0][0] <= now_ts:
+            entry = heapq.heappop(heap)
+            video = self._by_id.get(entry[1])
+            if video is not None and video['status'] == 'pending':
+                ready.append(entry)
+        
+        # Due entries stay queued until they are marked uploaded or failed
+        for entry in ready:
+            heapq.heappush(heap, entry)
         
-        return pending
+        return [self._by_id[video_id] for _, video_id in ready]
     
     def mark_uploaded(self, video_id: str, youtube_id: str) -> bool:
         """
@@ -125,20 +484,31 @@ class VideoScheduler:
             True if successful, False otherwise
         """
         try:
-            for video in self.queue:
-                if video['id'] == video_id:
-                    video['status'] = 'uploaded'
-                    video['youtube_id'] = youtube_id
-                    video['uploaded_at'] = datetime.now()
-                    self._save_queue()
-                    logger.info(f"Marked video as uploaded: {video_id}")
+            video = self._by_id.get(video_id)
+            if video is not None:
+                if video['status'] == 'uploaded' and video.get('youtube_id') == youtube_id:
+                    # Retried call for an upload already recorded; nothing to write
                     return True
+                
+                uploaded_at = datetime.now()
+                fields = {
+                    'status': 'uploaded',
+                    'youtube_id': youtube_id,
+                    'uploaded_at': uploaded_at,
+                    'uploaded_ts': uploaded_at.timestamp()
+                }
+                self._set_status(video, fields['status'])
+                video.update(fields)
+                bisect.insort(self._uploaded_sorted, (fields['uploaded_ts'], video_id))
+                recorded = self._append_journal({'op': 'update', 'id': video_id, 'fields': fields})
+                logger.info("Marked video as uploaded: %s", video_id)
+                return recorded
             
-            logger.error(f"Video not found in queue: {video_id}")
+            logger.error("Video not found in queue: %s", video_id)
             return False
             
         except Exception as e:
-            logger.error(f"Error marking as uploaded: {e}")
+            logger.error("Error marking as uploaded: %s", e)
             return False
     
     def mark_failed(self, video_id: str, error: str) -> bool:
@@ -153,20 +523,27 @@ class VideoScheduler:
             True if successful, False otherwise
         """
         try:
-            for video in self.queue:
-                if video['id'] == video_id:
-                    video['status'] = 'failed'
-                    video['error'] = error
-                    video['failed_at'] = datetime.now()
-                    self._save_queue()
-                    logger.info(f"Marked video as failed: {video_id}")
+            video = self._by_id.get(video_id)
+            if video is not None:
+                if video['status'] == 'failed' and video.get('error') == error:
                     return True
+                
+                fields = {
+                    'status': 'failed',
+                    'error': error,
+                    'failed_at': datetime.now()
+                }
+                self._set_status(video, fields['status'])
+                video.update(fields)
+                recorded = self._append_journal({'op': 'update', 'id': video_id, 'fields': fields})
+                logger.info("Marked video as failed: %s", video_id)
+                return recorded
             
-            logger.error(f"Video not found in queue: {video_id}")
+            logger.error("Video not found in queue: %s", video_id)
             return False
             
         except Exception as e:
-            logger.error(f"Error marking as failed: {e}")
+            logger.error("Error marking as failed: %s", e)
             return False
     
     def schedule_batch(
@@ -177,6 +554,9 @@ class VideoScheduler:
         """
         Schedule multiple videos with intervals between them
         
+        All or nothing: if any video can't be recorded the whole batch is
+        taken back out of the queue.
+        
         Args:
             videos: List of video info dictionaries
             interval_hours: Hours between each upload
@@ -184,26 +564,55 @@ class VideoScheduler:
         Returns:
             True if successful, False otherwise
         """
+        added = []
+        journal_size = self._journal_size()
         try:
             current_time = datetime.now()
             
-            for i, video in enumerate(videos):
-                scheduled_time = current_time + timedelta(hours=i * interval_hours)
-                self.add_to_queue(
-                    Path(video['video_path']),
-                    video['title'],
-                    video['description'],
-                    video['tags'],
-                    scheduled_time
-                )
+            with self.bulk():
+                for i, video in enumerate(videos):
+                    scheduled_time = current_time + timedelta(hours=i * interval_hours)
+                    # Paths arrive as strings; str() only converts Path objects
+                    video_info = self._add_entry(
+                        str(video['video_path']),
+                        video['title'],
+                        video['description'],
+                        video['tags'],
+                        scheduled_time,
+                        current_time
+                    )
+                    added.append(video_info)
+                    if not self._append_journal({'op': 'add', 'video': video_info}):
+                        raise OSError(f"Could not journal {video_info['title']!r}")
             
-            logger.info(f"Scheduled {len(videos)} videos with {interval_hours}h intervals")
+            logger.info("Scheduled %s videos with %sh intervals", len(videos), interval_hours)
             return True
             
         except Exception as e:
-            logger.error(f"Error scheduling batch: {e}")
+            logger.error("Error scheduling batch: %s", e)
+            self._discard_entries(added, journal_size)
             return False
     
+    def generate_many(self, n: int, workers: Optional[int] = None) -> List[VideoInfo]:
+        """
+        Generate several videos concurrently
+        
+        Thin wrapper around ViralShortsGenerator.generate_videos, so there is
+        one batch implementation: the heavy work (FFmpeg encodes, TTS and
+        downloads) already runs outside the interpreter, and the batch bounds
+        how many videos are in progress at once.
+        
+        Args:
+            n: Number of videos to generate
+            workers: Videos in progress at once (BATCH_CONCURRENCY if not provided)
+            
+        Returns:
+            List of VideoInfo for successful videos
+        """
+        from ..main import ViralShortsGenerator
+        
+        return ViralShortsGenerator().generate_videos(n, concurrency=workers)
+    
     def get_queue_stats(self) -> Dict[str, int]:
         """
         Get statistics about the upload queue
@@ -211,19 +620,13 @@ class VideoScheduler:
         Returns:
             Dictionary with queue statistics
         """
-        stats = {
+        counts = self._status_counts
+        return {
             'total': len(self.queue),
-            'pending': 0,
-            'uploaded': 0,
-            'failed': 0
+            'pending': counts['pending'],
+            'uploaded': counts['uploaded'],
+            'failed': counts['failed']
         }
-        
-        for video in self.queue:
-            status = video.get('status', 'pending')
-            if status in stats:
-                stats[status] += 1
-        
-        return stats
     
     def clear_completed(self, older_than_days: int = 7) -> int:
         """
@@ -236,24 +639,35 @@ class VideoScheduler:
             Number of entries removed
         """
         try:
-            cutoff = datetime.now() - timedelta(days=older_than_days)
-            original_count = len(self.queue)
+            cutoff_ts = time.time() - older_than_days * 24 * 60 * 60
+            
+            # Everything before the cutoff is one prefix of the sorted index
+            k = bisect.bisect_left(self._uploaded_sorted, (cutoff_ts,))
+            expired = self._uploaded_sorted[:k]
+            del self._uploaded_sorted[:k]
             
-            self.queue = [
-                video for video in self.queue
-                if not (
+            removed_ids = set()
+            for uploaded_ts, video_id in expired:
+                video = self._by_id.get(video_id)
+                # Skip stale index entries (re-marked or already removed)
+                if (
+                    video is not None and
                     video['status'] == 'uploaded' and
-                    datetime.fromisoformat(str(video.get('uploaded_at', datetime.now()))) < cutoff
-                )
-            ]
+                    video.get('uploaded_ts', uploaded_ts) == uploaded_ts
+                ):
+                    removed_ids.add(video_id)
+                    del self._by_id[video_id]
             
-            removed = original_count - len(self.queue)
+            removed = len(removed_ids)
             if removed > 0:
+                self.queue = [video for video in self.queue if video['id'] not in removed_ids]
+                self._status_counts['uploaded'] -= removed
+                self._dirty = True
                 self._save_queue()
-                logger.info(f"Cleared {removed} completed uploads")
+                logger.info("Cleared %s completed uploads", removed)
             
             return removed
             
         except Exception as e:
-            logger.error(f"Error clearing completed: {e}")
+            logger.error("Error clearing completed: %s", e)
             return 0
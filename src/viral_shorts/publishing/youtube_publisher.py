@@ -3,8 +3,9 @@ YouTube publisher module
 Handles video uploads to YouTube using the YouTube Data API v3
 """
 
-import pickle
 import os
+import time
+import random
 from pathlib import Path
 from typing import Optional, Dict, Any
 from google.auth.transport.requests import Request
@@ -21,12 +22,24 @@ from ..config import (
     YOUTUBE_PRIVACY_STATUS
 )
 from ..utils.logger import setup_logger
+from ..utils.serialization import json_loads, JSONDecodeError
+from ..utils.storage import atomic_write_bytes
 
 logger = setup_logger(__name__)
 
 # YouTube API scopes
 SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
 
+# Files below this size are sent in one request (chunksize=-1)
+SINGLE_REQUEST_MAX_SIZE = 32 * 1024 * 1024
+
+# Chunk size for larger resumable uploads (must be a multiple of 256 KiB)
+UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Resumable upload retries for server errors, per Google's upload guide
+MAX_UPLOAD_RETRIES = 5
+RETRIABLE_STATUS_CODES = (500, 502, 503, 504)
+
 
 class YouTubePublisher:
     """Publishes videos to YouTube using the Data API v3"""
@@ -55,11 +68,21 @@ class YouTubePublisher:
         Returns:
             True if authentication successful, False otherwise
         """
+        # Already authenticated and the token hasn't expired
+        if self.youtube is not None and self.credentials and self.credentials.valid:
+            return True
+        
         try:
-            # Check if we have valid credentials
-            if os.path.exists(self.token_file):
+            # Only read the token file once; later calls refresh in memory
+            if self.credentials is None and os.path.exists(self.token_file):
                 with open(self.token_file, 'rb') as token:
-                    self.credentials = pickle.load(token)
+                    data = token.read()
+                try:
+                    self.credentials = Credentials.from_authorized_user_info(json_loads(data), SCOPES)
+                except (JSONDecodeError, UnicodeDecodeError, ValueError):
+                    # Tokens saved by older versions were pickled; sign in again
+                    logger.warning("Stored OAuth token is not valid JSON, re-authenticating...")
+                    self.credentials = None
             
             # Refresh or get new credentials
             if not self.credentials or not self.credentials.valid:
@@ -69,12 +92,13 @@ class YouTubePublisher:
                 else:
                     if not os.path.exists(self.client_secrets_file):
                         logger.error(
-                            f"Client secrets file not found: {self.client_secrets_file}\n"
+                            "Client secrets file not found: %s\n"
                             "Please download it from Google Cloud Console:\n"
                             "1. Go to https://console.cloud.google.com/\n"
                             "2. Enable YouTube Data API v3\n"
                             "3. Create OAuth 2.0 credentials\n"
-                            "4. Download and save as 'client_secrets.json'"
+                            "4. Download and save as 'client_secrets.json'",
+                            self.client_secrets_file
                         )
                         return False
                     
@@ -85,17 +109,21 @@ class YouTubePublisher:
                     )
                     self.credentials = flow.run_local_server(port=0)
                 
-                # Save credentials for next time
-                with open(self.token_file, 'wb') as token:
-                    pickle.dump(self.credentials, token)
+                # Save credentials for next time, readable by this user only
+                atomic_write_bytes(
+                    Path(self.token_file),
+                    self.credentials.to_json().encode('utf-8'),
+                    mode=0o600
+                )
             
-            # Build YouTube service
-            self.youtube = build('youtube', 'v3', credentials=self.credentials)
+            # Build YouTube service (an existing one shares the refreshed credentials object)
+            if self.youtube is None:
+                self.youtube = build('youtube', 'v3', credentials=self.credentials)
             logger.info("Successfully authenticated with YouTube API")
             return True
             
         except Exception as e:
-            logger.error(f"Authentication failed: {e}")
+            logger.error("Authentication failed: %s", e)
             return False
     
     def upload_video(
@@ -128,7 +156,7 @@ class YouTubePublisher:
                     return None
             
             if not video_path.exists():
-                logger.error(f"Video file not found: {video_path}")
+                logger.error("Video file not found: %s", video_path)
                 return None
             
             # Set defaults
@@ -150,16 +178,18 @@ class YouTubePublisher:
                 }
             }
             
-            # Create media upload
+            # Create media upload; shorts usually fit in a single request, so
+            # only large files pay a round-trip per chunk
+            file_size = video_path.stat().st_size
             media = MediaFileUpload(
                 str(video_path),
                 mimetype='video/*',
                 resumable=True,
-                chunksize=1024*1024  # 1MB chunks
+                chunksize=-1 if file_size < SINGLE_REQUEST_MAX_SIZE else UPLOAD_CHUNK_SIZE
             )
             
-            logger.info(f"Uploading video: {title}")
-            logger.info(f"Privacy status: {privacy_status}")
+            logger.info("Uploading video: %s", title)
+            logger.info("Privacy status: %s", privacy_status)
             
             # Execute upload
             request = self.youtube.videos().insert(
@@ -169,28 +199,47 @@ class YouTubePublisher:
             )
             
             response = None
+            retry = 0
+            last_logged = 0
             while response is None:
-                status, response = request.next_chunk()
+                try:
+                    status, response = request.next_chunk()
+                except HttpError as e:
+                    if e.resp.status not in RETRIABLE_STATUS_CODES or retry >= MAX_UPLOAD_RETRIES:
+                        raise
+                    retry += 1
+                    wait_time = random.random() * 2 ** retry
+                    logger.warning(
+                        "Upload chunk failed with HTTP %s, retrying in %.1f seconds (%s/%s)...",
+                        e.resp.status, wait_time, retry, MAX_UPLOAD_RETRIES
+                    )
+                    time.sleep(wait_time)
+                    continue
+                
+                retry = 0
                 if status:
+                    # Log each 10% step once
                     progress = int(status.progress() * 100)
-                    logger.info(f"Upload progress: {progress}%")
+                    if progress // 10 > last_logged:
+                        last_logged = progress // 10
+                        logger.info("Upload progress: %s%%", progress)
             
             video_id = response.get('id')
             if video_id:
                 video_url = f"https://www.youtube.com/watch?v={video_id}"
-                logger.info(f"Video uploaded successfully!")
-                logger.info(f"Video ID: {video_id}")
-                logger.info(f"Video URL: {video_url}")
+                logger.info("Video uploaded successfully!")
+                logger.info("Video ID: %s", video_id)
+                logger.info("Video URL: %s", video_url)
                 return video_id
             else:
                 logger.error("Upload succeeded but no video ID returned")
                 return None
                 
         except HttpError as e:
-            logger.error(f"YouTube API error: {e}")
+            logger.error("YouTube API error: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Error uploading video: {e}")
+            logger.error("Error uploading video: %s", e)
             return None
     
     def update_video_metadata(
@@ -224,7 +273,7 @@ class YouTubePublisher:
             ).execute()
             
             if not response.get('items'):
-                logger.error(f"Video not found: {video_id}")
+                logger.error("Video not found: %s", video_id)
                 return False
             
             snippet = response['items'][0]['snippet']
@@ -246,11 +295,11 @@ class YouTubePublisher:
                 }
             ).execute()
             
-            logger.info(f"Video metadata updated: {video_id}")
+            logger.info("Video metadata updated: %s", video_id)
             return True
             
         except Exception as e:
-            logger.error(f"Error updating video metadata: {e}")
+            logger.error("Error updating video metadata: %s", e)
             return False
     
     def test_connection(self) -> bool:
@@ -272,12 +321,12 @@ class YouTubePublisher:
             
             if response.get('items'):
                 channel_name = response['items'][0]['snippet']['title']
-                logger.info(f"Connected to channel: {channel_name}")
+                logger.info("Connected to channel: %s", channel_name)
                 return True
             else:
                 logger.error("No channel found")
                 return False
                 
         except Exception as e:
-            logger.error(f"Connection test failed: {e}")
+            logger.error("Connection test failed: %s", e)
             return False
@@ -1,6 +1,19 @@
 """Scripting module for generating video scripts using LLMs"""
 
-from .script_generator import ScriptGenerator
-from .prompts import PromptTemplates
+import importlib
 
 __all__ = ['ScriptGenerator', 'PromptTemplates']
+
+# Submodules are imported on first attribute access (PEP 562) so that
+# prompt templates can be used without the HTTP client
+_LAZY_ATTRS = {
+    'ScriptGenerator': '.script_generator',
+    'PromptTemplates': '.prompts',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,11 +2,10 @@
 Prompt templates for LLM-based script generation
 """
 
+import functools
+from typing import Iterable
 
-class PromptTemplates:
-    """Collection of prompt templates for different content types"""
-    
-    SCRIPT_GENERATION = """You are a viral YouTube Shorts scriptwriter. Create an ENGAGING, ENTHUSIASTIC script from this fact.
+SCRIPT_GENERATION = """You are a viral YouTube Shorts scriptwriter. Create an ENGAGING, ENTHUSIASTIC script from this fact.
 
 FACT: {fact}
 
@@ -36,7 +35,7 @@ Return ONLY valid JSON with no other text:
     "keywords": ["keyword1", "keyword2", "keyword3"]
 }}"""
 
-    TITLE_OPTIMIZATION = """Optimize this YouTube Shorts title for maximum engagement and clicks:
+TITLE_OPTIMIZATION = """Optimize this YouTube Shorts title for maximum engagement and clicks:
 
 Original Title: {title}
 
@@ -52,7 +51,7 @@ Return as JSON:
     "titles": ["title1", "title2", "title3"]
 }}"""
 
-    HASHTAG_GENERATION = """Generate trending YouTube hashtags for this video topic:
+HASHTAG_GENERATION = """Generate trending YouTube hashtags for this video topic:
 
 Topic: {topic}
 Keywords: {keywords}
@@ -68,7 +67,7 @@ Return as JSON:
     "hashtags": ["hashtag1", "hashtag2", ...]
 }}"""
 
-    DESCRIPTION_TEMPLATE = """Create an engaging YouTube video description:
+DESCRIPTION_TEMPLATE = """Create an engaging YouTube video description:
 
 Title: {title}
 Script: {script}
@@ -81,29 +80,76 @@ Generate a description that:
 
 Return as plain text."""
 
-    @staticmethod
-    def format_script_prompt(fact: str) -> str:
-        """Format the main script generation prompt"""
-        return PromptTemplates.SCRIPT_GENERATION.format(fact=fact)
+
+def _split_template(template: str, *fields: str) -> tuple:
+    """
+    Split a str.format template into the literal text around its fields
+    
+    Done once at import, so formatting is plain concatenation and the
+    escaped JSON braces are only unescaped once.
+    
+    Args:
+        template: Template using {field} placeholders
+        fields: Field names, in the order they appear in the template
+        
+    Returns:
+        Tuple of len(fields) + 1 literal segments
+    """
+    return tuple(template.format(**{field: '\0' for field in fields}).split('\0'))
+
+
+_SCRIPT_PARTS = _split_template(SCRIPT_GENERATION, 'fact')
+_TITLE_PARTS = _split_template(TITLE_OPTIMIZATION, 'title')
+_HASHTAG_PARTS = _split_template(HASHTAG_GENERATION, 'topic', 'keywords')
+_DESCRIPTION_PARTS = _split_template(DESCRIPTION_TEMPLATE, 'title', 'script')
+
+
+@functools.lru_cache(maxsize=256)
+def format_script_prompt(fact: str) -> str:
+    """Format the main script generation prompt"""
+    head, tail = _SCRIPT_PARTS
+    return head + fact + tail
+
+
+@functools.lru_cache(maxsize=256)
+def format_title_prompt(title: str) -> str:
+    """Format the title optimization prompt"""
+    head, tail = _TITLE_PARTS
+    return head + title + tail
+
+
+def format_hashtag_prompt(topic: str, keywords: Iterable[str]) -> str:
+    """Format the hashtag generation prompt"""
+    return _format_hashtag_prompt_cached(topic, tuple(keywords))
+
+
+@functools.lru_cache(maxsize=256)
+def _format_hashtag_prompt_cached(topic: str, keywords: tuple) -> str:
+    """Cached core of format_hashtag_prompt; keywords must be hashable"""
+    head, middle, tail = _HASHTAG_PARTS
+    return head + topic + middle + ", ".join(keywords) + tail
+
+
+@functools.lru_cache(maxsize=256)
+def format_description_prompt(title: str, script: str) -> str:
+    """Format the description generation prompt"""
+    head, middle, tail = _DESCRIPTION_PARTS
+    return head + title + middle + script + tail
+
+
+class PromptTemplates:
+    """Collection of prompt templates for different content types
     
-    @staticmethod
-    def format_title_prompt(title: str) -> str:
-        """Format the title optimization prompt"""
-        return PromptTemplates.TITLE_OPTIMIZATION.format(title=title)
+    Kept as a namespace over the module-level templates and memoized
+    formatters for existing callers.
+    """
     
-    @staticmethod
-    def format_hashtag_prompt(topic: str, keywords: list) -> str:
-        """Format the hashtag generation prompt"""
-        keywords_str = ", ".join(keywords)
-        return PromptTemplates.HASHTAG_GENERATION.format(
-            topic=topic,
-            keywords=keywords_str
-        )
+    SCRIPT_GENERATION = SCRIPT_GENERATION
+    TITLE_OPTIMIZATION = TITLE_OPTIMIZATION
+    HASHTAG_GENERATION = HASHTAG_GENERATION
+    DESCRIPTION_TEMPLATE = DESCRIPTION_TEMPLATE
     
-    @staticmethod
-    def format_description_prompt(title: str, script: str) -> str:
-        """Format the description generation prompt"""
-        return PromptTemplates.DESCRIPTION_TEMPLATE.format(
-            title=title,
-            script=script
-        )
+    format_script_prompt = staticmethod(format_script_prompt)
+    format_title_prompt = staticmethod(format_title_prompt)
+    format_hashtag_prompt = staticmethod(format_hashtag_prompt)
+    format_description_prompt = staticmethod(format_description_prompt)
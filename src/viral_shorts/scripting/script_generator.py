@@ -3,9 +3,12 @@ Script generator module
 Uses OpenRouter API to generate video scripts from facts
 """
 
+import re
 import json
+import threading
 import requests
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from ..config import (
     OPENROUTER_API_KEY,
     OPENROUTER_API_URL,
@@ -13,71 +16,146 @@ from ..config import (
     OPENROUTER_MAX_TOKENS,
     OPENROUTER_TEMPERATURE
 )
+from ..http import SESSION
 from ..utils.logger import setup_logger
+from ..utils.serialization import json_dumps, json_loads
 from .prompts import PromptTemplates
 
 logger = setup_logger(__name__)
 
+# Maximum OpenRouter requests in flight per process (free-tier models are
+# rate limited, so concurrent pipelines share this budget)
+LLM_CONCURRENCY = 4
+_llm_slots = threading.BoundedSemaphore(LLM_CONCURRENCY)
+
+# Body of a markdown code fence, with or without a json language tag
+_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)```', re.S)
+_DECODER = json.JSONDecoder()
+
+# Stands in for the prompt while the request envelope is serialized
+_PROMPT_MARKER = '__viral_shorts_prompt__'
+
+
+def _extract_json(text: str) -> Any:
+    """
+    Decode the JSON object in an LLM response
+    
+    Models often wrap the object in a markdown fence or add prose around it,
+    so this decodes from the first brace (inside the fence if there is one)
+    and ignores anything after the object.
+    
+    Args:
+        text: Raw response text
+        
+    Returns:
+        Decoded JSON object
+    """
+    match = _FENCE_RE.search(text)
+    if match:
+        text = match.group(1)
+    
+    start = text.find('{')
+    if start < 0:
+        raise json.JSONDecodeError("No JSON object in response", text, 0)
+    return _DECODER.raw_decode(text, start)[0]
+
 
 class ScriptGenerator:
     """Generates video scripts using OpenRouter LLM API"""
     
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        session: Optional[requests.Session] = None
+    ):
         """
         Initialize the ScriptGenerator
         
         Args:
             api_key: OpenRouter API key (uses config if not provided)
             model: Model to use (uses config if not provided)
+            session: HTTP session to use (defaults to the shared pooled session)
         """
         self.api_key = api_key or OPENROUTER_API_KEY
         self.model = model or OPENROUTER_MODEL
         self.base_url = OPENROUTER_API_URL
+        self.session = session or SESSION
         
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY is required. Set it in your .env file.")
+        
+        # Built once and passed per request, so the shared session carries no credentials
+        self._headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json',
+            'HTTP-Referer': 'https://github.com/viral-shorts-generator',
+            'X-Title': 'Viral Shorts Generator'
+        }
+        # Serialized request body around the prompt, per max_tokens value
+        self._payload_parts: Dict[int, Tuple[bytes, bytes]] = {}
     
-    def _call_llm(self, prompt: str, max_tokens: int = OPENROUTER_MAX_TOKENS) -> Optional[str]:
+    def _encode_payload(self, prompt: str, max_tokens: int) -> bytes:
         """
-        Call the OpenRouter API
+        Build the JSON request body for a prompt
+        
+        Everything except the prompt is the same for every call with the same
+        max_tokens, so that envelope is serialized once and only the escaped
+        prompt is spliced in per request.
         
         Args:
             prompt: The prompt to send
             max_tokens: Maximum tokens in response
             
         Returns:
-            The response text or None if failed
+            UTF-8 encoded JSON body
         """
-        try:
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json',
-                'HTTP-Referer': 'https://github.com/viral-shorts-generator',
-                'X-Title': 'Viral Shorts Generator'
-            }
-            
-            payload = {
+        parts = self._payload_parts.get(max_tokens)
+        if parts is None:
+            envelope = json_dumps({
                 'model': self.model,
                 'messages': [
                     {
                         'role': 'user',
-                        'content': prompt
+                        'content': _PROMPT_MARKER
                     }
                 ],
                 'max_tokens': max_tokens,
                 'temperature': OPENROUTER_TEMPERATURE
-            }
+            })
+            prefix, suffix = envelope.split(f'"{_PROMPT_MARKER}"'.encode('utf-8'))
+            parts = self._payload_parts[max_tokens] = (prefix, suffix)
+        
+        # json_dumps of a str is the quoted, escaped JSON string
+        return parts[0] + json_dumps(prompt) + parts[1]
+    
+    def _call_llm(self, prompt: str, max_tokens: int = OPENROUTER_MAX_TOKENS) -> Optional[str]:
+        """
+        Call the OpenRouter API
+        
+        Args:
+            prompt: The prompt to send
+            max_tokens: Maximum tokens in response
+            
+        Returns:
+            The response text or None if failed
+        """
+        try:
+            body = self._encode_payload(prompt, max_tokens)
             
-            logger.info(f"Calling OpenRouter API with model: {self.model}")
-            response = requests.post(
-                self.base_url,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+            logger.info("Calling OpenRouter API with model: %s", self.model)
+            with _llm_slots:
+                response = self.session.post(
+                    self.base_url,
+                    headers=self._headers,
+                    # Pre-encoded (orjson when installed) instead of requests' stdlib encoder
+                    data=body,
+                    timeout=30
+                )
             
             response.raise_for_status()
-            data = response.json()
+            # Straight from the raw bytes, skipping requests' charset detection and decode
+            data = json_loads(response.content)
             
             if 'choices' in data and len(data['choices']) > 0:
                 content = data['choices'][0]['message']['content']
@@ -88,10 +166,10 @@ class ScriptGenerator:
                 return None
                 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error calling OpenRouter API: {e}")
+            logger.error("Error calling OpenRouter API: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             return None
     
     def generate_script(self, fact: str) -> Optional[Dict[str, Any]]:
@@ -114,13 +192,7 @@ class ScriptGenerator:
             
             # Try to parse JSON response
             try:
-                # Extract JSON from response (in case it's wrapped in markdown)
-                if '```json' in response:
-                    response = response.split('```json')[1].split('```')[0].strip()
-                elif '```' in response:
-                    response = response.split('```')[1].split('```')[0].strip()
-                
-                script_data = json.loads(response)
+                script_data = _extract_json(response)
                 
                 # Validate required fields
                 required_fields = ['hook', 'script', 'title', 'description']
@@ -128,12 +200,12 @@ class ScriptGenerator:
                     logger.error("Script data missing required fields")
                     return None
                 
-                logger.info(f"Generated script with title: {script_data['title']}")
+                logger.info("Generated script with title: %s", script_data['title'])
                 return script_data
                 
             except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response: {e}")
-                logger.debug(f"Response was: {response}")
+                logger.error("Failed to parse JSON response: %s", e)
+                logger.debug("Response was: %s", response)
                 
                 # Fallback: create basic structure
                 return {
@@ -146,7 +218,7 @@ class ScriptGenerator:
                 }
                 
         except Exception as e:
-            logger.error(f"Error generating script: {e}")
+            logger.error("Error generating script: %s", e)
             return None
     
     def optimize_title(self, title: str) -> Optional[list]:
@@ -166,15 +238,11 @@ class ScriptGenerator:
             if not response:
                 return None
             
-            # Parse JSON response
-            if '```json' in response:
-                response = response.split('```json')[1].split('```')[0].strip()
-            
-            data = json.loads(response)
+            data = _extract_json(response)
             return data.get('titles', [])
             
         except Exception as e:
-            logger.error(f"Error optimizing title: {e}")
+            logger.error("Error optimizing title: %s", e)
             return None
     
     def generate_hashtags(self, topic: str, keywords: list) -> Optional[list]:
@@ -195,17 +263,55 @@ class ScriptGenerator:
             if not response:
                 return None
             
-            # Parse JSON response
-            if '```json' in response:
-                response = response.split('```json')[1].split('```')[0].strip()
-            
-            data = json.loads(response)
+            data = _extract_json(response)
             return data.get('hashtags', [])
             
         except Exception as e:
-            logger.error(f"Error generating hashtags: {e}")
+            logger.error("Error generating hashtags: %s", e)
             return None
     
+    def generate_all(
+        self,
+        fact: str,
+        keywords: Optional[List[str]] = None,
+        title_seed: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Generate the script, hashtags and alternative titles concurrently
+        
+        The three requests don't depend on each other, so running them in
+        threads makes the stage take as long as the slowest call rather than
+        the sum of all three.
+        
+        Args:
+            fact: The fact to base the script on
+            keywords: Keywords for hashtag generation (skipped if not provided)
+            title_seed: Title to generate alternatives for (skipped if not provided)
+            
+        Returns:
+            Script dictionary (as from generate_script) with 'hashtags' replaced
+            by the generated ones and 'alternative_titles' added, or None if
+            the script failed
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            script_future = executor.submit(self.generate_script, fact)
+            hashtags_future = executor.submit(self.generate_hashtags, fact, keywords) if keywords else None
+            titles_future = executor.submit(self.optimize_title, title_seed) if title_seed else None
+            
+            script_data = script_future.result()
+            hashtags = hashtags_future.result() if hashtags_future else None
+            titles = titles_future.result() if titles_future else None
+        
+        if not script_data:
+            return None
+        
+        if hashtags:
+            script_data['hashtags'] = hashtags
+        if titles:
+            script_data['alternative_titles'] = titles
+        
+        return script_data
+    
     def test_connection(self) -> bool:
         """
         Test if the API connection is working
@@ -217,5 +323,5 @@ class ScriptGenerator:
             response = self._call_llm("Say 'Hello'", max_tokens=10)
             return response is not None
         except Exception as e:
-            logger.error(f"Connection test failed: {e}")
+            logger.error("Connection test failed: %s", e)
             return False
@@ -1,6 +1,6 @@
 """Utility functions and helpers"""
 
-from .logger import setup_logger
+from .logger import setup_logger, get_logger
 from .storage import StorageManager
 
-__all__ = ['setup_logger', 'StorageManager']
+__all__ = ['setup_logger', 'get_logger', 'StorageManager']
@@ -3,10 +3,15 @@ Logger utility module
 Sets up colored logging for the application
 """
 
+import atexit
+import functools
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 try:
     import colorlog
@@ -16,32 +21,75 @@ except ImportError:
 
 from ..config import LOG_LEVEL, LOG_FORMAT, LOG_FILE
 
+# Write buffer for the log file; flushed on warnings, on a timer and at shutdown
+FILE_BUFFER_SIZE = 64 * 1024
 
-def setup_logger(name: str, log_file: Optional[Path] = None, level: Optional[str] = None) -> logging.Logger:
+# Longest time (seconds) a buffered log line waits before reaching the file
+FILE_FLUSH_INTERVAL = 1.0
+
+_listeners_lock = threading.Lock()
+# One queue and background listener per log file (None for console only)
+_listeners: Dict[Optional[Path], Tuple[queue.SimpleQueue, logging.handlers.QueueListener]] = {}
+
+# Loggers already resolved by get_logger, keyed by name
+_LOGGER_CACHE: Dict[str, logging.Logger] = {}
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """FileHandler that buffers writes, flushing on warnings and every FILE_FLUSH_INTERVAL"""
+    
+    def __init__(self, *args, **kwargs):
+        """Open the file and start the periodic flush thread"""
+        super().__init__(*args, **kwargs)
+        self._closed = threading.Event()
+        threading.Thread(target=self._flush_periodically, daemon=True).start()
+    
+    def _open(self):
+        """Open the log file with a large write buffer"""
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=FILE_BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors
+        )
+    
+    def _flush_periodically(self):
+        """Keep the file close to live (e.g. for tail -f) while records trickle in"""
+        while not self._closed.wait(FILE_FLUSH_INTERVAL):
+            self.flush()
+    
+    def emit(self, record: logging.LogRecord):
+        """Write a record, flushing right away for WARNING and above"""
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def close(self):
+        """Stop the flush thread, then flush and close the file"""
+        self._closed.set()
+        super().close()
+
+
+def _create_handlers(log_file_path: Optional[Path]) -> list:
     """
-    Set up a logger with colored console output and file logging
+    Build the console and file handlers that do the actual output
     
     Args:
-        name: Logger name (usually __name__)
-        log_file: Path to log file (uses config default if not provided)
-        level: Log level (uses config default if not provided)
+        log_file_path: Path to log file (no file handler if None)
         
     Returns:
-        Configured logger instance
+        List of handlers
     """
-    logger = logging.getLogger(name)
-    
-    # Set level
-    log_level = getattr(logging, (level or LOG_LEVEL).upper(), logging.INFO)
-    logger.setLevel(log_level)
-    
-    # Avoid adding handlers multiple times
-    if logger.handlers:
-        return logger
-    
     # Console handler with colors
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(log_level)
     
     if HAS_COLORLOG:
         # Colored formatter
@@ -62,20 +110,78 @@ def setup_logger(name: str, log_file: Optional[Path] = None, level: Optional[str
         formatter = logging.Formatter(LOG_FORMAT, datefmt='%Y-%m-%d %H:%M:%S')
         console_handler.setFormatter(formatter)
     
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # File handler
-    log_file_path = log_file or LOG_FILE
     if log_file_path:
         try:
             log_file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
-            file_handler.setLevel(log_level)
+            file_handler = _BufferedFileHandler(log_file_path, encoding='utf-8')
             file_formatter = logging.Formatter(LOG_FORMAT, datefmt='%Y-%m-%d %H:%M:%S')
             file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
         except Exception as e:
-            logger.warning(f"Could not set up file logging: {e}")
+            print(f"Could not set up file logging: {e}", file=sys.stderr)
+    
+    return handlers
+
+
+def _get_log_queue(log_file_path: Optional[Path]) -> queue.SimpleQueue:
+    """
+    Return the queue feeding the background listener for a log file
+    
+    The listener (and its handlers) is created on first use and stopped at
+    exit, which drains any queued records.
+    
+    Args:
+        log_file_path: Path to log file (None for console only)
+        
+    Returns:
+        Queue to attach a QueueHandler to
+    """
+    with _listeners_lock:
+        entry = _listeners.get(log_file_path)
+        if entry is None:
+            log_queue = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(log_queue, *_create_handlers(log_file_path))
+            listener.start()
+            atexit.register(listener.stop)
+            entry = _listeners[log_file_path] = (log_queue, listener)
+        return entry[0]
+
+
+@functools.lru_cache(maxsize=None)
+def setup_logger(name: str, log_file: Optional[Path] = None, level: Optional[str] = None) -> logging.Logger:
+    """
+    Set up a logger with colored console output and file logging
+    
+    Results are cached per argument set, so repeated calls for the same
+    module return the already-configured logger without touching handlers.
+    The logger itself only enqueues records; formatting output and writing
+    to the console and file happen on a shared background thread.
+    
+    Args:
+        name: Logger name (usually __name__)
+        log_file: Path to log file (uses config default if not provided)
+        level: Log level (uses config default if not provided)
+        
+    Returns:
+        Configured logger instance
+    """
+    logger = logging.getLogger(name)
+    
+    # Set level
+    log_level = getattr(logging, (level or LOG_LEVEL).upper(), logging.INFO)
+    logger.setLevel(log_level)
+    
+    # Avoid adding handlers multiple times
+    if logger.handlers:
+        return logger
+    
+    queue_handler = logging.handlers.QueueHandler(_get_log_queue(log_file or LOG_FILE))
+    # The output handlers are shared, so this logger's level goes on its own handler
+    queue_handler.setLevel(log_level)
+    logger.addHandler(queue_handler)
     
     return logger
 
@@ -84,10 +190,21 @@ def get_logger(name: str) -> logging.Logger:
     """
     Get an existing logger or create a new one
     
+    The resolved logger is remembered, so later calls are a single dict
+    lookup instead of going through the logging manager's lock.
+    
     Args:
         name: Logger name
         
     Returns:
         Logger instance
     """
-    return logging.getLogger(name) if logging.getLogger(name).handlers else setup_logger(name)
+    logger = _LOGGER_CACHE.get(name)
+    if logger is not None:
+        return logger
+    
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger = setup_logger(name)
+    _LOGGER_CACHE[name] = logger
+    return logger
@@ -0,0 +1,53 @@
+"""
+Serialization utility module
+JSON helpers that use orjson when it is installed and fall back to stdlib json
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one name covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document
+    
+    Args:
+        data: Raw JSON bytes (e.g. response.content) or text
+        
+    Returns:
+        Decoded Python object
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON
+    
+    Args:
+        obj: Object to serialize (unknown types such as Path are converted with str)
+        indent: Pretty-print with 2-space indentation
+        
+    Returns:
+        JSON document as bytes
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        default=str,
+        ensure_ascii=False
+    ).encode('utf-8')
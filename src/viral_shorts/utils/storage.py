@@ -3,14 +3,131 @@ Storage manager module
 Handles file storage, cleanup, and organization
 """
 
+import errno
+import os
 import shutil
+import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
 from ..config import OUTPUT_DIR, TEMP_DIR, ASSETS_DIR
-from .logger import setup_logger
+from .logger import get_logger
 
-logger = setup_logger(__name__)
+logger = get_logger(__name__)
+
+VIDEO_EXTS = frozenset({'.mp4', '.avi', '.mov', '.mkv'})
+
+# Bytes requested per copy_file_range call
+COPY_CHUNK_SIZE = 1 << 30
+
+# Errors meaning the kernel or filesystem can't do an in-kernel copy
+_COPY_RANGE_UNSUPPORTED = frozenset({errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP})
+
+
+# Mode a plain open() would give a new file; read once here because
+# os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+DEFAULT_FILE_MODE = 0o666 & ~_UMASK
+
+
+def atomic_write_bytes(path: Path, data: bytes, mode: int = DEFAULT_FILE_MODE):
+    """
+    Write a file so readers never see it half-written
+    
+    The data goes to a temporary file in the same directory, is flushed to
+    disk and then renamed over the target, so a crash leaves either the old
+    or the complete new file.
+    
+    Args:
+        path: Destination file
+        data: File content as bytes
+        mode: Permission bits of the new file (mkstemp would leave it 0600)
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _copy_file_range(source: Path, destination: Path) -> bool:
+    """
+    Copy a file's bytes inside the kernel with os.copy_file_range
+    
+    Args:
+        source: Source file path
+        destination: Destination file path
+        
+    Returns:
+        True if copied, False if in-kernel copying isn't available here
+    """
+    if not hasattr(os, 'copy_file_range'):
+        return False
+    
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        in_fd, out_fd = src.fileno(), dst.fileno()
+        try:
+            while os.copy_file_range(in_fd, out_fd, COPY_CHUNK_SIZE):
+                pass
+        except OSError as e:
+            if e.errno in _COPY_RANGE_UNSUPPORTED:
+                return False
+            raise
+    return True
+
+
+def _iter_files(path: Path) -> Iterator[os.DirEntry]:
+    """
+    Yield every non-directory entry under a directory, recursively
+    
+    Uses an explicit stack of os.scandir calls so each entry's cached stat
+    result can be reused by the caller.
+    
+    Args:
+        path: Directory to walk
+        
+    Yields:
+        DirEntry for each file found
+    """
+    stack = [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        yield entry
+        except OSError as e:
+            logger.error("Error scanning directory: %s", e)
+
+
+def _walk_stats(path: Path) -> Tuple[int, int]:
+    """
+    Total the size and number of files under a directory in one pass
+    
+    Args:
+        path: Directory to walk
+        
+    Returns:
+        Tuple of (total bytes, file count)
+    """
+    total = 0
+    count = 0
+    for entry in _iter_files(path):
+        total += entry.stat(follow_symlinks=False).st_size
+        count += 1
+    return total, count
 
 
 class StorageManager:
@@ -42,7 +159,7 @@ class StorageManager:
         video_dir = self.output_dir / video_id
         video_dir.mkdir(parents=True, exist_ok=True)
         
-        logger.info(f"Created video directory: {video_dir}")
+        logger.info("Created video directory: %s", video_dir)
         return video_dir
     
     def save_file(self, content: bytes, filename: str, directory: Optional[Path] = None) -> Optional[Path]:
@@ -66,11 +183,11 @@ class StorageManager:
             with open(file_path, 'wb') as f:
                 f.write(content)
             
-            logger.info(f"Saved file: {file_path}")
+            logger.info("Saved file: %s", file_path)
             return file_path
             
         except Exception as e:
-            logger.error(f"Error saving file: {e}")
+            logger.error("Error saving file: %s", e)
             return None
     
     def copy_file(self, source: Path, destination: Path) -> bool:
@@ -86,11 +203,14 @@ class StorageManager:
         """
         try:
             destination.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(source, destination)
-            logger.info(f"Copied file from {source} to {destination}")
+            if _copy_file_range(source, destination):
+                shutil.copystat(source, destination)
+            else:
+                shutil.copy2(source, destination)
+            logger.info("Copied file from %s to %s", source, destination)
             return True
         except Exception as e:
-            logger.error(f"Error copying file: {e}")
+            logger.error("Error copying file: %s", e)
             return False
     
     def move_file(self, source: Path, destination: Path) -> bool:
@@ -106,11 +226,17 @@ class StorageManager:
         """
         try:
             destination.parent.mkdir(parents=True, exist_ok=True)
-            shutil.move(str(source), str(destination))
-            logger.info(f"Moved file from {source} to {destination}")
+            try:
+                # Same filesystem: a single rename
+                os.replace(source, destination)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(str(source), str(destination))
+            logger.info("Moved file from %s to %s", source, destination)
             return True
         except Exception as e:
-            logger.error(f"Error moving file: {e}")
+            logger.error("Error moving file: %s", e)
             return False
     
     def delete_file(self, file_path: Path) -> bool:
@@ -126,13 +252,13 @@ class StorageManager:
         try:
             if file_path.exists():
                 file_path.unlink()
-                logger.info(f"Deleted file: {file_path}")
+                logger.info("Deleted file: %s", file_path)
                 return True
             else:
-                logger.warning(f"File not found: {file_path}")
+                logger.warning("File not found: %s", file_path)
                 return False
         except Exception as e:
-            logger.error(f"Error deleting file: {e}")
+            logger.error("Error deleting file: %s", e)
             return False
     
     def clean_temp_directory(self, older_than_hours: int = 24) -> int:
@@ -147,20 +273,18 @@ class StorageManager:
         """
         try:
             deleted_count = 0
-            cutoff_time = datetime.now() - timedelta(hours=older_than_hours)
+            cutoff_ts = (datetime.now() - timedelta(hours=older_than_hours)).timestamp()
             
-            for file_path in self.temp_dir.glob('**/*'):
-                if file_path.is_file():
-                    file_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                    if file_time < cutoff_time:
-                        file_path.unlink()
-                        deleted_count += 1
+            for entry in _iter_files(self.temp_dir):
+                if entry.is_file(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff_ts:
+                    os.unlink(entry.path)
+                    deleted_count += 1
             
-            logger.info(f"Cleaned {deleted_count} temporary files")
+            logger.info("Cleaned %s temporary files", deleted_count)
             return deleted_count
             
         except Exception as e:
-            logger.error(f"Error cleaning temp directory: {e}")
+            logger.error("Error cleaning temp directory: %s", e)
             return 0
     
     def get_storage_stats(self) -> dict:
@@ -170,34 +294,17 @@ class StorageManager:
         Returns:
             Dictionary with storage information
         """
-        def get_dir_size(path: Path) -> int:
-            """Calculate total size of directory"""
-            total = 0
-            try:
-                for file_path in path.glob('**/*'):
-                    if file_path.is_file():
-                        total += file_path.stat().st_size
-            except Exception as e:
-                logger.error(f"Error calculating directory size: {e}")
-            return total
-        
-        return {
-            'output_dir': {
-                'path': str(self.output_dir),
-                'size_mb': round(get_dir_size(self.output_dir) / (1024 * 1024), 2),
-                'files': len(list(self.output_dir.glob('**/*')))
-            },
-            'temp_dir': {
-                'path': str(self.temp_dir),
-                'size_mb': round(get_dir_size(self.temp_dir) / (1024 * 1024), 2),
-                'files': len(list(self.temp_dir.glob('**/*')))
-            },
-            'assets_dir': {
-                'path': str(self.assets_dir),
-                'size_mb': round(get_dir_size(self.assets_dir) / (1024 * 1024), 2),
-                'files': len(list(self.assets_dir.glob('**/*')))
+        stats = {}
+        for name, path in (('output_dir', self.output_dir),
+                           ('temp_dir', self.temp_dir),
+                           ('assets_dir', self.assets_dir)):
+            size, count = _walk_stats(path)
+            stats[name] = {
+                'path': str(path),
+                'size_mb': round(size / (1024 * 1024), 2),
+                'files': count
             }
-        }
+        return stats
     
     def list_videos(self) -> List[Path]:
         """
@@ -206,10 +313,9 @@ class StorageManager:
         Returns:
             List of video file paths
         """
-        video_extensions = ['.mp4', '.avi', '.mov', '.mkv']
-        videos = []
-        
-        for ext in video_extensions:
-            videos.extend(self.output_dir.glob(f'**/*{ext}'))
-        
-        return sorted(videos, key=lambda x: x.stat().st_mtime, reverse=True)
+        videos = [
+            entry for entry in _iter_files(self.output_dir)
+            if os.path.splitext(entry.name)[1].lower() in VIDEO_EXTS
+        ]
+        videos.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        return [Path(entry.path) for entry in videos]
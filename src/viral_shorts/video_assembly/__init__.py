@@ -1,6 +1,21 @@
 """Video assembly module for creating the final video"""
 
-from .editor import VideoEditor
-from .assets import AssetManager
+import importlib
 
-__all__ = ['VideoEditor', 'AssetManager']
+__all__ = ['VideoEditor', 'AssetManager', 'SearchCache', 'DownloadCache']
+
+# Submodules are imported on first attribute access (PEP 562) so that
+# searching for assets doesn't pull in the subtitle/FFmpeg tooling
+_LAZY_ATTRS = {
+    'VideoEditor': '.editor',
+    'AssetManager': '.assets',
+    'SearchCache': '.cache',
+    'DownloadCache': '.cache',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
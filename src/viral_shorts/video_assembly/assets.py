@@ -3,8 +3,14 @@ Asset manager module
 Handles downloading and managing video and audio assets
 """
 
+import heapq
+import logging
+import os
 import requests
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from ..config import (
@@ -16,10 +22,43 @@ from ..config import (
     VIDEO_WIDTH,
     VIDEO_HEIGHT
 )
-from ..utils.logger import setup_logger
+from ..http import SESSION
+from ..utils.logger import get_logger
 from ..utils.storage import StorageManager
+from .cache import SearchCache, DownloadCache
 
-logger = setup_logger(__name__)
+logger = get_logger(__name__)
+
+# Number of concurrent byte-range requests used for one video download
+DOWNLOAD_CONNECTIONS = 4
+
+# Files smaller than this aren't worth splitting across connections
+MIN_PARALLEL_SIZE = 2 * 1024 * 1024
+
+# Read size for single-stream downloads
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Bytes between download progress log lines
+PROGRESS_LOG_INTERVAL = 5 * 1024 * 1024
+_MB_PER_BYTE = 1.0 / (1024 * 1024)
+
+AUDIO_EXTS = frozenset({'.mp3', '.wav', '.ogg', '.m4a'})
+
+# Pixabay renditions to use, most preferred first
+PIXABAY_QUALITY_ORDER = ('medium', 'large', 'small')
+
+# Content types accepted as a video download (anything else is an error page)
+VIDEO_CONTENT_TYPES = ('video/', 'application/octet-stream')
+
+
+def _is_portrait(video_file: Dict[str, Any]) -> bool:
+    """Whether a Pexels video file is taller than it is wide"""
+    return video_file.get('width', 0) < video_file.get('height', 0)
+
+
+def _portrait_width(video_file: Dict[str, Any]) -> tuple:
+    """Sort key ranking portrait Pexels files first, then by width"""
+    return (_is_portrait(video_file), video_file.get('width', 0))
 
 
 class AssetManager:
@@ -28,7 +67,10 @@ class AssetManager:
     def __init__(
         self,
         pexels_key: Optional[str] = None,
-        pixabay_key: Optional[str] = None
+        pixabay_key: Optional[str] = None,
+        search_cache: Optional[SearchCache] = None,
+        session: Optional[requests.Session] = None,
+        download_cache: Optional[DownloadCache] = None
     ):
         """
         Initialize the AssetManager
@@ -36,10 +78,19 @@ class AssetManager:
         Args:
             pexels_key: Pexels API key (uses config if not provided)
             pixabay_key: Pixabay API key (uses config if not provided)
+            search_cache: Optional cache of video search results
+            session: HTTP session to use (defaults to the shared pooled session)
+            download_cache: Optional cache of downloaded videos shared across runs
         """
         self.pexels_key = pexels_key or PEXELS_API_KEY
         self.pixabay_key = pixabay_key or PIXABAY_API_KEY
-        self.storage = StorageManager()
+        self.search_cache = search_cache
+        self.session = session or SESSION
+        self.download_cache = download_cache
+        
+        # Music directory listing, re-read only when the directory changes
+        self._music_files: List[Path] = []
+        self._music_mtime: Optional[float] = None
         
         if not self.pexels_key and not self.pixabay_key:
             logger.warning(
@@ -47,6 +98,11 @@ class AssetManager:
                 "PIXABAY_API_KEY in your .env file."
             )
     
+    @cached_property
+    def storage(self) -> StorageManager:
+        """Storage manager, created on first use"""
+        return StorageManager()
+    
     def search_pexels_videos(
         self,
         query: str,
@@ -82,8 +138,8 @@ class AssetManager:
                 'per_page': per_page
             }
             
-            logger.info(f"Searching Pexels for: {query}")
-            response = requests.get(
+            logger.info("Searching Pexels for: %s", query)
+            response = self.session.get(
                 PEXELS_API_URL,
                 headers=headers,
                 params=params,
@@ -94,11 +150,11 @@ class AssetManager:
             data = response.json()
             
             videos = data.get('videos', [])
-            logger.info(f"Found {len(videos)} videos on Pexels")
+            logger.info("Found %s videos on Pexels", len(videos))
             return videos
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error searching Pexels: {e}")
+            logger.error("Error searching Pexels: %s", e)
             return None
     
     def search_pixabay_videos(
@@ -130,8 +186,8 @@ class AssetManager:
                 'per_page': per_page
             }
             
-            logger.info(f"Searching Pixabay for: {query}")
-            response = requests.get(
+            logger.info("Searching Pixabay for: %s", query)
+            response = self.session.get(
                 PIXABAY_API_URL,
                 params=params,
                 timeout=10
@@ -141,11 +197,11 @@ class AssetManager:
             data = response.json()
             
             videos = data.get('hits', [])
-            logger.info(f"Found {len(videos)} videos on Pixabay")
+            logger.info("Found %s videos on Pixabay", len(videos))
             return videos
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error searching Pixabay: {e}")
+            logger.error("Error searching Pixabay: %s", e)
             return None
     
     def download_video(
@@ -167,59 +223,232 @@ class AssetManager:
         Returns:
             Path to downloaded video or None if failed
         """
-        import time
-        
         for attempt in range(max_retries):
             try:
-                logger.info(f"Downloading video from: {video_url} (attempt {attempt + 1}/{max_retries})")
+                logger.info("Downloading video from: %s (attempt %s/%s)", video_url, attempt + 1, max_retries)
                 
-                # Stream download with chunks to handle large files
-                response = requests.get(
+                # Stream download with chunks to handle large files; the
+                # context closes the connection on every exit path
+                with self.session.get(
                     video_url, 
                     stream=True, 
                     timeout=60,
                     headers={'User-Agent': 'Mozilla/5.0'}
-                )
-                response.raise_for_status()
-                
-                if not filename:
-                    filename = f"background.mp4"
-                
-                if not output_dir:
-                    output_dir = Path('.')
-                
-                file_path = output_dir / filename
-                
-                # Download in chunks with progress
-                total_size = int(response.headers.get('content-length', 0))
-                chunk_size = 8192
-                downloaded = 0
-                
-                with open(file_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        if chunk:
+                ) as response:
+                    response.raise_for_status()
+                    
+                    # Fail before touching the output file if this isn't a video
+                    content_type = response.headers.get('content-type', '')
+                    if content_type and not content_type.startswith(VIDEO_CONTENT_TYPES):
+                        raise requests.exceptions.RequestException(
+                            f"Unexpected content-type {content_type!r}"
+                        )
+                    if response.headers.get('content-length') == '0':
+                        raise requests.exceptions.RequestException("Empty response body")
+                    
+                    if not filename:
+                        filename = f"background.mp4"
+                    
+                    if not output_dir:
+                        output_dir = Path('.')
+                    
+                    file_path = output_dir / filename
+                    
+                    # Download in 1MB chunks
+                    total_size = int(response.headers.get('content-length', 0))
+                    downloaded = 0
+                    next_log = PROGRESS_LOG_INTERVAL
+                    # Checked once per download rather than formatting every 5MB
+                    log_progress = logger.isEnabledFor(logging.DEBUG)
+                    percent_per_byte = 100.0 / total_size if total_size > 0 else 0.0
+                    
+                    # iter_content turns a dropped connection into a
+                    # requests exception, so it is retried below
+                    with open(file_path, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                             f.write(chunk)
                             downloaded += len(chunk)
                             # Log progress every 5MB
-                            if downloaded % (5 * 1024 * 1024) < chunk_size:
-                                progress = (downloaded / total_size * 100) if total_size > 0 else 0
-                                logger.debug(f"Downloaded: {downloaded / (1024*1024):.1f}MB ({progress:.1f}%)")
+                            if log_progress and downloaded >= next_log:
+                                next_log += PROGRESS_LOG_INTERVAL
+                                logger.debug(
+                                    "Downloaded: %.1fMB (%.1f%%)",
+                                    downloaded * _MB_PER_BYTE, downloaded * percent_per_byte
+                                )
+                    
+                    # A short body means the connection dropped mid-transfer
+                    if total_size and 'content-encoding' not in response.headers and downloaded != total_size:
+                        raise IOError(f"Incomplete download: got {downloaded} of {total_size} bytes")
                 
-                logger.info(f"Video downloaded: {file_path}")
+                logger.info("Video downloaded: %s", file_path)
                 return file_path
                 
             except (requests.exceptions.RequestException, IOError) as e:
-                logger.warning(f"Download attempt {attempt + 1} failed: {e}")
+                logger.warning("Download attempt %s failed: %s", attempt + 1, e)
                 if attempt < max_retries - 1:
                     wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                    logger.info(f"Retrying in {wait_time} seconds...")
+                    logger.info("Retrying in %s seconds...", wait_time)
                     time.sleep(wait_time)
                 else:
-                    logger.error(f"Error downloading video after {max_retries} attempts: {e}")
+                    logger.error("Error downloading video after %s attempts: %s", max_retries, e)
                     return None
         
         return None
     
+    def download_video_parallel(
+        self,
+        video_url: str,
+        output_dir: Optional[Path] = None,
+        filename: Optional[str] = None,
+        connections: int = DOWNLOAD_CONNECTIONS
+    ) -> Optional[Path]:
+        """
+        Download a video over several connections using HTTP Range requests
+        
+        A single CDN connection often stays well below link bandwidth, so
+        the file is split into contiguous byte ranges that are fetched
+        concurrently and written straight to their offsets. Falls back to
+        download_video when the server doesn't support ranges, the file is
+        small, or any range fails.
+        
+        Args:
+            video_url: URL of the video to download
+            output_dir: Directory to save video
+            filename: Custom filename (defaults to background.mp4)
+            connections: Number of concurrent range requests
+            
+        Returns:
+            Path to downloaded video or None if failed
+        """
+        file_path = (output_dir or Path('.')) / (filename or 'background.mp4')
+        
+        try:
+            with self.session.head(
+                video_url,
+                allow_redirects=True,
+                timeout=10,
+                headers={'User-Agent': 'Mozilla/5.0'}
+            ) as response:
+                response.raise_for_status()
+                total_size = int(response.headers.get('content-length', 0))
+                accepts_ranges = response.headers.get('accept-ranges', '').lower() == 'bytes'
+                # Resolve CDN redirects once instead of once per range
+                final_url = response.url
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning("HEAD request failed (%s), using single-stream download", e)
+            return self.download_video(video_url, output_dir, filename)
+        
+        if not accepts_ranges or total_size < MIN_PARALLEL_SIZE or connections < 2:
+            return self.download_video(video_url, output_dir, filename)
+        
+        logger.info(
+            "Downloading video from: %s (%.1fMB over %s connections)",
+            video_url, total_size / (1024*1024), connections
+        )
+        
+        # Preallocate so every range can be written at its final offset
+        with open(file_path, 'wb') as f:
+            f.truncate(total_size)
+        
+        part_size = -(-total_size // connections)  # ceiling division
+        ranges = [
+            (start, min(start + part_size, total_size) - 1)
+            for start in range(0, total_size, part_size)
+        ]
+        
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            results = list(executor.map(
+                lambda bounds: self._download_range(final_url, file_path, *bounds),
+                ranges
+            ))
+        
+        if not all(results):
+            logger.warning("Parallel download incomplete, retrying as single stream")
+            return self.download_video(video_url, output_dir, filename)
+        
+        logger.info("Video downloaded: %s", file_path)
+        return file_path
+    
+    def download_video_cached(
+        self,
+        video_url: str,
+        output_dir: Optional[Path] = None,
+        filename: Optional[str] = None
+    ) -> Optional[Path]:
+        """
+        Download a video through the download cache
+        
+        The same stock clip is often picked for several facts, so a cache hit
+        is hard-linked into output_dir instead of downloaded again. Without a
+        download cache this is just download_video_parallel.
+        
+        Args:
+            video_url: URL of the video to download
+            output_dir: Directory to save video
+            filename: Custom filename (defaults to background.mp4)
+            
+        Returns:
+            Path to downloaded video or None if failed
+        """
+        if not self.download_cache:
+            return self.download_video_parallel(video_url, output_dir, filename)
+        
+        file_path = (output_dir or Path('.')) / (filename or 'background.mp4')
+        
+        cached_path = self.download_cache.get(video_url)
+        if cached_path:
+            logger.info("Using cached video: %s", cached_path.name)
+            return self.download_cache.link(cached_path, file_path)
+        
+        # Download beside the cache entry so storing it is a rename, and so
+        # a partial download never looks like a cache hit
+        part_path = self.download_cache.temp_path_for(video_url)
+        downloaded = self.download_video_parallel(video_url, part_path.parent, part_path.name)
+        if not downloaded:
+            part_path.unlink(missing_ok=True)
+            return None
+        
+        cached_path = self.download_cache.store(video_url, downloaded)
+        return self.download_cache.link(cached_path, file_path)
+    
+    def _download_range(self, url: str, file_path: Path, start: int, end: int) -> bool:
+        """
+        Fetch one byte range of a file and write it at its offset
+        
+        Args:
+            url: URL of the file
+            file_path: Preallocated destination file
+            start: First byte of the range
+            end: Last byte of the range (inclusive)
+            
+        Returns:
+            True if the whole range was written, False otherwise
+        """
+        try:
+            with self.session.get(
+                url,
+                stream=True,
+                timeout=60,
+                headers={'User-Agent': 'Mozilla/5.0', 'Range': f'bytes={start}-{end}'}
+            ) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    logger.warning("Server ignored range request (status %s)", response.status_code)
+                    return False
+                
+                written = 0
+                with open(file_path, 'r+b') as f:
+                    f.seek(start)
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
+                        written += len(chunk)
+            
+            return written == end - start + 1
+            
+        except (requests.exceptions.RequestException, IOError) as e:
+            logger.warning("Range %s-%s failed: %s", start, end, e)
+            return False
+    
     def find_best_video(
         self,
         keywords: List[str],
@@ -237,59 +466,138 @@ class AssetManager:
         Returns:
             Best video data dictionary or None if not found
         """
-        all_videos = []
+        candidates = self.find_video_candidates(keywords, n=1, source=source, min_duration=min_duration)
+        if not candidates:
+            return None
+        
+        selected = candidates[0]
+        logger.info(
+            "Selected %ss video from %s for keyword: %s",
+            selected['duration'], selected['source'], selected['keyword']
+        )
+        return selected
+    
+    def find_video_candidates(
+        self,
+        keywords: List[str],
+        n: int = 10,
+        source: str = 'both',
+        min_duration: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Find several matching videos from one round of searches
         
-        # Try each keyword
-        for keyword in keywords[:3]:  # Limit to first 3 keywords
-            if source in ['pexels', 'both'] and self.pexels_key:
-                pexels_videos = self.search_pexels_videos(keyword)
-                if pexels_videos:
-                    # Filter videos by duration
-                    filtered = [
-                        v for v in pexels_videos 
-                        if v.get('duration', 0) >= min_duration and v.get('video_files')
-                    ]
-                    all_videos.extend([
-                        {
-                            'source': 'pexels',
-                            'data': video,
-                            'keyword': keyword,
-                            'duration': video.get('duration', 0)
-                        }
-                        for video in filtered
-                    ])
+        Lets callers retry with the next candidate locally instead of
+        searching again after a failed download. The five longest videos come
+        first in random order (so repeated runs vary), followed by the rest.
+        
+        Args:
+            keywords: List of search keywords
+            n: Maximum number of candidates to return
+            source: Video source ('pexels', 'pixabay', or 'both')
+            min_duration: Minimum video duration in seconds
             
-            if source in ['pixabay', 'both'] and self.pixabay_key:
-                pixabay_videos = self.search_pixabay_videos(keyword)
-                if pixabay_videos:
-                    # Filter videos by duration
-                    filtered = [
-                        v for v in pixabay_videos 
-                        if v.get('duration', 0) >= min_duration and v.get('videos')
-                    ]
-                    all_videos.extend([
-                        {
-                            'source': 'pixabay',
-                            'data': video,
-                            'keyword': keyword,
-                            'duration': video.get('duration', 0)
-                        }
-                        for video in filtered
-                    ])
+        Returns:
+            List of video data dictionaries (empty if none found)
+        """
+        cache_key = None
+        all_videos = None
+        if self.search_cache is not None:
+            cache_key = SearchCache.make_key(keywords[:3], source, min_duration)
+            all_videos = self.search_cache.get(cache_key)
+            if all_videos:
+                logger.info("Using %s cached video candidates", len(all_videos))
+        
+        if all_videos is None:
+            all_videos = self._search_candidates(keywords, source, min_duration)
+            if all_videos and cache_key is not None:
+                self.search_cache.put(cache_key, all_videos)
         
         if not all_videos:
             logger.warning("No videos found with sufficient duration")
-            return None
+            return []
         
-        # Prefer videos with longer duration
-        all_videos.sort(key=lambda x: x.get('duration', 0), reverse=True)
+        # Prefer videos with longer duration; only the first max(n, 5) are
+        # ever returned, so select those instead of sorting everything
+        ranked = heapq.nlargest(max(n, 5), all_videos, key=lambda x: x.get('duration', 0))
         
-        # Select from top 5 videos randomly
-        top_videos = all_videos[:5]
-        selected = random.choice(top_videos)
-        logger.info(f"Selected {selected['duration']}s video from {selected['source']} for keyword: {selected['keyword']}")
+        # Pick randomly among the top 5 videos, keep the rest as fallbacks
+        top_videos = random.sample(ranked[:5], min(5, len(ranked)))
+        return (top_videos + ranked[5:])[:n]
+    
+    def _search_candidates(
+        self,
+        keywords: List[str],
+        source: str,
+        min_duration: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Query the video APIs for candidates matching the keywords
         
-        return selected
+        Args:
+            keywords: List of search keywords
+            source: Video source ('pexels', 'pixabay', or 'both')
+            min_duration: Minimum video duration in seconds
+            
+        Returns:
+            List of candidate dictionaries (unsorted)
+        """
+        searches = {}
+        if source in ['pexels', 'both'] and self.pexels_key:
+            searches['pexels'] = self.search_pexels_videos
+        if source in ['pixabay', 'both'] and self.pixabay_key:
+            searches['pixabay'] = self.search_pixabay_videos
+        
+        # Limit to first 3 keywords
+        tasks = [(name, keyword) for keyword in keywords[:3] for name in searches]
+        if not tasks:
+            return []
+        
+        # The searches are independent, so run them all at once; map keeps
+        # results in task order so ties sort the same way on every run
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            results = list(executor.map(
+                lambda task: searches[task[0]](task[1]), tasks
+            ))
+        
+        all_videos = []
+        for (name, keyword), videos in zip(tasks, results):
+            if videos:
+                all_videos.extend(self._to_candidates(name, keyword, videos, min_duration))
+        
+        return all_videos
+    
+    @staticmethod
+    def _to_candidates(
+        source: str,
+        keyword: str,
+        videos: List[Dict[str, Any]],
+        min_duration: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Wrap one search's results as candidates, dropping unusable videos
+        
+        Args:
+            source: Video source the results came from ('pexels' or 'pixabay')
+            keyword: Keyword that was searched
+            videos: Raw video dictionaries from the API
+            min_duration: Minimum video duration in seconds
+            
+        Returns:
+            List of candidate dictionaries
+        """
+        # Pexels lists downloads under 'video_files', Pixabay under 'videos'
+        files_key = 'video_files' if source == 'pexels' else 'videos'
+        return [
+            {
+                'source': source,
+                'data': video,
+                'keyword': keyword,
+                'duration': video.get('duration', 0)
+            }
+            for video in videos
+            if video.get('duration', 0) >= min_duration and video.get(files_key)
+        ]
     
     def get_video_url(self, video_data: Dict[str, Any]) -> Optional[str]:
         """
@@ -306,31 +614,25 @@ class AssetManager:
             data = video_data.get('data', {})
             
             if source == 'pexels':
-                # Find the best quality portrait video
-                video_files = data.get('video_files', [])
-                portrait_files = [
-                    f for f in video_files
-                    if f.get('width', 0) < f.get('height', 0)  # Portrait orientation
-                ]
-                
-                if portrait_files:
-                    # Sort by quality and get highest
-                    best_file = max(portrait_files, key=lambda x: x.get('width', 0))
+                # Find the best quality portrait video in one pass: portrait
+                # files rank above all others, then wider is better
+                best_file = max(data.get('video_files', []), key=_portrait_width, default=None)
+                if best_file is not None and _is_portrait(best_file):
                     return best_file.get('link')
             
             elif source == 'pixabay':
-                # Get medium quality video for faster downloads (still good quality)
+                # Prefer medium quality to avoid large file downloads (still good quality)
                 videos = data.get('videos', {})
-                # Prefer medium quality to avoid large file downloads
-                for quality in ['medium', 'large', 'small']:
-                    video_info = videos.get(quality)
-                    if video_info:
-                        return video_info.get('url')
+                video_info = next(
+                    (videos[q] for q in PIXABAY_QUALITY_ORDER if videos.get(q)), None
+                )
+                if video_info:
+                    return video_info.get('url')
             
             return None
             
         except Exception as e:
-            logger.error(f"Error extracting video URL: {e}")
+            logger.error("Error extracting video URL: %s", e)
             return None
     
     def get_background_music(self) -> Optional[Path]:
@@ -341,24 +643,41 @@ class AssetManager:
             Path to music file or None if not found
         """
         try:
-            # Find all audio files in music directory
-            audio_files = []
-            for ext in ['.mp3', '.wav', '.ogg', '.m4a']:
-                audio_files.extend(MUSIC_DIR.glob(f'*{ext}'))
+            # Re-scan only when files were added or removed since last time
+            mtime = MUSIC_DIR.stat().st_mtime if MUSIC_DIR.exists() else None
+            if mtime != self._music_mtime:
+                audio_files = []
+                if mtime is not None:
+                    with os.scandir(MUSIC_DIR) as it:
+                        audio_files = [
+                            Path(entry.path) for entry in it
+                            if os.path.splitext(entry.name)[1].lower() in AUDIO_EXTS
+                            and entry.is_file()
+                        ]
+                self._music_files = audio_files
+                self._music_mtime = mtime
+            audio_files = self._music_files
             
             if not audio_files:
-                logger.warning(f"No music files found in {MUSIC_DIR}")
+                logger.warning("No music files found in %s", MUSIC_DIR)
                 return None
             
             # Select random file
             music_file = random.choice(audio_files)
-            logger.info(f"Selected background music: {music_file.name}")
+            logger.info("Selected background music: %s", music_file.name)
             return music_file
             
         except Exception as e:
-            logger.error(f"Error getting background music: {e}")
+            logger.error("Error getting background music: %s", e)
             return None
     
+    def refresh_metadata(self):
+        """Forget cached search results and the music directory listing"""
+        if self.search_cache is not None:
+            self.search_cache.clear()
+        self._music_files = []
+        self._music_mtime = None
+    
     def test_apis(self) -> Dict[str, bool]:
         """
         Test if video APIs are accessible
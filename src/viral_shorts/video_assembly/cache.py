@@ -0,0 +1,270 @@
+"""
+Search cache module
+Remembers stock-video search results and downloads so repeated keywords
+skip the APIs and repeated clips skip the download
+"""
+
+import os
+import shutil
+import hashlib
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable
+from ..config import CACHE_DIR
+from ..utils.logger import setup_logger
+from ..utils.serialization import json_loads, json_dumps
+from ..utils.storage import DEFAULT_FILE_MODE
+
+logger = setup_logger(__name__)
+
+
+class SearchCache:
+    """SQLite-backed cache of video search candidates with a time-to-live"""
+    
+    # Stock libraries change slowly; a day keeps results fresh enough
+    DEFAULT_TTL = 24 * 60 * 60
+    
+    def __init__(self, db_path: Optional[Path] = None, ttl: int = DEFAULT_TTL):
+        """
+        Initialize the SearchCache
+        
+        Args:
+            db_path: Path to the SQLite database (defaults to CACHE_DIR/search_cache.db)
+            ttl: Seconds before a cached search is considered stale
+        """
+        self.db_path = db_path or (CACHE_DIR / 'search_cache.db')
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        
+        self._lock = threading.Lock()
+        # In-process layer in front of SQLite: (timestamp, candidates)
+        self._memory: Dict[str, tuple] = {}
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS search_cache ('
+            'key TEXT PRIMARY KEY, '
+            'json TEXT NOT NULL, '
+            'ts INTEGER NOT NULL)'
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(keywords: Iterable[str], *qualifiers: Any) -> str:
+        """
+        Build a cache key from search keywords and any other search options
+        
+        Args:
+            keywords: Search keywords (order doesn't matter)
+            qualifiers: Extra options that change the results (source, filters)
+            
+        Returns:
+            Hex digest identifying the search
+        """
+        parts = [','.join(sorted(keyword.lower() for keyword in keywords))]
+        parts.extend(str(qualifier) for qualifier in qualifiers)
+        return hashlib.blake2b('|'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached candidates for a search
+        
+        Args:
+            key: Key from make_key
+            
+        Returns:
+            List of candidate dictionaries or None on a miss / stale entry
+        """
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._conn.execute(
+                    'SELECT ts, json FROM search_cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                entry = (row[0], json_loads(row[1]))
+                self._memory[key] = entry
+            
+            if entry[0] < cutoff:
+                return None
+            return entry[1]
+    
+    def put(self, key: str, candidates: List[Dict[str, Any]]):
+        """
+        Store candidates for a search
+        
+        Args:
+            key: Key from make_key
+            candidates: List of candidate dictionaries
+        """
+        ts = int(time.time())
+        with self._lock:
+            self._memory[key] = (ts, candidates)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO search_cache (key, json, ts) VALUES (?, ?, ?)',
+                (key, json_dumps(candidates).decode('utf-8'), ts)
+            )
+            self._conn.commit()
+    
+    def clear(self):
+        """Drop every cached search"""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute('DELETE FROM search_cache')
+            self._conn.commit()
+        logger.info("Search cache cleared")
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class DownloadCache:
+    """Directory of downloaded files keyed by source URL, evicted least-recently-used"""
+    
+    # Room for a few dozen HD stock clips
+    DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+    
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the DownloadCache
+        
+        Args:
+            cache_dir: Directory holding cached files (defaults to CACHE_DIR/download_cache)
+            max_bytes: Total size the cache is trimmed back to after each store
+        """
+        self.cache_dir = cache_dir or (CACHE_DIR / 'download_cache')
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+    
+    def path_for(self, url: str, suffix: str = '.mp4') -> Path:
+        """
+        Get the cache location for a URL
+        
+        Args:
+            url: Source URL
+            suffix: File extension of the cached file
+            
+        Returns:
+            Path inside the cache directory (may not exist yet)
+        """
+        key = hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
+        return self.cache_dir / f"{key}{suffix}"
+    
+    def temp_path_for(self, url: str) -> Path:
+        """
+        Create a unique temporary file inside the cache directory for a download
+        
+        Each caller gets its own file, so concurrent downloads of the same
+        URL never write into each other's bytes.
+        
+        Args:
+            url: Source URL
+            
+        Returns:
+            Path to a new empty .part file (ignored by eviction)
+        """
+        prefix = self.path_for(url, '').name + '_'
+        fd, path = tempfile.mkstemp(dir=self.cache_dir, prefix=prefix, suffix='.part')
+        os.close(fd)
+        # Cached clips are linked into output directories; keep them readable
+        os.chmod(path, DEFAULT_FILE_MODE)
+        return Path(path)
+    
+    def get(self, url: str, suffix: str = '.mp4') -> Optional[Path]:
+        """
+        Look up a cached download
+        
+        Args:
+            url: Source URL
+            suffix: File extension of the cached file
+            
+        Returns:
+            Path to the cached file or None on a miss
+        """
+        path = self.path_for(url, suffix)
+        try:
+            # Bump mtime as the LRU clock (atime is unreliable under relatime/noatime)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+    
+    def store(self, url: str, file_path: Path, suffix: str = '.mp4') -> Path:
+        """
+        Move a completed download into the cache and trim the cache
+        
+        Args:
+            url: Source URL
+            file_path: Fully downloaded file (should be inside cache_dir so the move is a rename)
+            suffix: File extension of the cached file
+            
+        Returns:
+            Path to the cached file
+        """
+        path = self.path_for(url, suffix)
+        os.replace(file_path, path)
+        self.evict()
+        return path
+    
+    @staticmethod
+    def link(cached_path: Path, dest: Path) -> Path:
+        """
+        Place a cached file at dest without copying its bytes where possible
+        
+        Hard-links the file; falls back to a copy when the destination is
+        on another filesystem or links aren't supported.
+        
+        Args:
+            cached_path: File inside the cache
+            dest: Destination path
+            
+        Returns:
+            The destination path
+        """
+        dest.unlink(missing_ok=True)
+        try:
+            os.link(cached_path, dest)
+        except OSError:
+            shutil.copyfile(cached_path, dest)
+        return dest
+    
+    def evict(self):
+        """Delete least-recently-used files until the cache fits in max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.endswith('.part'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+            
+            if total <= self.max_bytes:
+                return
+            
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError as e:
+                    logger.warning("Could not evict %s: %s", path, e)
+    
+    def clear(self):
+        """Delete every cached file"""
+        with self._lock:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file():
+                        os.remove(entry.path)
+        logger.info("Download cache cleared")
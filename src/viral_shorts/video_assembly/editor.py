@@ -3,10 +3,19 @@ Video editor module
 Handles FFmpeg-based video assembly, audio mixing, and subtitle generation
 """
 
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
 import subprocess
-import pysubs2
+import threading
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import cached_property
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, Callable, List, Dict, Any, Tuple, Union
 from ..config import (
     VIDEO_WIDTH,
     VIDEO_HEIGHT,
@@ -26,14 +35,461 @@ from ..config import (
     SUBTITLE_SHADOW,
     SUBTITLE_POSITION,
     SUBTITLE_MARGIN_V,
+    BATCH_CONCURRENCY,
     FFMPEG_COMMAND,
     FFMPEG_LOGLEVEL,
+    FFMPEG_MEMORY_LIMIT_MB,
     TEMP_DIR
 )
+from ..narration.timestamps import WordTimestamps
 from ..utils.logger import setup_logger
+from ..utils.storage import StorageManager, atomic_write_bytes
+
+try:
+    import av
+    HAS_AV = True
+except ImportError:
+    HAS_AV = False
+
+try:
+    import resource  # POSIX only
+except ImportError:
+    resource = None
 
 logger = setup_logger(__name__)
 
+# libx264 tuning: a shorter lookahead keeps every encoder thread busy
+X264_PARAMS = 'rc-lookahead=20'
+
+# NVENC settings used instead of libx264 when the encoder is available
+NVENC_ARGS = ['-c:v', 'h264_nvenc', '-preset', 'p4', '-rc', 'vbr']
+
+# Suffix marking a background preloaded as raw portrait-sized NV12 frames
+RAW_BACKGROUND_SUFFIX = '.yuv'
+
+# Longest background preloaded as raw frames (about 93MB per second at 1080x1920)
+PRELOAD_MAX_SECONDS = 20
+
+# Words shown together in one karaoke caption line
+CAPTION_WORDS_PER_EVENT = 6
+
+# Niceness given to render processes so a batch doesn't starve the rest of the app
+FFMPEG_NICENESS = 5
+
+# Spawn options for every FFmpeg/ffprobe call: no console window on Windows
+_POPEN_KW: Dict[str, Any] = {'creationflags': 0x08000000} if os.name == 'nt' else {}  # CREATE_NO_WINDOW
+
+# FFmpeg stderr lines kept for the error message when a run fails
+STDERR_TAIL_LINES = 50
+
+# Target bitrate for hardware encoders
+HW_VIDEO_BITRATE = '6M'
+
+# Render node used for VAAPI decode, scaling and encode
+VAAPI_DEVICE = '/dev/dri/renderD128'
+
+# GPU pipelines: decode and scale on the device, download for the crop and
+# subtitle burn-in (CPU-only filters), then upload again for the encoder
+_HW_PROFILES = {
+    'cuda': {
+        'device': [],
+        'input': ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda'],
+        'scale': 'scale_cuda',
+        'upload': 'hwupload_cuda',
+        'encoder': NVENC_ARGS + ['-b:v', HW_VIDEO_BITRATE],
+    },
+    'vaapi': {
+        'device': ['-vaapi_device', VAAPI_DEVICE],
+        'input': ['-hwaccel', 'vaapi', '-hwaccel_output_format', 'vaapi'],
+        'scale': 'scale_vaapi',
+        'upload': 'hwupload',
+        'encoder': ['-c:v', 'h264_vaapi', '-b:v', HW_VIDEO_BITRATE],
+    },
+}
+
+
+def _ass_color(r: int, g: int, b: int, a: int = 0) -> str:
+    """Format a colour as an ASS &HAABBGGRR value"""
+    return f'&H{a:02X}{b:02X}{g:02X}{r:02X}'
+
+
+def _ass_timestamp(seconds: float) -> str:
+    """Format seconds as an ASS H:MM:SS.cc timestamp (rounded to centiseconds)"""
+    cs = (max(0, int(seconds * 1000)) + 5) // 10
+    h, cs = divmod(cs, 360000)
+    m, cs = divmod(cs, 6000)
+    s, cs = divmod(cs, 100)
+    return f'{h}:{m:02d}:{s:02d}.{cs:02d}'
+
+
+def _srt_timestamp(seconds: float) -> str:
+    """Format seconds as an SRT HH:MM:SS,mmm timestamp"""
+    ms = max(0, int(round(seconds * 1000)))
+    h, ms = divmod(ms, 3600000)
+    m, ms = divmod(ms, 60000)
+    s, ms = divmod(ms, 1000)
+    return f'{h:02d}:{m:02d}:{s:02d},{ms:03d}'
+
+
+def _build_ass_header() -> str:
+    """
+    Render the ASS script header with the subtitle style from config
+    
+    Returns:
+        Everything up to and including the [Events] format line
+    """
+    # Professional YouTube Shorts look
+    style = ','.join(str(value) for value in (
+        'Default',
+        SUBTITLE_FONT,
+        SUBTITLE_FONT_SIZE,
+        _ass_color(0, 255, 255),  # Primary colour: words already spoken
+        _ass_color(255, 255, 255),  # Secondary colour: words still to come
+        _ass_color(0, 0, 0),      # Black outline
+        _ass_color(0, 0, 0),      # Back colour
+        -1 if SUBTITLE_BOLD else 0,
+        0, 0, 0,                  # Italic, underline, strikeout
+        100, 100, 0, 0,           # ScaleX, ScaleY, spacing, angle
+        1,                        # Border style: outline + shadow
+        SUBTITLE_OUTLINE,
+        SUBTITLE_SHADOW,
+        2,                        # Alignment: bottom center
+        10, 10,                   # MarginL, MarginR
+        SUBTITLE_MARGIN_V,        # Bottom margin in pixels
+        1,                        # Encoding
+    ))
+    return (
+        "[Script Info]\n"
+        "WrapStyle: 0\n"
+        "ScaledBorderAndShadow: yes\n"
+        "Collisions: Normal\n"
+        "ScriptType: v4.00+\n"
+        "\n"
+        "[V4+ Styles]\n"
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, "
+        "BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, "
+        "BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+        f"Style: {style}\n"
+        "\n"
+        "[Events]\n"
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+    )
+
+
+# The style only depends on config, so the header is rendered once
+_ASS_HEADER = _build_ass_header()
+
+# The same look for SRT captions, applied by the subtitles filter
+_SRT_FORCE_STYLE = ','.join((
+    f'Fontname={SUBTITLE_FONT}',
+    f'Fontsize={SUBTITLE_FONT_SIZE}',
+    f'PrimaryColour={_ass_color(0, 255, 255)}',
+    f'OutlineColour={_ass_color(0, 0, 0)}',
+    f'Bold={-1 if SUBTITLE_BOLD else 0}',
+    f'Outline={SUBTITLE_OUTLINE}',
+    f'Shadow={SUBTITLE_SHADOW}',
+    'Alignment=2',
+    f'MarginV={SUBTITLE_MARGIN_V}',
+))
+
+
+def _probe_with_av(path: str) -> Dict[str, Any]:
+    """
+    Read the container header in-process with PyAV
+    
+    Args:
+        path: Path to the media file
+        
+    Returns:
+        The subset of ffprobe's JSON layout that the editor reads
+    """
+    with av.open(path) as container:
+        streams = [
+            {'codec_type': 'video', 'width': stream.width, 'height': stream.height}
+            for stream in container.streams.video[:1]
+        ]
+        streams.extend(
+            {
+                'codec_type': 'audio',
+                'codec_name': stream.codec_context.name,
+                'sample_rate': str(stream.codec_context.sample_rate),
+            }
+            for stream in container.streams.audio[:1]
+        )
+        info: Dict[str, Any] = {'streams': streams, 'format': {}}
+        if container.duration is not None:
+            info['format']['duration'] = str(container.duration / av.time_base)
+        return info
+
+
+@functools.lru_cache(maxsize=256)
+def _probe(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Read a media file's format and stream details in one go
+    
+    Uses PyAV when installed and otherwise a single ffprobe run with JSON
+    output, so duration, frame size and audio codec cost one probe between
+    them.
+    
+    Args:
+        path: Path to the media file
+        mtime_ns: Modification time, part of the cache key only
+        
+    Returns:
+        ffprobe-style dictionary with 'format' and 'streams' (empty if failed)
+    """
+    if HAS_AV:
+        try:
+            return _probe_with_av(path)
+        except Exception as e:
+            logger.debug("PyAV could not read %s, using ffprobe: %s", path, e)
+    
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-print_format', 'json',
+        '-show_format',
+        '-show_streams',
+        path
+    ]
+    
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=10, **_POPEN_KW)
+    
+    if result.returncode == 0:
+        try:
+            return json.loads(result.stdout)
+        except ValueError:
+            pass
+    logger.error("Failed to probe %s", path)
+    return {}
+
+
+def _first_stream(info: Dict[str, Any], codec_type: str) -> Optional[Dict[str, Any]]:
+    """Return the first stream of a type ('video' or 'audio') from probe output"""
+    return next(
+        (stream for stream in info.get('streams', []) if stream.get('codec_type') == codec_type),
+        None
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _fit_filter(size: Optional[Tuple[int, int]]) -> str:
+    """
+    Build the cheapest CPU filter that fills the portrait frame from a source
+    
+    Cropping to the output aspect before scaling means the scaler only
+    produces pixels that are kept. A source that already has the output
+    aspect needs no crop, and one of the exact output size needs nothing.
+    
+    Args:
+        size: Source (width, height), or None if unknown
+        
+    Returns:
+        Filter chain segment, empty if the frames can be used as they are
+    """
+    if size == (VIDEO_WIDTH, VIDEO_HEIGHT):
+        return ''
+    scale = f'scale={VIDEO_WIDTH}:{VIDEO_HEIGHT}'
+    if size and abs(size[0] / size[1] - VIDEO_WIDTH / VIDEO_HEIGHT) < 1e-3:
+        return scale
+    # Centre crop to the output aspect; the expressions stay valid even if
+    # the decoded frames turn out rotated relative to the probed size
+    return (
+        f'crop=min(iw\\,ih*{VIDEO_WIDTH}/{VIDEO_HEIGHT}):'
+        f'min(ih\\,iw*{VIDEO_HEIGHT}/{VIDEO_WIDTH}),{scale}'
+    )
+
+
+def _source_key(video_path: Path) -> str:
+    """
+    Short stable key for a source clip, used to name files derived from it
+    
+    Downloads are all called background.mp4, so the name alone would let
+    different clips overwrite each other's derived files.
+    
+    Args:
+        video_path: Source video
+        
+    Returns:
+        Hex digest of the resolved path
+    """
+    return hashlib.blake2b(str(video_path.resolve()).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _spawn(cmd: List[str], mem_mb: Optional[int] = None) -> subprocess.Popen:
+    """
+    Start an FFmpeg process with lowered priority and an optional memory cap
+    
+    Limits are applied to the child after spawning, since preexec_fn isn't
+    safe with the worker threads renders run on, so FFmpeg's first
+    allocations may happen before they take effect. Linux IO priority
+    follows the CPU niceness; the memory cap needs prlimit (Linux).
+    
+    Args:
+        cmd: Command line
+        mem_mb: Address-space limit in megabytes, None or 0 for no cap
+        
+    Returns:
+        The running process, with text pipes for stdout and stderr
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+        **_POPEN_KW
+    )
+    try:
+        if hasattr(os, 'setpriority'):
+            os.setpriority(os.PRIO_PROCESS, proc.pid, FFMPEG_NICENESS)
+        if mem_mb and hasattr(resource, 'prlimit'):
+            limit = mem_mb * 1024 * 1024
+            resource.prlimit(proc.pid, resource.RLIMIT_AS, (limit, limit))
+    except (OSError, ValueError):
+        pass
+    return proc
+
+
+@functools.lru_cache(maxsize=None)
+def _temp_dir_on_tmpfs() -> Optional[bool]:
+    """
+    Check (once) whether TEMP_DIR is RAM-backed, warning if it is not
+    
+    Looping a background re-reads it from the start on every pass, which
+    only stays off the disk when TEMP_DIR is on tmpfs (e.g. /dev/shm).
+    
+    Returns:
+        True or False on Linux, None where mounts can't be inspected
+    """
+    try:
+        with open('/proc/mounts') as mounts:
+            entries = [line.split()[1:3] for line in mounts]
+    except OSError:
+        return None
+    
+    # The longest mount point containing TEMP_DIR is the one it lives on
+    temp_dir = str(TEMP_DIR.resolve())
+    mount_point, fs_type = max(
+        (
+            (point.replace('\\040', ' '), kind) for point, kind in entries
+            if temp_dir == point or temp_dir.startswith(point.rstrip('/') + '/')
+        ),
+        key=lambda entry: len(entry[0]),
+        default=('', None)
+    )
+    on_tmpfs = fs_type in ('tmpfs', 'ramfs')
+    if not on_tmpfs:
+        logger.warning(
+            "TEMP_DIR %s is on %s, not tmpfs; point it at /dev/shm for faster background reads",
+            temp_dir, fs_type or 'an unknown filesystem'
+        )
+    return on_tmpfs
+
+
+def _ffmpeg_list(ffmpeg_cmd: str, *args: str) -> str:
+    """
+    Run one of FFmpeg's capability listings (e.g. -encoders, -hwaccels)
+    
+    Args:
+        ffmpeg_cmd: FFmpeg executable
+        *args: Listing option and its value, if any
+        
+    Returns:
+        The listing output (empty if it couldn't be run)
+    """
+    try:
+        result = subprocess.run(
+            [ffmpeg_cmd, '-hide_banner', *args],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            **_POPEN_KW
+        )
+        return result.stdout if result.returncode == 0 else ''
+    except Exception:
+        return ''
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_ffmpeg(ffmpeg_cmd: str) -> Tuple[bool, bool, Optional[str]]:
+    """
+    Check FFmpeg once per process and pick a GPU pipeline if it supports one
+    
+    Cached, so creating several VideoEditors (e.g. in a batch) only spawns
+    the probe processes for the first.
+    
+    Args:
+        ffmpeg_cmd: FFmpeg executable
+        
+    Returns:
+        Tuple of (FFmpeg available, NVENC encoder present, hwaccel name or None)
+    """
+    try:
+        result = subprocess.run(
+            [ffmpeg_cmd, '-version'],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            **_POPEN_KW
+        )
+        if result.returncode != 0:
+            logger.error("FFmpeg test failed")
+            return False, False, None
+    except Exception as e:
+        logger.error("FFmpeg not found: %s", e)
+        logger.warning(
+            "Please install FFmpeg: https://ffmpeg.org/download.html"
+        )
+        return False, False, None
+    
+    logger.info("FFmpeg is available")
+    
+    # Prefer CUDA, then VAAPI
+    encoders = _ffmpeg_list(ffmpeg_cmd, '-encoders')
+    hwaccels = _ffmpeg_list(ffmpeg_cmd, '-hwaccels').split()
+    
+    has_nvenc = ' h264_nvenc ' in encoders
+    hw = None
+    if has_nvenc and 'cuda' in hwaccels:
+        hw = 'cuda'
+    elif ' h264_vaapi ' in encoders and 'vaapi' in hwaccels:
+        hw = 'vaapi'
+    
+    # Older builds' GPU scalers can't keep the aspect ratio, which the
+    # portrait crop relies on; decode and scale on the CPU there instead
+    if hw:
+        scale = _HW_PROFILES[hw]['scale']
+        if 'force_original_aspect_ratio' not in _ffmpeg_list(ffmpeg_cmd, '-h', f'filter={scale}'):
+            logger.info("%s can't keep the aspect ratio, not using %s decoding", scale, hw)
+            hw = None
+    
+    if hw:
+        logger.info("Using %s hardware decoding and encoding", hw)
+    elif has_nvenc:
+        logger.info("NVENC encoder available, using GPU encoding")
+    return True, has_nvenc, hw
+
+
+def _create_video_job(threads: int, job: Dict[str, Any]) -> Optional[Path]:
+    """
+    Render one create_complete_video job in a worker process
+    
+    Module-level so it can be sent to a ProcessPoolExecutor; each process
+    builds its own editor (the FFmpeg probe is cached per process).
+    
+    Args:
+        threads: Encoder threads this job may use
+        job: Keyword arguments for create_complete_video
+        
+    Returns:
+        Path to final video or None if failed
+    """
+    editor = VideoEditor()
+    editor.threads = threads
+    return editor.create_complete_video(**job)
+
 
 class VideoEditor:
     """Assembles final video using FFmpeg"""
@@ -41,40 +497,337 @@ class VideoEditor:
     def __init__(self):
         """Initialize the VideoEditor"""
         self.ffmpeg_cmd = FFMPEG_COMMAND
-        self._test_ffmpeg()
+        # Encoder threads; 0 lets FFmpeg pick (create_batch sets a per-worker share)
+        self.threads = 0
+        self.has_nvenc = False
+        self.hw: Optional[str] = None
+        self.available = self._test_ffmpeg()
+    
+    @cached_property
+    def storage(self) -> StorageManager:
+        """Storage manager, created on first use"""
+        return StorageManager()
     
     def _test_ffmpeg(self) -> bool:
-        """Test if FFmpeg is available"""
-        try:
-            result = subprocess.run(
-                [self.ffmpeg_cmd, '-version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                logger.info("FFmpeg is available")
-                return True
+        """Test if FFmpeg is available and which GPU codecs it can use"""
+        available, self.has_nvenc, self.hw = _probe_ffmpeg(self.ffmpeg_cmd)
+        return available
+    
+    def _video_input_args(self, video_path: Path, hw: Optional[str]) -> List[str]:
+        """
+        FFmpeg options placed before the background video input
+        
+        Args:
+            video_path: Background video (a .yuv file is a preloaded raw clip)
+            hw: Hardware pipeline to decode with, None for the CPU
+            
+        Returns:
+            List of command-line arguments (empty for CPU decoding)
+        """
+        device = list(_HW_PROFILES[hw]['device']) if hw else []
+        if video_path.suffix == RAW_BACKGROUND_SUFFIX:
+            return device + [
+                '-f', 'rawvideo',
+                '-pix_fmt', 'nv12',
+                '-s', f'{VIDEO_WIDTH}x{VIDEO_HEIGHT}',
+                '-r', str(VIDEO_FPS),
+            ]
+        if hw:
+            return device + _HW_PROFILES[hw]['input']
+        return []
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _escape_ass_path(path: str) -> str:
+        """
+        Escape a subtitle path for use inside an FFmpeg filter argument
+        
+        Args:
+            path: Subtitle file path
+            
+        Returns:
+            Path with forward slashes and escaped colons
+        """
+        return path.replace('\\', '/').replace(':', '\\:')
+    
+    def _video_filter(
+        self,
+        subtitle_path: Optional[Path],
+        prescaled: bool = False,
+        source_size: Optional[Tuple[int, int]] = None,
+        hw: Optional[str] = None
+    ) -> str:
+        """
+        Build the filter chain that turns the background video into [vout]
+        
+        Args:
+            subtitle_path: ASS or SRT subtitle file to burn in (skipped if missing)
+            prescaled: Input is already portrait-sized raw frames (see preload_background)
+            source_size: Background (width, height) if known, to pick the cheapest fit
+            hw: Hardware pipeline the frames are decoded and encoded with, None for the CPU
+            
+        Returns:
+            Filter graph segment
+        """
+        # Add subtitles if provided
+        subtitles = ''
+        if subtitle_path and subtitle_path.exists():
+            escaped = self._escape_ass_path(str(subtitle_path))
+            if subtitle_path.suffix == '.srt':
+                subtitles = f"subtitles={escaped}:force_style='{_SRT_FORCE_STYLE}'"
             else:
-                logger.error("FFmpeg test failed")
-                return False
+                subtitles = f'ass={escaped}'
+        
+        if prescaled:
+            # Nothing to decode, scale or crop; just burn in and (for GPU
+            # encoders) upload
+            upload = _HW_PROFILES[hw]['upload'] if hw else ''
+            chain = ['format=nv12', subtitles, upload]
+        elif hw:
+            profile = _HW_PROFILES[hw]
+            chain = [
+                f"{profile['scale']}=w={VIDEO_WIDTH}:h={VIDEO_HEIGHT}:force_original_aspect_ratio=increase",
+                'hwdownload', 'format=nv12', f'crop={VIDEO_WIDTH}:{VIDEO_HEIGHT}',
+                subtitles, 'format=nv12', profile['upload'],
+            ]
+        else:
+            # Fit video to portrait format - video will play continuously
+            chain = [_fit_filter(source_size), subtitles]
+        
+        return f"[0:v]{','.join(part for part in chain if part) or 'null'}[vout]"
+    
+    def prepare_background(self, video_path: Path) -> Path:
+        """
+        Copy a background clip into TEMP_DIR once so renders read it from there
+        
+        Meant for a clip shared by a batch: with TEMP_DIR on tmpfs every loop
+        of the background is served from memory. An up-to-date copy from an
+        earlier call is reused.
+        
+        Args:
+            video_path: Background video to stage
+            
+        Returns:
+            Path to the staged copy, or video_path itself if it is already in
+            TEMP_DIR or the copy failed
+        """
+        try:
+            _temp_dir_on_tmpfs()
+            if video_path.parent.resolve() == TEMP_DIR.resolve():
+                return video_path
+            
+            staged = TEMP_DIR / f"background_{_source_key(video_path)}{video_path.suffix}"
+            source = video_path.stat()
+            try:
+                current = staged.stat()
+                if current.st_size == source.st_size and current.st_mtime_ns == source.st_mtime_ns:
+                    return staged
+            except FileNotFoundError:
+                pass
+            
+            # Copy under a temporary name so a render never opens a partial clip
+            partial = staged.with_name(staged.name + '.part')
+            if self.storage.copy_file(video_path, partial):
+                os.replace(partial, staged)
+                return staged
+            return video_path
+            
         except Exception as e:
-            logger.error(f"FFmpeg not found: {e}")
-            logger.warning(
-                "Please install FFmpeg: https://ffmpeg.org/download.html"
-            )
-            return False
+            logger.error("Error staging background video: %s", e)
+            return video_path
+    
+    def preload_background(
+        self,
+        video_path: Path,
+        duration: Optional[float] = None,
+        output_path: Optional[Path] = None
+    ) -> Optional[Path]:
+        """
+        Decode, scale and crop a background clip once into raw NV12 frames
+        
+        Renders that reuse the clip then read frames straight from the file
+        instead of decoding H.264 and scaling again. Raw frames are large
+        (about 3MB per 1080x1920 frame), so at most PRELOAD_MAX_SECONDS are
+        kept and nothing is written unless the target disk has room; this
+        suits short loops shared by many videos. An up-to-date preload from
+        an earlier call is reused.
+        
+        Args:
+            video_path: Background video to preload
+            duration: Seconds to keep (whole clip if not provided), capped
+                at PRELOAD_MAX_SECONDS
+            output_path: Path for the raw file (in TEMP_DIR if not provided)
+            
+        Returns:
+            Path to the .yuv file or None if failed
+        """
+        try:
+            if not output_path:
+                output_path = TEMP_DIR / (
+                    f"background_{_source_key(video_path)}_{VIDEO_WIDTH}x{VIDEO_HEIGHT}{RAW_BACKGROUND_SUFFIX}"
+                )
+            
+            duration = min(duration or self.get_video_duration(video_path) or PRELOAD_MAX_SECONDS,
+                           PRELOAD_MAX_SECONDS)
+            frame_size = VIDEO_WIDTH * VIDEO_HEIGHT * 3 // 2
+            frames = duration * VIDEO_FPS
+            try:
+                current = output_path.stat()
+                # FFmpeg may round the clip to one frame either way
+                if (current.st_size % frame_size == 0
+                        and abs(current.st_size // frame_size - frames) <= 1
+                        and current.st_mtime_ns >= video_path.stat().st_mtime_ns):
+                    return output_path
+            except FileNotFoundError:
+                pass
+            
+            needed = int(frames + 1) * frame_size
+            free = shutil.disk_usage(output_path.parent).free
+            if needed > free:
+                logger.warning(
+                    "Not preloading %s: needs %dMB, only %dMB free in %s",
+                    video_path.name, needed // 2**20, free // 2**20, output_path.parent
+                )
+                return None
+            
+            # Decode under a temporary name so a render never opens a partial file
+            partial = output_path.with_name(output_path.name + '.part')
+            cmd = [
+                self.ffmpeg_cmd,
+                '-i', str(video_path),
+                '-t', str(duration),
+                '-an', '-sn',
+                '-vf', _fit_filter(self.get_video_size(video_path)) or 'null',
+                '-r', str(VIDEO_FPS),
+                '-c:v', 'rawvideo',
+                '-pix_fmt', 'nv12',
+                '-f', 'rawvideo',
+                '-loglevel', FFMPEG_LOGLEVEL,
+                '-y',
+                str(partial)
+            ]
+            
+            logger.info("Preloading background video: %s", video_path.name)
+            try:
+                result = self._run_ffmpeg(cmd, timeout=300)
+                if result.returncode == 0:
+                    os.replace(partial, output_path)
+                    logger.info("Background preloaded: %s", output_path)
+                    return output_path
+                logger.error("Background preload failed: %s", result.stderr)
+                return None
+            finally:
+                partial.unlink(missing_ok=True)
+                
+        except subprocess.TimeoutExpired:
+            logger.error("Background preload timed out")
+            return None
+        except Exception as e:
+            logger.error("Error preloading background: %s", e)
+            return None
+    
+    def _video_encoder_args(self, hw: Optional[str], nvenc: bool) -> List[str]:
+        """
+        FFmpeg video encoder options for the final render
+        
+        Args:
+            hw: Hardware pipeline the frames come from, None for the CPU
+            nvenc: Encode with NVENC even though frames are decoded on the CPU
+            
+        Returns:
+            List of command-line arguments
+        """
+        if hw:
+            # Frames arrive on the GPU already, so no pixel format conversion
+            return list(_HW_PROFILES[hw]['encoder'])
+        if nvenc:
+            return NVENC_ARGS + ['-pix_fmt', 'yuv420p']
+        return [
+            '-c:v', VIDEO_CODEC,
+            '-preset', VIDEO_PRESET,
+            '-threads', str(self.threads),
+            '-x264-params', X264_PARAMS,
+            '-pix_fmt', 'yuv420p',  # Compatibility
+        ]
+    
+    def _run_ffmpeg(
+        self,
+        cmd: List[str],
+        timeout: float,
+        progress: Optional[Callable[[float], None]] = None,
+        gpu: bool = False
+    ) -> subprocess.CompletedProcess:
+        """
+        Run FFmpeg while streaming its output instead of buffering it all
+        
+        stderr is drained on a background thread keeping only the last
+        lines, and -progress output on stdout reports the encoded position.
+        
+        Args:
+            cmd: FFmpeg command line
+            timeout: Seconds before the process is killed
+            progress: Optional callback given the seconds of output encoded so far
+            gpu: The command decodes or encodes on the GPU
+            
+        Returns:
+            CompletedProcess with the return code and the tail of stderr
+            
+        Raises:
+            subprocess.TimeoutExpired: If FFmpeg ran longer than timeout
+        """
+        cmd = [cmd[0], '-nostats', '-progress', 'pipe:1'] + cmd[1:]
+        # GPU drivers reserve far more address space than they use, so only
+        # CPU renders get the (opt-in) memory cap
+        proc = _spawn(cmd, mem_mb=None if gpu else FFMPEG_MEMORY_LIMIT_MB)
+        
+        errors = deque(maxlen=STDERR_TAIL_LINES)
+        drain = threading.Thread(target=errors.extend, args=(proc.stderr,), daemon=True)
+        drain.start()
+        
+        timed_out = threading.Event()
+        
+        def kill():
+            timed_out.set()
+            proc.kill()
+        
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        try:
+            for line in proc.stdout:
+                # out_time_ms is in microseconds despite its name
+                if progress and line.startswith('out_time_ms='):
+                    value = line[12:].strip()
+                    if value.isdigit():
+                        progress(int(value) / 1_000_000)
+            proc.wait()
+        except BaseException:
+            # Nothing reads stdout any more, so FFmpeg would block on a full
+            # pipe and the stderr drain below would never finish
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            timer.cancel()
+            drain.join()
+            proc.stdout.close()
+            proc.stderr.close()
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        return subprocess.CompletedProcess(cmd, proc.returncode, '', ''.join(errors))
     
     def create_animated_subtitles(
         self,
-        word_timestamps: List[Dict[str, Any]],
+        word_timestamps: Union[WordTimestamps, List[Dict[str, Any]]],
         output_path: Optional[Path] = None
     ) -> Optional[Path]:
         """
         Create animated word-by-word subtitles in ASS format
         
+        Words appear in short phrases, each lighting up as it is spoken.
+        
         Args:
-            word_timestamps: List of word timestamp dictionaries
+            word_timestamps: Word timestamps (or a list of word timestamp dictionaries)
             output_path: Path to save subtitle file
             
         Returns:
@@ -84,50 +837,76 @@ class VideoEditor:
             if not output_path:
                 output_path = TEMP_DIR / 'subtitles.ass'
             
-            # Create ASS subtitle file
-            subs = pysubs2.SSAFile()
-            
-            # Configure style - Professional YouTube Shorts look
-            style = pysubs2.SSAStyle()
-            style.fontname = SUBTITLE_FONT
-            style.fontsize = SUBTITLE_FONT_SIZE
-            style.primarycolor = pysubs2.Color(0, 255, 255)  # Yellow (RGB in pysubs2)
-            style.outlinecolor = pysubs2.Color(0, 0, 0)  # Black outline
-            style.outline = SUBTITLE_OUTLINE
-            style.shadow = SUBTITLE_SHADOW
-            style.bold = SUBTITLE_BOLD
-            # Alignment: 1=left-bottom, 2=center-bottom, 3=right-bottom, 5=left-top, etc.
-            style.alignment = 2  # Bottom center
-            style.marginv = SUBTITLE_MARGIN_V  # Bottom margin in pixels
-            
-            # Add slight uppercase for better readability (optional)
-            # This can be applied to individual words if needed
-            
-            subs.styles["Default"] = style
-            
-            # Add each word as a separate event with uppercase for impact
-            for word_data in word_timestamps:
-                word = word_data['word']
-                start_ms = int(word_data['start'] * 1000)
-                end_ms = int(word_data['end'] * 1000)
-                
-                # Make words uppercase for better readability (like viral shorts)
-                word_display = word.upper()
-                
-                event = pysubs2.SSAEvent(
-                    start=start_ms,
-                    end=end_ms,
-                    text=word_display
+            timestamps = WordTimestamps.from_list_of_dicts(word_timestamps)
+            
+            # Group words into phrase lines and reveal each word with a
+            # karaoke tag, so libass handles a few events instead of one per
+            # word; uppercase for impact (like viral shorts)
+            words, starts, ends = timestamps.words, timestamps.start, timestamps.end
+            lines = [_ASS_HEADER]
+            for first in range(0, len(words), CAPTION_WORDS_PER_EVENT):
+                last = min(first + CAPTION_WORDS_PER_EVENT, len(words)) - 1
+                # Each word is highlighted until the next one starts; work in
+                # absolute centiseconds so rounding doesn't drift
+                boundaries = [round(starts[i] * 100) for i in range(first, last + 1)]
+                boundaries.append(round(ends[last] * 100))
+                text = ' '.join(
+                    f"{{\\k{boundaries[j + 1] - boundaries[j]}}}{words[first + j].upper()}"
+                    for j in range(last - first + 1)
+                )
+                lines.append(
+                    f"Dialogue: 0,{_ass_timestamp(starts[first])},{_ass_timestamp(ends[last])},"
+                    f"Default,,0,0,0,,{text}\n"
+                )
+            
+            # Save the subtitle file in one write, renamed into place so an
+            # FFmpeg run reading it never sees a partial file
+            atomic_write_bytes(output_path, ''.join(lines).encode('utf-8'))
+            logger.info("Created animated subtitles: %s", output_path)
+            return output_path
+            
+        except Exception as e:
+            logger.error("Error creating subtitles: %s", e)
+            return None
+    
+    def create_srt_subtitles(
+        self,
+        word_timestamps: Union[WordTimestamps, List[Dict[str, Any]]],
+        output_path: Optional[Path] = None
+    ) -> Optional[Path]:
+        """
+        Create plain word-by-word subtitles in SRT format
+        
+        One uppercase word per cue with no karaoke effect, which libass
+        renders more cheaply than the animated ASS captions. The look comes
+        from the forced style applied when burning them in.
+        
+        Args:
+            word_timestamps: Word timestamps (or a list of word timestamp dictionaries)
+            output_path: Path to save subtitle file
+            
+        Returns:
+            Path to subtitle file or None if failed
+        """
+        try:
+            if not output_path:
+                output_path = TEMP_DIR / 'subtitles.srt'
+            
+            timestamps = WordTimestamps.from_list_of_dicts(word_timestamps)
+            
+            cues = [
+                f"{index}\n{_srt_timestamp(start)} --> {_srt_timestamp(end)}\n{word.upper()}\n\n"
+                for index, (word, start, end) in enumerate(
+                    zip(timestamps.words, timestamps.start, timestamps.end), 1
                 )
-                subs.append(event)
+            ]
             
-            # Save the subtitle file
-            subs.save(str(output_path))
-            logger.info(f"Created animated subtitles: {output_path}")
+            atomic_write_bytes(output_path, ''.join(cues).encode('utf-8'))
+            logger.info("Created subtitles: %s", output_path)
             return output_path
             
         except Exception as e:
-            logger.error(f"Error creating subtitles: {e}")
+            logger.error("Error creating subtitles: %s", e)
             return None
     
     def mix_audio(
@@ -166,7 +945,7 @@ class VideoEditor:
                 '-i', str(voice_path),
                 '-i', str(music_path),
                 '-filter_complex',
-                f'[0:a]volume={voice_volume}[a1];[1:a]volume={music_volume}[a2];[a1][a2]amix=inputs=2:duration=first',
+                f'[0:a]volume={voice_volume}[a1];[1:a]volume={music_volume}[a2];[a1][a2]amix=inputs=2:duration=first:normalize=0',
                 '-c:a', AUDIO_CODEC,
                 '-b:a', AUDIO_BITRATE,
                 '-loglevel', FFMPEG_LOGLEVEL,
@@ -175,72 +954,99 @@ class VideoEditor:
             ]
             
             logger.info("Mixing audio tracks...")
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            result = self._run_ffmpeg(cmd, timeout=60)
             
             if result.returncode == 0:
-                logger.info(f"Audio mixed successfully: {output_path}")
+                logger.info("Audio mixed successfully: %s", output_path)
                 return output_path
             else:
-                logger.error(f"Audio mixing failed: {result.stderr}")
+                logger.error("Audio mixing failed: %s", result.stderr)
                 return None
                 
         except Exception as e:
-            logger.error(f"Error mixing audio: {e}")
+            logger.error("Error mixing audio: %s", e)
             return None
     
     def assemble_video(
         self,
         video_path: Path,
-        audio_path: Path,
+        voice_path: Path,
+        music_path: Optional[Path],
         subtitle_path: Optional[Path],
         output_path: Path,
-        duration: Optional[float] = None
+        duration: Optional[float] = None,
+        voice_volume: float = VOICE_VOLUME,
+        music_volume: float = BACKGROUND_MUSIC_VOLUME,
+        progress: Optional[Callable[[float], None]] = None,
+        use_gpu: bool = True
     ) -> Optional[Path]:
         """
         Assemble final video with video, audio, and subtitles
         
+        Voice and background music are mixed inside the same FFmpeg run, so
+        there is no separate mixing pass or intermediate audio file.
+        
         Args:
             video_path: Path to background video
-            audio_path: Path to audio file
+            voice_path: Path to voice narration
+            music_path: Path to background music (optional)
             subtitle_path: Path to subtitle file
             output_path: Path to save final video
             duration: Video duration in seconds (trims video if specified)
+            voice_volume: Voice volume multiplier (when mixing with music)
+            music_volume: Music volume multiplier
+            progress: Optional callback given the seconds of video encoded so far
+            use_gpu: Use the GPU pipeline found at startup; a failed GPU render
+                is retried once on the CPU
             
         Returns:
             Path to final video or None if failed
         """
         try:
-            # Build FFmpeg command with stream_loop for better video quality
-            cmd = [
-                self.ffmpeg_cmd,
-                '-stream_loop', '-1',  # Loop video indefinitely
+            hw = self.hw if use_gpu else None
+            nvenc = self.has_nvenc and use_gpu
+            prescaled = video_path.suffix == RAW_BACKGROUND_SUFFIX
+            cmd = [self.ffmpeg_cmd]
+            cmd.extend(self._video_input_args(video_path, hw))
+            # Only the picture of the background is used
+            cmd.extend(['-an', '-sn'])
+            
+            background_duration = self.get_video_duration(video_path) if duration else None
+            if background_duration and duration <= background_duration:
+                # The clip is long enough: decode just the needed span once
+                cmd.extend(['-t', str(duration)])
+            else:
+                cmd.extend(['-stream_loop', '-1'])  # Loop video indefinitely
+            cmd.extend([
                 '-i', str(video_path),
-                '-i', str(audio_path),
-            ]
+                '-i', str(voice_path),
+            ])
             
-            # Build filter complex
-            filters = []
+            has_music = bool(music_path and music_path.exists())
+            if has_music:
+                cmd.extend(['-i', str(music_path)])
+            else:
+                logger.info("No background music, using voice only")
             
-            # Scale and crop video to portrait format - video will play continuously
-            filters.append(
-                f'[0:v]scale={VIDEO_WIDTH}:{VIDEO_HEIGHT}:force_original_aspect_ratio=increase,'
-                f'crop={VIDEO_WIDTH}:{VIDEO_HEIGHT}[v]'
-            )
+            # Build filter complex
+            source_size = None if prescaled or hw else self.get_video_size(video_path)
+            filters = [self._video_filter(subtitle_path, prescaled, source_size, hw)]
             
-            # Add subtitles if provided
-            if subtitle_path and subtitle_path.exists():
-                # Escape the path for FFmpeg
-                sub_path_escaped = str(subtitle_path).replace('\\', '/').replace(':', '\\:')
-                filters.append(f'[v]ass={sub_path_escaped}[vout]')
-                video_label = '[vout]'
+            # Mix voice and music in the same graph
+            if has_music:
+                filters.append(
+                    f'[1:a]volume={voice_volume}[a1];[2:a]volume={music_volume}[a2];'
+                    f'[a1][a2]amix=inputs=2:duration=first:normalize=0[aout]'
+                )
+                audio_label = '[aout]'
             else:
-                video_label = '[v]'
+                audio_label = '1:a'
             
             # Add filter complex to command
             cmd.extend([
                 '-filter_complex', ';'.join(filters),
-                '-map', video_label,
-                '-map', '1:a',
+                '-map', '[vout]',
+                '-map', audio_label,
             ])
             
             # Add duration if specified
@@ -248,37 +1054,71 @@ class VideoEditor:
                 cmd.extend(['-t', str(duration)])
             
             # Video encoding settings
+            cmd.extend(self._video_encoder_args(hw, nvenc))
             cmd.extend([
-                '-c:v', VIDEO_CODEC,
-                '-preset', VIDEO_PRESET,
                 '-c:a', AUDIO_CODEC,
                 '-b:a', AUDIO_BITRATE,
+                # Fixed two-second GOPs with no scene-cut analysis
+                '-g', str(VIDEO_FPS * 2),
+                '-keyint_min', str(VIDEO_FPS),
+                '-sc_threshold', '0',
+                # Index at the front so uploads and players can start at once
+                '-movflags', '+faststart',
+                '-shortest',
                 '-r', str(VIDEO_FPS),
-                '-pix_fmt', 'yuv420p',  # Compatibility
                 '-loglevel', FFMPEG_LOGLEVEL,
                 '-y',  # Overwrite output
                 str(output_path)
             ])
             
             logger.info("Assembling final video...")
-            logger.debug(f"FFmpeg command: {' '.join(cmd)}")
+            logger.debug("FFmpeg command: %s", ' '.join(cmd))
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            gpu = bool(hw or nvenc)
+            result = self._run_ffmpeg(cmd, timeout=300, progress=progress, gpu=gpu)
             
             if result.returncode == 0:
-                logger.info(f"Video assembled successfully: {output_path}")
+                logger.info("Video assembled successfully: %s", output_path)
                 return output_path
+            elif gpu:
+                # Many FFmpeg builds list GPU codecs even without a usable GPU,
+                # and a busy GPU can fail one render yet serve the next, so
+                # fall back for this video only
+                logger.warning("GPU encoding failed, falling back to %s: %s", VIDEO_CODEC, result.stderr)
+                return self.assemble_video(
+                    video_path, voice_path, music_path, subtitle_path, output_path,
+                    duration, voice_volume, music_volume, progress, use_gpu=False
+                )
             else:
-                logger.error(f"Video assembly failed: {result.stderr}")
+                logger.error("Video assembly failed: %s", result.stderr)
                 return None
                 
         except subprocess.TimeoutExpired:
             logger.error("Video assembly timed out")
             return None
         except Exception as e:
-            logger.error(f"Error assembling video: {e}")
+            logger.error("Error assembling video: %s", e)
             return None
     
+    def probe(self, media_path: Path) -> Dict[str, Any]:
+        """
+        Get a media file's format and stream details
+        
+        Results are cached per file and modification time, so reusing the
+        same background across a batch probes it only once.
+        
+        Args:
+            media_path: Path to an audio or video file
+            
+        Returns:
+            ffprobe-style dictionary with 'format' and 'streams' (empty if failed)
+        """
+        try:
+            return _probe(str(media_path), media_path.stat().st_mtime_ns)
+        except Exception as e:
+            logger.error("Error probing %s: %s", media_path, e)
+            return {}
+    
     def get_video_duration(self, video_path: Path) -> Optional[float]:
         """
         Get duration of a video file in seconds
@@ -290,35 +1130,40 @@ class VideoEditor:
             Duration in seconds or None if failed
         """
         try:
-            cmd = [
-                'ffprobe',
-                '-v', 'error',
-                '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1',
-                str(video_path)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
-                duration = float(result.stdout.strip())
-                return duration
-            else:
-                logger.error("Failed to get video duration")
-                return None
-                
+            if video_path.suffix == RAW_BACKGROUND_SUFFIX:
+                # Raw NV12 frames: 1.5 bytes per pixel at VIDEO_FPS
+                frame_size = VIDEO_WIDTH * VIDEO_HEIGHT * 3 // 2
+                return video_path.stat().st_size / frame_size / VIDEO_FPS
+            return float(self.probe(video_path)['format']['duration'])
         except Exception as e:
-            logger.error(f"Error getting video duration: {e}")
+            logger.error("Error getting video duration: %s", e)
             return None
     
+    def get_video_size(self, video_path: Path) -> Optional[Tuple[int, int]]:
+        """
+        Get the frame size of a video file
+        
+        Args:
+            video_path: Path to video file
+            
+        Returns:
+            (width, height) or None if failed
+        """
+        stream = _first_stream(self.probe(video_path), 'video')
+        if stream and stream.get('width') and stream.get('height'):
+            return int(stream['width']), int(stream['height'])
+        return None
+    
     def create_complete_video(
         self,
         background_video: Path,
         voice_audio: Path,
         background_music: Optional[Path],
-        word_timestamps: List[Dict[str, Any]],
+        word_timestamps: Union[WordTimestamps, List[Dict[str, Any]]],
         output_path: Path,
-        target_duration: Optional[float] = None
+        target_duration: Optional[float] = None,
+        progress: Optional[Callable[[float], None]] = None,
+        karaoke: bool = True
     ) -> Optional[Path]:
         """
         Complete video creation pipeline
@@ -330,6 +1175,8 @@ class VideoEditor:
             word_timestamps: Word-level timestamps for subtitles
             output_path: Path to save final video
             target_duration: Target video duration
+            progress: Optional callback given the seconds of video encoded so far
+            karaoke: Animated ASS captions; False burns in cheaper plain SRT words
             
         Returns:
             Path to final video or None if failed
@@ -337,26 +1184,36 @@ class VideoEditor:
         try:
             logger.info("Starting complete video creation pipeline...")
             
+            # Name intermediates after the output so concurrent videos don't
+            # overwrite each other's files in the shared temp directory
             # Step 1: Create subtitles
-            subtitle_path = self.create_animated_subtitles(word_timestamps)
+            if karaoke:
+                write_subtitles, suffix = self.create_animated_subtitles, '.ass'
+            else:
+                write_subtitles, suffix = self.create_srt_subtitles, '.srt'
+            subtitle_path = write_subtitles(
+                word_timestamps,
+                TEMP_DIR / f"{output_path.stem}_subtitles{suffix}"
+            )
             if not subtitle_path:
                 logger.warning("Failed to create subtitles, continuing without them")
                 subtitle_path = None
             
-            # Step 2: Mix audio
-            mixed_audio = self.mix_audio(voice_audio, background_music)
-            if not mixed_audio:
-                logger.error("Failed to mix audio")
-                return None
-            
-            # Step 3: Assemble video
-            final_video = self.assemble_video(
-                background_video,
-                mixed_audio,
-                subtitle_path,
-                output_path,
-                duration=target_duration
-            )
+            # Step 2: Mix audio and assemble video in one FFmpeg run
+            try:
+                final_video = self.assemble_video(
+                    background_video,
+                    voice_audio,
+                    background_music,
+                    subtitle_path,
+                    output_path,
+                    duration=target_duration,
+                    progress=progress
+                )
+            finally:
+                # The subtitles are burned in, so the file is no longer needed
+                if subtitle_path:
+                    subtitle_path.unlink(missing_ok=True)
             
             if final_video:
                 logger.info("Video creation pipeline completed successfully!")
@@ -364,5 +1221,70 @@ class VideoEditor:
             return final_video
             
         except Exception as e:
-            logger.error(f"Error in video creation pipeline: {e}")
+            logger.error("Error in video creation pipeline: %s", e)
             return None
+    
+    def create_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        max_workers: Optional[int] = None
+    ) -> List[Optional[Path]]:
+        """
+        Render several videos in parallel worker processes
+        
+        For assets that are already on disk; whole videos from a fact go
+        through ViralShortsGenerator.generate_batch, which shares the same
+        BATCH_CONCURRENCY default. A single FFmpeg encode stops scaling well
+        past a handful of cores, so a few concurrent encodes, each limited to
+        its share of the CPUs, get more throughput without oversubscribing
+        the machine.
+        
+        Args:
+            jobs: Keyword arguments for create_complete_video, one dict per video
+            max_workers: Number of worker processes (BATCH_CONCURRENCY if not provided)
+            
+        Returns:
+            Path to each final video (None for failed jobs), in job order
+        """
+        if not jobs:
+            return []
+        
+        cpu_count = os.cpu_count() or 2
+        if max_workers is None:
+            max_workers = BATCH_CONCURRENCY
+        max_workers = max(1, min(max_workers, len(jobs)))
+        threads = max(1, cpu_count // max_workers)
+        
+        # Backgrounds shared by several jobs are staged in TEMP_DIR once
+        uses = Counter(job.get('background_video') for job in jobs)
+        staged = {
+            path: self.prepare_background(path)
+            for path, count in uses.items() if path and count > 1
+        }
+        jobs = [
+            dict(job, background_video=staged[job['background_video']])
+            if job.get('background_video') in staged else job
+            for job in jobs
+        ]
+        
+        logger.info("Rendering %s videos with %s worker processes...", len(jobs), max_workers)
+        results: List[Optional[Path]] = [None] * len(jobs)
+        # Spawn gives each worker a clean interpreter (no inherited threads)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+            futures = {
+                pool.submit(_create_video_job, threads, job): i
+                for i, job in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    logger.error("Error rendering video %s: %s", i + 1, e)
+                if results[i] is None:
+                    logger.warning("Video %s/%s failed", i + 1, len(jobs))
+        
+        done = sum(1 for path in results if path)
+        logger.info("Rendered %s/%s videos", done, len(jobs))
+        return results
@@ -0,0 +1,18 @@
+"""Shared test setup"""
+
+import os
+import shutil
+import tempfile
+
+# Point every configured directory at a throwaway location before the
+# package (and its config) is imported, so test runs never write queue
+# files, logs or caches into the working tree
+_RUNTIME_DIR = tempfile.mkdtemp(prefix='viral_shorts_tests_')
+for _name in ('OUTPUT_DIR', 'ASSETS_DIR', 'MUSIC_DIR', 'TEMP_DIR', 'CACHE_DIR'):
+    os.environ[_name] = os.path.join(_RUNTIME_DIR, _name.lower())
+os.environ['LOG_FILE'] = os.path.join(_RUNTIME_DIR, 'logs', 'viral_shorts.log')
+
+
+def pytest_unconfigure(config):
+    """Remove the runtime directory once the session is over"""
+    shutil.rmtree(_RUNTIME_DIR, ignore_errors=True)
@@ -3,6 +3,7 @@
 import pytest
 from viral_shorts.content_sourcing.fetchers import FactFetcher
 from viral_shorts.content_sourcing.parsers import FactParser
+from viral_shorts.content_sourcing.cache import FactCache
 
 
 def test_fact_parser():
@@ -20,6 +21,18 @@ def test_fact_parser():
     assert parsed['word_count'] == 4
 
 
+def test_fact_parser_normalizes_whitespace():
+    """Test word counting on facts with irregular whitespace"""
+    raw = '  Honey  never\nspoils\tat all. '
+    parsed = FactParser.parse_fact({'fact': raw})
+    
+    # The original text is kept; the counts describe the normalized copy
+    assert parsed['text'] == raw
+    assert parsed['clean_text'] == 'Honey never spoils at all.'
+    assert parsed['word_count'] == 5
+    assert parsed['length'] == len(parsed['clean_text'])
+
+
 def test_fact_validation():
     """Test fact validation"""
     parser = FactParser()
@@ -52,5 +65,46 @@ def test_keyword_extraction():
     assert 'Great' in keywords or 'Wall' in keywords or 'China' in keywords
 
 
+def test_keyword_tokenization():
+    """Test that keywords are whitespace-separated words with outer punctuation stripped"""
+    keywords = FactParser.extract_keywords("Sea-level rose 1000 times, didn't it? Café owners (mostly) agree.", 10)
+    
+    assert keywords == ['sea-level', 'rose', '1000', 'times', "didn't", 'café', 'owners', 'mostly', 'agree']
+
+
+def test_fact_cache(tmp_path):
+    """Test that cached facts are handed out once, oldest first"""
+    cache = FactCache(tmp_path / 'facts.db')
+    
+    assert cache.insert({'fact': 'Octopuses have three hearts.'}) == True
+    assert cache.insert({'fact': 'octopuses  have three hearts.'}) == False
+    assert cache.insert({'fact': 'Bananas are berries.'}, used=True) == True
+    assert cache.unused_count() == 1
+    
+    assert cache.pop_unused() == {'fact': 'Octopuses have three hearts.'}
+    assert cache.pop_unused() is None
+    cache.close()
+
+
+
+def test_fact_cache_shared_between_instances(tmp_path):
+    """Test that two caches on one database never hand out the same fact"""
+    first = FactCache(tmp_path / 'facts.db')
+    second = FactCache(tmp_path / 'facts.db')
+    for i in range(5):
+        first.insert({'fact': f'Fact number {i}.'})
+    
+    taken = []
+    for cache in (first, second, first, second, first, second):
+        fact = cache.pop_unused()
+        if fact:
+            taken.append(fact['fact'])
+    
+    assert sorted(taken) == [f'Fact number {i}.' for i in range(5)]
+    assert second.unused_count() == 0
+    first.close()
+    second.close()
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
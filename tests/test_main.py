@@ -0,0 +1,37 @@
+"""Unit tests for the main pipeline orchestration"""
+
+import asyncio
+import pytest
+from viral_shorts.main import ViralShortsGenerator
+
+
+class _Facts:
+    """Fact source handing out numbered facts"""
+    
+    async def take_many_async(self, n):
+        return [{'fact': f'Fact {i}.'} for i in range(n)]
+
+
+def test_generate_batch_bounds_concurrency():
+    """Test that a batch never runs more pipelines at once than asked"""
+    generator = ViralShortsGenerator.__new__(ViralShortsGenerator)
+    generator.fact_fetcher = _Facts()
+    running = []
+    peak = []
+    
+    async def fake_pipeline(publish, fact_data, video_id, upload_queue):
+        running.append(video_id)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(video_id)
+        return video_id
+    
+    generator.generate_video_async = fake_pipeline
+    results = generator.generate_videos(6, concurrency=2)
+    
+    assert len(results) == 6
+    assert max(peak) == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,49 @@
+"""Unit tests for narration module"""
+
+import pytest
+from viral_shorts.narration.timestamps import WordTimestamps
+
+
+def _timestamps():
+    """Three words, with a pause before the last"""
+    return WordTimestamps.from_list_of_dicts([
+        {'word': 'one', 'start': 0.0, 'end': 0.5},
+        {'word': 'two', 'start': 0.5, 'end': 1.0},
+        {'word': 'three', 'start': 1.25, 'end': 2.0},
+    ])
+
+
+def test_word_timestamps_indexing():
+    """Test that items come back as word dicts, including negative indices"""
+    timestamps = _timestamps()
+    
+    assert len(timestamps) == 3
+    assert timestamps[0] == {'word': 'one', 'start': 0.0, 'end': 0.5, 'duration': 0.5}
+    assert timestamps[-1]['word'] == 'three'
+    with pytest.raises(IndexError):
+        timestamps[3]
+
+
+def test_word_timestamps_slicing():
+    """Test that slices are WordTimestamps holding the selected words"""
+    timestamps = _timestamps()
+    
+    tail = timestamps[1:]
+    assert isinstance(tail, WordTimestamps)
+    assert tail.to_list_of_dicts() == timestamps.to_list_of_dicts()[1:]
+    assert [item['word'] for item in timestamps[::-2]] == ['three', 'one']
+    assert len(timestamps[5:]) == 0
+
+
+def test_word_timestamps_index_at():
+    """Test finding the word spoken at a time, and gaps between words"""
+    timestamps = _timestamps()
+    
+    assert timestamps.index_at(0.0) == 0
+    assert timestamps.index_at(0.75) == 1
+    assert timestamps.index_at(1.1) is None
+    assert timestamps.index_at(5.0) is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
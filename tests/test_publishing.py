@@ -2,12 +2,26 @@
 
 import pytest
 from pathlib import Path
+from datetime import datetime, timedelta
+from viral_shorts.publishing import scheduler as scheduler_module
 from viral_shorts.publishing.scheduler import VideoScheduler
 
 
-def test_scheduler_queue():
+def _add(scheduler, title, scheduled_time=None):
+    """Queue a dummy video and return its queue entry"""
+    assert scheduler.add_to_queue(
+        video_path=Path(f'{title}.mp4'),
+        title=title,
+        description='Test Description',
+        tags=['test', 'video'],
+        scheduled_time=scheduled_time
+    )
+    return scheduler.queue[-1]
+
+
+def test_scheduler_queue(tmp_path):
     """Test video scheduler queue operations"""
-    scheduler = VideoScheduler()
+    scheduler = VideoScheduler(queue_file=tmp_path / 'upload_queue.json')
     
     # Add to queue
     result = scheduler.add_to_queue(
@@ -24,5 +38,133 @@ def test_scheduler_queue():
     assert stats['total'] > 0
 
 
+def test_scheduler_replays_journal(tmp_path):
+    """Test that a new scheduler sees changes only recorded in the journal"""
+    queue_file = tmp_path / 'upload_queue.json'
+    scheduler = VideoScheduler(queue_file=queue_file)
+    first = _add(scheduler, 'first')
+    _add(scheduler, 'second')
+    assert scheduler.mark_uploaded(first['id'], 'yt123')
+    
+    assert not queue_file.exists()
+    assert scheduler.journal_file.exists()
+    
+    reloaded = VideoScheduler(queue_file=queue_file)
+    assert [video['title'] for video in reloaded.queue] == ['first', 'second']
+    assert reloaded.queue[0]['youtube_id'] == 'yt123'
+    assert reloaded.get_queue_stats() == {'total': 2, 'pending': 1, 'uploaded': 1, 'failed': 0}
+    scheduler.close()
+    reloaded.close()
+
+
+def test_scheduler_compacts_journal(tmp_path, monkeypatch):
+    """Test that a large journal is folded into the snapshot"""
+    monkeypatch.setattr(scheduler_module, 'JOURNAL_COMPACT_BYTES', 1)
+    scheduler = VideoScheduler(queue_file=tmp_path / 'upload_queue.json')
+    _add(scheduler, 'first')
+    
+    assert scheduler.queue_file.exists()
+    assert not scheduler.journal_file.exists()
+    assert VideoScheduler(queue_file=scheduler.queue_file).get_queue_stats()['total'] == 1
+
+
+def test_scheduler_close_writes_snapshot(tmp_path):
+    """Test that closing leaves an up-to-date snapshot and no journal"""
+    scheduler = VideoScheduler(queue_file=tmp_path / 'upload_queue.json')
+    _add(scheduler, 'first')
+    scheduler.close()
+    
+    assert scheduler.queue_file.exists()
+    assert not scheduler.journal_file.exists()
+    assert VideoScheduler(queue_file=scheduler.queue_file).queue[0]['title'] == 'first'
+
+
+def test_scheduler_pending_uploads(tmp_path):
+    """Test that only due, still-pending videos are returned, oldest first"""
+    scheduler = VideoScheduler(queue_file=tmp_path / 'upload_queue.json')
+    now = datetime.now()
+    later = _add(scheduler, 'later', now - timedelta(minutes=1))
+    sooner = _add(scheduler, 'sooner', now - timedelta(minutes=5))
+    _add(scheduler, 'future', now + timedelta(hours=1))
+    
+    assert [video['title'] for video in scheduler.get_pending_uploads()] == ['sooner', 'later']
+    
+    scheduler.mark_failed(sooner['id'], 'quota exceeded')
+    assert scheduler.get_pending_uploads() == [later]
+    assert scheduler.get_queue_stats() == {'total': 3, 'pending': 2, 'uploaded': 0, 'failed': 1}
+    scheduler.close()
+
+
+def test_scheduler_clear_completed(tmp_path):
+    """Test that clearing removes uploaded videos past the cutoff only"""
+    scheduler = VideoScheduler(queue_file=tmp_path / 'upload_queue.json')
+    uploaded = _add(scheduler, 'uploaded')
+    _add(scheduler, 'pending')
+    scheduler.mark_uploaded(uploaded['id'], 'yt123')
+    
+    assert scheduler.clear_completed(older_than_days=7) == 0
+    assert scheduler.clear_completed(older_than_days=0) == 1
+    assert [video['title'] for video in scheduler.queue] == ['pending']
+    assert scheduler.get_queue_stats() == {'total': 1, 'pending': 1, 'uploaded': 0, 'failed': 0}
+    scheduler.close()
+
+
+def test_scheduler_add_fails_when_journal_fails(tmp_path):
+    """Test that a video that can't be recorded isn't reported as queued"""
+    scheduler = VideoScheduler(queue_file=tmp_path / 'upload_queue.json')
+    # A directory where the journal should be makes every append fail
+    scheduler.journal_file = tmp_path / 'journal'
+    scheduler.journal_file.mkdir()
+    
+    assert scheduler.add_to_queue(Path('test.mp4'), 'Test', 'Description', []) == False
+    assert scheduler.get_queue_stats()['total'] == 0
+    assert scheduler.get_pending_uploads() == []
+
+
+
+def _batch(*titles):
+    """Video dicts as passed to schedule_batch"""
+    return [
+        {'video_path': f'{title}.mp4', 'title': title, 'description': 'Test Description', 'tags': []}
+        for title in titles
+    ]
+
+
+def test_scheduler_batch_fails_when_journal_fails(tmp_path):
+    """Test that a batch that can't be recorded is reported and not queued"""
+    scheduler = VideoScheduler(queue_file=tmp_path / 'upload_queue.json')
+    scheduler.journal_file = tmp_path / 'journal'
+    scheduler.journal_file.mkdir()
+    
+    assert scheduler.schedule_batch(_batch('first', 'second')) == False
+    assert scheduler.get_queue_stats()['total'] == 0
+    assert scheduler.get_pending_uploads() == []
+
+
+def test_scheduler_batch_rolls_back_when_flush_fails(tmp_path, monkeypatch):
+    """Test that a failed write at the end of a batch takes back the whole batch"""
+    queue_file = tmp_path / 'upload_queue.json'
+    scheduler = VideoScheduler(queue_file=queue_file)
+    _add(scheduler, 'existing')
+    
+    monkeypatch.setattr(scheduler, '_flush_journal', lambda: False)
+    assert scheduler.schedule_batch(_batch('first', 'second')) == False
+    assert [video['title'] for video in scheduler.queue] == ['existing']
+    
+    # Nothing of the batch is left in the journal either
+    assert [video['title'] for video in VideoScheduler(queue_file=queue_file).queue] == ['existing']
+
+
+def test_scheduler_batch(tmp_path):
+    """Test that a batch is spaced out and survives a reload"""
+    queue_file = tmp_path / 'upload_queue.json'
+    scheduler = VideoScheduler(queue_file=queue_file)
+    
+    assert scheduler.schedule_batch(_batch('first', 'second'), interval_hours=2) == True
+    first, second = scheduler.queue
+    assert second['scheduled_ts'] - first['scheduled_ts'] == 2 * 3600
+    assert len(VideoScheduler(queue_file=queue_file).queue) == 2
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
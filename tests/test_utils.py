@@ -0,0 +1,99 @@
+"""Unit tests for utils module"""
+
+import os
+import stat
+import time
+import pytest
+from datetime import datetime
+from pathlib import Path
+from viral_shorts.utils.serialization import json_dumps, json_loads, JSONDecodeError
+from viral_shorts.config import CACHE_DIR, TEMP_DIR
+from viral_shorts.content_sourcing.cache import FactCache
+from viral_shorts.video_assembly.cache import DownloadCache, SearchCache
+from viral_shorts.utils.storage import StorageManager, atomic_write_bytes, DEFAULT_FILE_MODE
+from viral_shorts.utils.logger import setup_logger
+
+
+def test_atomic_write_bytes(tmp_path):
+    """Test that atomic writes replace the file and leave no temp files"""
+    path = tmp_path / 'queue.json'
+    path.write_bytes(b'old')
+    
+    atomic_write_bytes(path, b'new')
+    
+    assert path.read_bytes() == b'new'
+    assert os.listdir(tmp_path) == ['queue.json']
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="POSIX permission bits")
+def test_atomic_write_bytes_mode(tmp_path):
+    """Test that atomic writes use normal file permissions unless told otherwise"""
+    shared = tmp_path / 'metadata.json'
+    private = tmp_path / 'token.json'
+    
+    atomic_write_bytes(shared, b'{}')
+    atomic_write_bytes(private, b'{}', mode=0o600)
+    
+    assert stat.S_IMODE(shared.stat().st_mode) == DEFAULT_FILE_MODE
+    assert stat.S_IMODE(private.stat().st_mode) == 0o600
+
+
+def test_clean_temp_directory(tmp_path):
+    """Test that only stale temp files are cleaned, and the caches live elsewhere"""
+    storage = StorageManager()
+    storage.temp_dir = tmp_path
+    stale = tmp_path / 'narration_old.wav'
+    fresh = tmp_path / 'narration_new.wav'
+    stale.write_bytes(b'')
+    fresh.write_bytes(b'')
+    os.utime(stale, (0, 0))
+    
+    assert storage.clean_temp_directory(older_than_hours=1) == 1
+    assert not stale.exists()
+    assert fresh.exists()
+    
+    fact_cache, search_cache = FactCache(), SearchCache()
+    for path in (fact_cache.db_path, search_cache.db_path, DownloadCache().cache_dir):
+        assert CACHE_DIR in path.parents
+        assert TEMP_DIR not in path.parents
+    fact_cache.close()
+    search_cache.close()
+
+
+def test_json_round_trip():
+    """Test that JSON helpers return bytes and stringify unknown types"""
+    created = datetime(2024, 1, 2, 3, 4, 5)
+    data = json_dumps({'path': Path('a/b.mp4'), 'created': created, 'title': 'Café'})
+    
+    assert isinstance(data, bytes)
+    loaded = json_loads(data)
+    assert loaded['path'] == str(Path('a/b.mp4'))
+    assert datetime.fromisoformat(loaded['created']) == created
+    assert loaded['title'] == 'Café'
+    assert json_loads(data.decode('utf-8')) == loaded
+
+
+def test_json_loads_invalid():
+    """Test that invalid JSON raises the shared decode error"""
+    with pytest.raises(JSONDecodeError):
+        json_loads(b'{"unterminated": ')
+
+
+def test_logger_flushes_warnings(tmp_path):
+    """Test that warnings reach the log file without waiting for the buffer"""
+    log_file = tmp_path / 'test.log'
+    logger = setup_logger('test_logger_flush', level='WARNING', log_file=log_file)
+    
+    logger.info('dropped')
+    logger.warning('kept')
+    
+    deadline = time.monotonic() + 5
+    while 'kept' not in log_file.read_text() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    contents = log_file.read_text()
+    assert 'kept' in contents
+    assert 'dropped' not in contents
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
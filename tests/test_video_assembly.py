@@ -0,0 +1,316 @@
+"""Unit tests for video assembly module"""
+
+import os
+import subprocess
+import pytest
+from types import SimpleNamespace
+from viral_shorts.video_assembly import editor
+from viral_shorts.video_assembly.cache import DownloadCache, SearchCache
+from viral_shorts.video_assembly.editor import VideoEditor
+
+
+def _cpu_editor(monkeypatch, probe_info=None):
+    """
+    Build a CPU-only VideoEditor that records FFmpeg commands instead of running them
+    
+    Returns:
+        (editor, list the commands are appended to)
+    """
+    video_editor = VideoEditor()
+    video_editor.hw = None
+    video_editor.has_nvenc = False
+    commands = []
+    
+    def fake_run(cmd, timeout, progress=None, gpu=False):
+        commands.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, '', '')
+    
+    monkeypatch.setattr(video_editor, '_run_ffmpeg', fake_run)
+    monkeypatch.setattr(video_editor, 'probe', lambda path: probe_info or {})
+    return video_editor, commands
+
+
+def _option(cmd, flag):
+    """Value following the first occurrence of a command-line flag"""
+    return cmd[cmd.index(flag) + 1]
+
+
+def test_download_cache_temp_paths_are_unique(tmp_path):
+    """Test that concurrent downloads of one URL get separate temp files"""
+    cache = DownloadCache(tmp_path)
+    url = 'https://example.com/clip.mp4'
+    
+    first = cache.temp_path_for(url)
+    second = cache.temp_path_for(url)
+    assert first != second
+    
+    first.write_bytes(b'first')
+    second.write_bytes(b'second')
+    cache.store(url, first)
+    cached = cache.store(url, second)
+    
+    assert cached.read_bytes() == b'second'
+    assert cache.get(url) == cached
+    assert list(tmp_path.iterdir()) == [cached]
+
+
+def test_prepare_background_keeps_same_named_clips_apart(tmp_path, monkeypatch):
+    """Test that staging two background.mp4 files from different folders keeps both"""
+    monkeypatch.setattr(editor, 'TEMP_DIR', tmp_path / 'temp')
+    (tmp_path / 'temp').mkdir()
+    first = tmp_path / 'a' / 'background.mp4'
+    second = tmp_path / 'b' / 'background.mp4'
+    for path, content in ((first, b'first'), (second, b'second')):
+        path.parent.mkdir()
+        path.write_bytes(content)
+    
+    video_editor = VideoEditor()
+    staged_first = video_editor.prepare_background(first)
+    staged_second = video_editor.prepare_background(second)
+    
+    assert staged_first != staged_second
+    assert staged_first.read_bytes() == b'first'
+    assert staged_second.read_bytes() == b'second'
+    assert video_editor.prepare_background(first) == staged_first
+
+
+def test_search_cache(tmp_path):
+    """Test that searches are cached by keyword set until they go stale"""
+    cache = SearchCache(tmp_path / 'search.db', ttl=60)
+    key = cache.make_key(['Ocean', 'whale'], 'pexels')
+    
+    assert key == cache.make_key(['whale', 'ocean'], 'pexels')
+    assert key != cache.make_key(['whale', 'ocean'], 'pixabay')
+    assert cache.get(key) is None
+    
+    cache.put(key, [{'id': 1}])
+    assert cache.get(key) == [{'id': 1}]
+    cache.close()
+    
+    # Read back from SQLite by a fresh instance, then expired by its TTL
+    assert SearchCache(tmp_path / 'search.db', ttl=60).get(key) == [{'id': 1}]
+    assert SearchCache(tmp_path / 'search.db', ttl=-1).get(key) is None
+
+
+def test_fit_filter():
+    """Test that the portrait fit filter only does the work a source needs"""
+    width, height = editor.VIDEO_WIDTH, editor.VIDEO_HEIGHT
+    
+    assert editor._fit_filter((width, height)) == ''
+    assert editor._fit_filter((width * 2, height * 2)) == f'scale={width}:{height}'
+    assert editor._fit_filter((1920, 1080)).startswith('crop=min(iw')
+    assert editor._fit_filter(None) == editor._fit_filter((1920, 1080))
+
+
+def test_subtitle_timestamps():
+    """Test ASS and SRT timestamp formatting"""
+    assert editor._ass_timestamp(3723.456) == '1:02:03.46'
+    assert editor._ass_timestamp(-1) == '0:00:00.00'
+    assert editor._srt_timestamp(3723.456) == '01:02:03,456'
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="Uses a shell script as the FFmpeg stand-in")
+def test_run_ffmpeg_kills_process_when_progress_raises(tmp_path):
+    """Test that a failing progress callback doesn't leave FFmpeg blocked on its pipe"""
+    fake_ffmpeg = tmp_path / 'ffmpeg'
+    fake_ffmpeg.write_text('#!/bin/sh\nwhile :; do echo out_time_ms=1000000; done\n')
+    fake_ffmpeg.chmod(0o755)
+    
+    def progress(seconds):
+        raise ValueError('callback failed')
+    
+    with pytest.raises(ValueError):
+        VideoEditor()._run_ffmpeg([str(fake_ffmpeg)], timeout=60, progress=progress)
+
+
+def test_create_animated_subtitles(tmp_path):
+    """Test that words are grouped into karaoke lines"""
+    words = [
+        {'word': word, 'start': i * 0.5, 'end': i * 0.5 + 0.4}
+        for i, word in enumerate('one two three four five six seven'.split())
+    ]
+    
+    path = VideoEditor().create_animated_subtitles(words, tmp_path / 'subs.ass')
+    events = [line for line in path.read_text(encoding='utf-8').splitlines() if line.startswith('Dialogue:')]
+    
+    assert len(events) == 2
+    assert events[0].startswith('Dialogue: 0,0:00:00.00,0:00:02.90,Default')
+    assert events[0].endswith('{\\k50}ONE {\\k50}TWO {\\k50}THREE {\\k50}FOUR {\\k50}FIVE {\\k40}SIX')
+    assert events[1].endswith('{\\k40}SEVEN')
+
+
+def test_create_srt_subtitles(tmp_path):
+    """Test that SRT captions get one numbered cue per word"""
+    words = [{'word': 'hello', 'start': 0.0, 'end': 0.4}, {'word': 'world', 'start': 0.5, 'end': 1.25}]
+    
+    path = VideoEditor().create_srt_subtitles(words, tmp_path / 'subs.srt')
+    
+    assert path.read_text(encoding='utf-8') == (
+        '1\n00:00:00,000 --> 00:00:00,400\nHELLO\n\n'
+        '2\n00:00:00,500 --> 00:00:01,250\nWORLD\n\n'
+    )
+
+
+def test_assemble_video_command(tmp_path, monkeypatch):
+    """Test the FFmpeg command for a CPU render with music"""
+    probe_info = {
+        'format': {'duration': '30.0'},
+        'streams': [{'codec_type': 'video', 'width': 1920, 'height': 1080}],
+    }
+    video_editor, commands = _cpu_editor(monkeypatch, probe_info)
+    for name in ('bg.mp4', 'voice.wav', 'music.mp3', 'subs.ass'):
+        (tmp_path / name).write_bytes(b'')
+    
+    output = video_editor.assemble_video(
+        tmp_path / 'bg.mp4', tmp_path / 'voice.wav', tmp_path / 'music.mp3',
+        tmp_path / 'subs.ass', tmp_path / 'out.mp4', duration=12.0
+    )
+    
+    assert output == tmp_path / 'out.mp4'
+    cmd = commands[0]
+    # The background is long enough, so it is cut at the input, not looped
+    assert '-stream_loop' not in cmd
+    assert cmd[cmd.index('-i') - 2:cmd.index('-i')] == ['-t', '12.0']
+    graph = _option(cmd, '-filter_complex')
+    assert graph.startswith('[0:v]crop=')
+    assert 'ass=' in graph
+    assert 'amix=inputs=2:duration=first:normalize=0[aout]' in graph
+    assert _option(cmd, '-c:v') == editor.VIDEO_CODEC
+    # FFmpeg sizes its own thread pool outside of create_batch
+    assert _option(cmd, '-threads') == '0'
+    assert _option(cmd, '-c:a') == editor.AUDIO_CODEC
+    assert _option(cmd, '-movflags') == '+faststart'
+    assert '-shortest' in cmd
+    assert cmd[-1] == str(tmp_path / 'out.mp4')
+
+
+def test_assemble_video_loops_short_background(tmp_path, monkeypatch):
+    """Test that a background shorter than the narration is looped"""
+    video_editor, commands = _cpu_editor(monkeypatch, {'format': {'duration': '5.0'}})
+    (tmp_path / 'bg.mp4').write_bytes(b'')
+    
+    video_editor.assemble_video(
+        tmp_path / 'bg.mp4', tmp_path / 'voice.wav', None, None, tmp_path / 'out.mp4', duration=12.0
+    )
+    
+    cmd = commands[0]
+    assert _option(cmd, '-stream_loop') == '-1'
+    assert '1:a' in cmd
+    assert 'amix' not in _option(cmd, '-filter_complex')
+    # MP3/WAV narration is always encoded to the container's audio codec
+    assert _option(cmd, '-c:a') == editor.AUDIO_CODEC
+
+
+def test_assemble_video_gpu_failure_falls_back_once(tmp_path, monkeypatch):
+    """Test that a failed GPU render is redone on the CPU without disabling the GPU"""
+    video_editor, _ = _cpu_editor(monkeypatch, {'format': {'duration': '30.0'}})
+    video_editor.hw = 'cuda'
+    video_editor.has_nvenc = True
+    runs = []
+    
+    def fake_run(cmd, timeout, progress=None, gpu=False):
+        runs.append((gpu, cmd))
+        return subprocess.CompletedProcess(cmd, 1 if gpu else 0, '', 'No NVENC capable devices found')
+    
+    monkeypatch.setattr(video_editor, '_run_ffmpeg', fake_run)
+    output = video_editor.assemble_video(
+        tmp_path / 'bg.mp4', tmp_path / 'voice.wav', None, None, tmp_path / 'out.mp4', duration=12.0
+    )
+    
+    assert output == tmp_path / 'out.mp4'
+    assert [gpu for gpu, _ in runs] == [True, False]
+    assert '-hwaccel' in runs[0][1]
+    assert '-hwaccel' not in runs[1][1]
+    assert _option(runs[1][1], '-c:v') == editor.VIDEO_CODEC
+    # The next video still tries the GPU
+    assert (video_editor.hw, video_editor.has_nvenc) == ('cuda', True)
+
+
+def test_create_complete_video_removes_subtitles(tmp_path, monkeypatch):
+    """Test that the per-video subtitle file is deleted once it is burned in"""
+    monkeypatch.setattr(editor, 'TEMP_DIR', tmp_path)
+    video_editor, commands = _cpu_editor(monkeypatch, {'format': {'duration': '30.0'}})
+    words = [{'word': 'hello', 'start': 0.0, 'end': 0.4}]
+    
+    output = video_editor.create_complete_video(
+        tmp_path / 'bg.mp4', tmp_path / 'voice.wav', None, words, tmp_path / 'out.mp4', target_duration=12.0
+    )
+    
+    assert output == tmp_path / 'out.mp4'
+    assert 'out_subtitles.ass' in _option(commands[0], '-filter_complex')
+    assert not (tmp_path / 'out_subtitles.ass').exists()
+
+
+def _preload_editor(monkeypatch, duration):
+    """
+    Build a CPU-only VideoEditor whose preload runs write a (sparse) raw file of the right size
+    
+    Returns:
+        (editor, list the commands are appended to)
+    """
+    video_editor, commands = _cpu_editor(monkeypatch, {'format': {'duration': str(duration)}})
+    monkeypatch.setattr(editor.shutil, 'disk_usage', lambda path: SimpleNamespace(free=1 << 40))
+    
+    def fake_run(cmd, timeout, progress=None, gpu=False):
+        commands.append(cmd)
+        frames = round(float(_option(cmd, '-t')) * editor.VIDEO_FPS)
+        with open(cmd[-1], 'wb') as raw:
+            raw.truncate(frames * editor.VIDEO_WIDTH * editor.VIDEO_HEIGHT * 3 // 2)
+        return subprocess.CompletedProcess(cmd, 0, '', '')
+    
+    monkeypatch.setattr(video_editor, '_run_ffmpeg', fake_run)
+    return video_editor, commands
+
+
+def test_preload_background_caps_duration(tmp_path, monkeypatch):
+    """Test that preloading keeps at most PRELOAD_MAX_SECONDS, dropping audio and subtitles"""
+    video_editor, commands = _preload_editor(monkeypatch, 600.0)
+    
+    output = video_editor.preload_background(tmp_path / 'bg.mp4', output_path=tmp_path / 'bg.yuv')
+    
+    assert output == tmp_path / 'bg.yuv'
+    assert os.listdir(tmp_path) == ['bg.yuv']
+    cmd = commands[0]
+    assert float(_option(cmd, '-t')) == editor.PRELOAD_MAX_SECONDS
+    # Stream selection is an output option, after the input
+    assert cmd.index('-an') > cmd.index('-i')
+    assert cmd.index('-sn') > cmd.index('-i')
+    # FFmpeg writes a temporary file that is renamed into place
+    assert cmd[-1] == str(tmp_path / 'bg.yuv.part')
+
+
+def test_preload_background_reuses_and_keeps_clips_apart(tmp_path, monkeypatch):
+    """Test that same-named clips get their own preload, and an up-to-date one is reused"""
+    monkeypatch.setattr(editor, 'TEMP_DIR', tmp_path)
+    video_editor, commands = _preload_editor(monkeypatch, 2.0)
+    first = tmp_path / 'a' / 'background.mp4'
+    second = tmp_path / 'b' / 'background.mp4'
+    for path in (first, second):
+        path.parent.mkdir()
+        path.write_bytes(b'')
+    
+    preloaded_first = video_editor.preload_background(first)
+    preloaded_second = video_editor.preload_background(second)
+    assert preloaded_first != preloaded_second
+    assert len(commands) == 2
+    
+    assert video_editor.preload_background(first) == preloaded_first
+    assert len(commands) == 2
+    
+    # A newer source is decoded again
+    os.utime(first, ns=(preloaded_first.stat().st_mtime_ns + 10**9,) * 2)
+    assert video_editor.preload_background(first) == preloaded_first
+    assert len(commands) == 3
+
+
+def test_preload_background_needs_free_space(tmp_path, monkeypatch):
+    """Test that nothing is written when the raw frames wouldn't fit"""
+    video_editor, commands = _cpu_editor(monkeypatch, {'format': {'duration': '10.0'}})
+    monkeypatch.setattr(editor.shutil, 'disk_usage', lambda path: SimpleNamespace(free=0))
+    
+    assert video_editor.preload_background(tmp_path / 'bg.mp4', output_path=tmp_path / 'bg.yuv') is None
+    assert commands == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])